@@ -1,15 +1,21 @@
 """Streamlit app for Quiz Generator."""
 
+import time
+
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 from pathlib import Path
 
+# pandas, plotly and the PDF exporter are imported by the pages that use them
 from src.creators.quiz_creator import QuizCreator
-from src.runners.quiz_runner import QuizRunner
-from src.utils.leaderboard_handler import LeaderboardHandler
+from src.storage.repository import open_storage
 from src.utils.analytics import QuizAnalytics
-from src.config import LEADERBOARD_FILE
+from src.utils.item_stats import record_answers
+from src.utils.results_sink import get_sink
+from src.utils import metrics, profiler
+from src.config import ADMIN_PANEL, HISTORY_PAGE_SIZE, METRICS_PORT, PDF_DIR
+
+# Opt-in per-rerun profiling (QUIZ_PROFILE=1), covering everything below
+_rerun_profile = profiler.start_rerun(st.session_state)
 
 # Page config
 st.set_page_config(
@@ -20,14 +26,25 @@ st.set_page_config(
 )
 
 # Initialize session state
+if "storage" not in st.session_state:
+    st.session_state.storage = open_storage()
 if "creator" not in st.session_state:
-    st.session_state.creator = QuizCreator()
+    st.session_state.creator = QuizCreator(
+        question_repository=st.session_state.storage.questions,
+        quiz_repository=st.session_state.storage.quizzes,
+    )
 if "leaderboard" not in st.session_state:
-    st.session_state.leaderboard = LeaderboardHandler(LEADERBOARD_FILE)
+    st.session_state.leaderboard = st.session_state.storage.scores
+if "pdf_exporter" not in st.session_state:
+    st.session_state.pdf_exporter = None  # built on first export
+if "pdf_export" not in st.session_state:
+    st.session_state.pdf_export = None
 if "username" not in st.session_state:
     st.session_state.username = ""
 if "current_quiz" not in st.session_state:
     st.session_state.current_quiz = None
+if "adaptive_engine" not in st.session_state:
+    st.session_state.adaptive_engine = None
 if "quiz_started" not in st.session_state:
     st.session_state.quiz_started = False
 if "current_question_idx" not in st.session_state:
@@ -39,8 +56,15 @@ if "quiz_finished" not in st.session_state:
 if "current_page" not in st.session_state:
     st.session_state.current_page = "🏠 Home"
 
-# Reload questions each time to ensure fresh data
-st.session_state.creator = QuizCreator()
+# Pick up edits to the questions file; the parsed bank is shared process-wide
+st.session_state.creator.refresh()
+
+# Prometheus endpoint on localhost while metrics are collected (QUIZ_METRICS=1)
+if metrics.enabled() and METRICS_PORT:
+    try:
+        metrics.start_server(METRICS_PORT)
+    except OSError:
+        pass  # port taken, e.g. by another app process
 
 # Custom CSS
 st.markdown("""
@@ -76,6 +100,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@metrics.timed("page.home")
 def render_home():
     """Render home page."""
     st.markdown('<div class="main-header">📝 Quiz Generator</div>', unsafe_allow_html=True)
@@ -106,14 +131,15 @@ def render_home():
         st.markdown('<div class="quiz-card">', unsafe_allow_html=True)
         st.subheader("📊 Quick Stats")
         if st.session_state.username:
-            history = st.session_state.leaderboard.get_user_history(st.session_state.username)
-            st.metric("Quizzes Taken", len(history))
-            if history:
-                scores = [h["percentage"] for h in history]
-                st.metric("Avg Score", f"{sum(scores) / len(scores):.1f}%")
+            stats = st.session_state.leaderboard.get_user_stats(st.session_state.username)
+            st.metric("Quizzes Taken", stats["count"])
+            if stats["count"]:
+                st.metric("Avg Score", f"{stats['mean_percentage']:.1f}%")
+                st.metric("Best Score", f"{stats['best_percentage']:.1f}%")
         st.markdown('</div>', unsafe_allow_html=True)
 
 
+@metrics.timed("page.create_quiz")
 def render_create_quiz():
     """Render quiz creation page."""
     st.markdown('<div class="main-header">🎯 Create Quiz</div>', unsafe_allow_html=True)
@@ -121,9 +147,9 @@ def render_create_quiz():
     # Debug: Show available questions by topic
     with st.expander("📊 Available Questions by Topic"):
         topic_counts = {}
-        for q in st.session_state.creator.questions:
-            topic = q.topic if q.topic else "Unknown"
-            topic_counts[topic] = topic_counts.get(topic, 0) + 1
+        for topic, count in st.session_state.creator.bank.topic_counts().items():
+            topic = topic or "Unknown"
+            topic_counts[topic] = topic_counts.get(topic, 0) + count
         
         for topic, count in sorted(topic_counts.items()):
             st.write(f"**{topic}**: {count} questions")
@@ -145,6 +171,7 @@ def render_create_quiz():
                     try:
                         quiz = st.session_state.creator.create_quiz_by_topic(title, topic, count)
                         st.session_state.current_quiz = quiz
+                        st.session_state.adaptive_engine = None
                         st.session_state.quiz_started = False
                         st.session_state.current_question_idx = 0
                         st.success(f"✓ Quiz created: {title}")
@@ -169,6 +196,7 @@ def render_create_quiz():
                     try:
                         quiz = st.session_state.creator.create_quiz_by_difficulty(title, difficulty, count)
                         st.session_state.current_quiz = quiz
+                        st.session_state.adaptive_engine = None
                         st.session_state.quiz_started = False
                         st.session_state.current_question_idx = 0
                         st.success(f"✓ Quiz created: {title}")
@@ -177,6 +205,29 @@ def render_create_quiz():
                         st.error(f"Error: {str(e)}")
         else:
             st.warning("No difficulties available")
+
+    st.subheader("🧠 Adaptive Quiz")
+    st.caption("Each question is picked to match your estimated ability from the answers so far.")
+    topics = ["Any"] + st.session_state.creator.get_available_categories()
+    col_topic, col_count = st.columns(2)
+    with col_topic:
+        adaptive_topic = st.selectbox("Topic:", topics, key="adaptive_topic")
+    with col_count:
+        adaptive_count = st.slider("Number of Questions:", 1, 20, 10, key="adaptive_count")
+    if st.button("🧠 Create Adaptive Quiz", key="create_adaptive"):
+        if not st.session_state.username:
+            st.error("Please enter your name first (on Home page)")
+        else:
+            try:
+                topic = None if adaptive_topic == "Any" else adaptive_topic
+                quiz, engine = st.session_state.creator.create_adaptive_quiz("Adaptive Quiz", adaptive_count, topic)
+                st.session_state.current_quiz = quiz
+                st.session_state.adaptive_engine = engine
+                st.session_state.quiz_started = False
+                st.session_state.current_question_idx = 0
+                st.success("✓ Adaptive quiz created")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
     
     # Show created quiz
     if st.session_state.current_quiz:
@@ -185,7 +236,7 @@ def render_create_quiz():
         st.subheader(f"📋 {st.session_state.current_quiz.title}")
         st.write(f"**Category:** {st.session_state.current_quiz.category or 'General'}")
         st.write(f"**Difficulty:** {st.session_state.current_quiz.difficulty}")
-        st.write(f"**Questions:** {len(st.session_state.current_quiz.questions)}")
+        st.write(f"**Questions:** {quiz_length()}")
         
         col_run, col_reset = st.columns(2)
         with col_run:
@@ -195,10 +246,20 @@ def render_create_quiz():
         with col_reset:
             if st.button("🔄 Create Another", key="create_reset", use_container_width=True):
                 st.session_state.current_quiz = None
+                st.session_state.adaptive_engine = None
                 st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
 
 
+def quiz_length() -> int:
+    """Planned number of questions in the current quiz (adaptive quizzes grow as they run)."""
+    engine = st.session_state.adaptive_engine
+    if engine is not None:
+        return engine.max_questions
+    return len(st.session_state.current_quiz.questions)
+
+
+@metrics.timed("page.run_quiz")
 def render_run_quiz():
     """Render quiz runner page."""
     if not st.session_state.username:
@@ -210,20 +271,28 @@ def render_run_quiz():
         return
     
     quiz = st.session_state.current_quiz
+    engine = st.session_state.adaptive_engine
+    total = quiz_length()
     
     # Quiz header
     st.markdown('<div class="main-header">🎮 Run Quiz</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="quiz-card"><h3>{quiz.title}</h3></div>', unsafe_allow_html=True)
     
     # Progress bar
-    progress = st.session_state.current_question_idx / len(quiz.questions)
+    progress = min(st.session_state.current_question_idx / total, 1.0)
     st.progress(progress)
-    st.write(f"Question {st.session_state.current_question_idx + 1} of {len(quiz.questions)}")
+    st.write(f"Question {st.session_state.current_question_idx + 1} of {total}")
     
     if st.session_state.quiz_finished:
         render_quiz_results()
         return
     
+    # Adaptive quizzes pick the next question once per index, on first display
+    if engine is not None and st.session_state.current_question_idx == len(quiz.questions):
+        question = engine.next_question()
+        if question is not None:
+            quiz.questions.append(question)
+
     # Current question
     if st.session_state.current_question_idx < len(quiz.questions):
         question = quiz.questions[st.session_state.current_question_idx]
@@ -236,6 +305,11 @@ def render_run_quiz():
             st.caption(f"⚡ Difficulty: {question.difficulty}")
         
         st.subheader(f"Q{st.session_state.current_question_idx + 1}: {question.text}")
+
+        # Start timing when a question is first shown (reruns keep the original start)
+        if st.session_state.get("question_started_idx") != st.session_state.current_question_idx:
+            st.session_state.question_started_idx = st.session_state.current_question_idx
+            st.session_state.question_started_at = time.time()
         
         # Display options
         options_dict = {chr(ord("A") + i): opt for i, opt in enumerate(question.options)}
@@ -250,21 +324,28 @@ def render_run_quiz():
         
         with col1:
             if st.button("⏭️ Next", key="next_btn"):
-                is_correct = selected == question.answer
+                is_correct, _ = question.grade(selected)
                 st.session_state.quiz_results.append({
                     "index": st.session_state.current_question_idx + 1,
+                    "question_id": question.id,
                     "question": question.text,
                     "topic": question.topic,
                     "chosen_letter": selected,
                     "chosen_text": options_dict[selected],
-                    "correct_letter": question.answer,
+                    "correct_letter": question.correct_letter,
+                    "correct_text": question.correct_text,
                     "is_correct": is_correct,
                     "difficulty": question.difficulty,
+                    "time_taken": time.time() - st.session_state.question_started_at,
                 })
+                if engine is not None:
+                    engine.log_result(st.session_state.quiz_results[-1])
                 st.session_state.current_question_idx += 1
                 
-                if st.session_state.current_question_idx >= len(quiz.questions):
+                if st.session_state.current_question_idx >= total:
                     st.session_state.quiz_finished = True
+                    record_answers(st.session_state.quiz_results, st.session_state.username, quiz.title)
+                    get_sink().write_attempt(st.session_state.quiz_results, st.session_state.username, quiz.title)
                 st.rerun()
         
         with col2:
@@ -276,13 +357,26 @@ def render_run_quiz():
         
         with col3:
             if st.button("🔄 Reset Quiz", key="reset_btn"):
+                if engine is not None:
+                    st.session_state.current_quiz, st.session_state.adaptive_engine = (
+                        st.session_state.creator.create_adaptive_quiz(quiz.title, engine.max_questions, quiz.category or None)
+                    )
                 st.session_state.current_question_idx = 0
                 st.session_state.quiz_results = []
                 st.session_state.quiz_finished = False
+                st.session_state.question_started_idx = None
                 st.info("Quiz reset.")
                 st.rerun()
 
 
+def get_pdf_exporter():
+    """The session's PDF exporter, built on first use."""
+    if st.session_state.pdf_exporter is None:
+        from src.utils.pdf_exporter import PDFExporter
+        st.session_state.pdf_exporter = PDFExporter(PDF_DIR)
+    return st.session_state.pdf_exporter
+
+
 def render_quiz_results():
     """Render quiz results."""
     quiz = st.session_state.current_quiz
@@ -303,6 +397,9 @@ def render_quiz_results():
         st.metric("Correct", analytics.correct_count())
     with col4:
         st.metric("Incorrect", analytics.incorrect_count())
+    engine = st.session_state.adaptive_engine
+    if engine is not None:
+        st.caption(f"🧠 Estimated ability: {engine.theta:+.2f} (± {engine.standard_error():.2f})")
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -313,8 +410,26 @@ def render_quiz_results():
             quiz.title,
             analytics.correct_count(),
             analytics.total_questions(),
+            category=quiz.category,
+            difficulty=quiz.difficulty,
         )
         st.success("✓ Score saved!")
+
+    # PDF report, rendered on the export pool; reruns poll the future
+    if st.button("📄 Export PDF Report", key="export_pdf"):
+        st.session_state.pdf_export = get_pdf_exporter().submit_results_export(quiz.title, results)
+    future = st.session_state.pdf_export
+    if future is not None:
+        if not future.done():
+            st.info("⏳ Rendering PDF report... (refresh to check)")
+        elif future.exception() is not None:
+            st.error(f"PDF export failed: {future.exception()}")
+        else:
+            pdf_path = Path(future.result())
+            st.download_button(
+                "⬇️ Download PDF", pdf_path.read_bytes(), file_name=pdf_path.name,
+                mime="application/pdf", key="download_pdf",
+            )
     
     # Detailed results
     st.subheader("📝 Detailed Results")
@@ -336,6 +451,7 @@ def render_quiz_results():
             st.session_state.quiz_finished = False
             st.session_state.current_question_idx = 0
             st.session_state.quiz_results = []
+            st.session_state.pdf_export = None
             st.session_state.current_page = "🏠 Home"
             st.rerun()
     
@@ -345,6 +461,7 @@ def render_quiz_results():
             st.session_state.current_question_idx = 0
             st.session_state.quiz_results = []
             st.session_state.current_quiz = None
+            st.session_state.pdf_export = None
             st.session_state.current_page = "🎯 Create Quiz"
             st.rerun()
     
@@ -354,8 +471,12 @@ def render_quiz_results():
             st.rerun()
 
 
+@metrics.timed("page.leaderboard")
 def render_leaderboard():
     """Render leaderboard page."""
+    import pandas as pd
+    import plotly.graph_objects as go
+
     st.markdown('<div class="main-header">🏆 Leaderboard</div>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
@@ -391,21 +512,29 @@ def render_leaderboard():
     with col2:
         if st.session_state.username:
             st.subheader(f"📊 {st.session_state.username}'s History")
-            user_history = st.session_state.leaderboard.get_user_history(st.session_state.username)
+            leaderboard = st.session_state.leaderboard
+            # Only the page being shown is read from the score store
+            total = leaderboard.get_user_stats(st.session_state.username)["count"]
+            pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+            # Unkeyed, so it starts again on the latest page when the page count changes
+            page = st.number_input("Page", min_value=1, max_value=pages, value=pages, step=1)
+            offset = (min(int(page or pages), pages) - 1) * HISTORY_PAGE_SIZE
+            user_history = leaderboard.get_user_history(st.session_state.username, offset, HISTORY_PAGE_SIZE)
             
             if user_history:
+                st.caption(f"Quizzes {offset + 1}-{offset + len(user_history)} of {total}")
                 df_user = pd.DataFrame(user_history)
                 df_user = df_user[["quiz_title", "score", "total", "percentage"]].copy()
                 df_user.columns = ["Quiz", "Score", "Total", "%"]
                 df_user = df_user.reset_index(drop=True)
-                df_user.index = df_user.index + 1
+                df_user.index = df_user.index + offset + 1
                 
                 st.dataframe(df_user, use_container_width=True)
                 
                 # User chart
                 fig_user = go.Figure(data=[
                     go.Scatter(
-                        x=list(range(len(user_history))),
+                        x=list(range(offset + 1, offset + len(user_history) + 1)),
                         y=[h["percentage"] for h in user_history],
                         mode="lines+markers",
                         name="Score %",
@@ -426,12 +555,110 @@ def render_leaderboard():
             st.info("👤 Enter your name on the Home page to see your history.")
 
 
+@metrics.timed("page.analytics")
+def render_dashboard():
+    """Render aggregate analytics over the full score history."""
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    st.markdown('<div class="main-header">📈 Analytics</div>', unsafe_allow_html=True)
+
+    # Materialized aggregates: cost depends on the number of groups, not on history size
+    aggregates = st.session_state.leaderboard.get_aggregates()
+    overall = aggregates.overall.to_dict()
+    if not overall["count"]:
+        st.info("No scores yet. Start taking quizzes!")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Quizzes Taken", overall["count"])
+    with col2:
+        st.metric("Avg Score", f"{overall['mean_percentage']:.1f}%")
+    with col3:
+        st.metric("Pass Rate", f"{overall['pass_rate']:.1f}%")
+    with col4:
+        st.metric("Players", len(aggregates.groups["user"]))
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig = go.Figure(data=[
+            go.Bar(
+                x=[f"{i * 10}-{i * 10 + 10}%" for i in range(len(overall["histogram"]))],
+                y=overall["histogram"],
+                marker_color="lightblue",
+            )
+        ])
+        fig.update_layout(title="Score Distribution", xaxis_title="Score", yaxis_title="Quizzes", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        topics = aggregates.table("topic")
+        fig = go.Figure(data=[
+            go.Bar(x=[r["key"] for r in topics], y=[r["pass_rate"] for r in topics], marker_color="lightgreen")
+        ])
+        fig.update_layout(title="Pass Rate by Topic", xaxis_title="Topic", yaxis_title="Pass %", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        difficulties = aggregates.table("difficulty")
+        fig = go.Figure(data=[
+            go.Bar(
+                x=[r["key"] for r in difficulties],
+                y=[r["mean_percentage"] for r in difficulties],
+                marker_color="orange",
+            )
+        ])
+        fig.update_layout(title="Avg Score by Difficulty", xaxis_title="Difficulty", yaxis_title="Average %", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        days = aggregates.table("day")
+        fig = go.Figure(data=[
+            go.Scatter(
+                x=[r["key"] for r in days],
+                y=[r["mean_percentage"] for r in days],
+                mode="lines+markers",
+                name="Avg %",
+            )
+        ])
+        fig.update_layout(title="Daily Average Score", xaxis_title="Day", yaxis_title="Average %", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Quizzes")
+    df = pd.DataFrame(aggregates.table("quiz", sort_by="count", limit=50))
+    df = df[["key", "count", "mean_percentage", "pass_rate", "best_percentage"]]
+    df.columns = ["Quiz", "Attempts", "Avg %", "Pass %", "Best %"]
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+
+def render_admin_panel():
+    """Render the hidden admin panel with the instrumentation metrics."""
+    with st.sidebar.expander("🔧 Admin: Metrics"):
+        collect = st.checkbox("Collect metrics", value=metrics.enabled(), key="admin_metrics")
+        if collect != metrics.enabled():
+            metrics.enable(collect)
+        if metrics.server_url():
+            st.caption(f"Prometheus: {metrics.server_url()}")
+        rows = metrics.snapshot()
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+        else:
+            st.caption("No metrics collected yet.")
+        if st.button("Reset metrics", key="admin_reset"):
+            metrics.reset()
+            st.rerun()
+
+
 # Sidebar navigation
 st.sidebar.markdown("# 📚 Quiz Generator")
 st.sidebar.markdown("---")
 
 # Use session state for page selection
-page_options = ["🏠 Home", "🎯 Create Quiz", "🎮 Run Quiz", "🏆 Leaderboard"]
+page_options = ["🏠 Home", "🎯 Create Quiz", "🎮 Run Quiz", "🏆 Leaderboard", "📈 Analytics"]
 page = st.sidebar.radio(
     "Navigate:",
     page_options,
@@ -450,12 +677,21 @@ st.sidebar.info(
     "difficulty levels, leaderboard, and adaptive testing."
 )
 
+# Admin panel: only for deployments started with QUIZ_ADMIN=1
+if ADMIN_PANEL:
+    render_admin_panel()
+
 # Route pages
-if st.session_state.current_page == "🏠 Home":
-    render_home()
-elif st.session_state.current_page == "🎯 Create Quiz":
-    render_create_quiz()
-elif st.session_state.current_page == "🎮 Run Quiz":
-    render_run_quiz()
-elif st.session_state.current_page == "🏆 Leaderboard":
-    render_leaderboard()
+try:
+    if st.session_state.current_page == "🏠 Home":
+        render_home()
+    elif st.session_state.current_page == "🎯 Create Quiz":
+        render_create_quiz()
+    elif st.session_state.current_page == "🎮 Run Quiz":
+        render_run_quiz()
+    elif st.session_state.current_page == "🏆 Leaderboard":
+        render_leaderboard()
+    elif st.session_state.current_page == "📈 Analytics":
+        render_dashboard()
+finally:
+    profiler.finish_rerun(_rerun_profile, st.session_state)
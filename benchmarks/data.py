@@ -0,0 +1,98 @@
+"""Synthetic datasets for the benchmarks.
+
+Files are streamed to disk, so question banks of 1M questions and
+leaderboards of 10M entries can be generated without holding them in memory.
+Generation is deterministic for a given size and seed.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.utils.score_store import HEADER_SIZE, _dumps, _snapshot_header
+
+TOPICS = ["Math", "Geography", "History", "Chemistry", "Astronomy", "Literature", "Biology", "Physics"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+QUIZ_TITLES = [f"{topic} Quiz" for topic in TOPICS]
+
+
+def write_question_bank(path: Path, count: int, seed: int = 0) -> Path:
+    """Write a JSON array of `count` questions in the questions.json format."""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(count):
+            a, b = rng.randint(1, 999), rng.randint(1, 999)
+            item = {
+                "id": str(i + 1),
+                "text": f"Question {i + 1}: what is {a} + {b}?",
+                "options": [str(a + b), str(a + b + 1), str(a + b - 1), str(a + b + 10)],
+                "answer": "ABCD"[rng.randrange(4)],
+                "topic": TOPICS[rng.randrange(len(TOPICS))],
+                "difficulty": DIFFICULTIES[rng.randrange(len(DIFFICULTIES))],
+                "explanation": f"{a} + {b} = {a + b}.",
+            }
+            f.write(("  " if i == 0 else ",\n  ") + json.dumps(item))
+        f.write("\n]\n")
+    return path
+
+
+def leaderboard_entry(rng: random.Random, users: int, when: datetime) -> dict:
+    total = rng.choice((5, 10, 20))
+    score = rng.randint(0, total)
+    return {
+        "timestamp": when.isoformat(),
+        "username": f"user{rng.randrange(users):06d}",
+        "quiz_title": QUIZ_TITLES[rng.randrange(len(QUIZ_TITLES))],
+        "score": score,
+        "total": total,
+        "percentage": score / total * 100,
+        "category": TOPICS[rng.randrange(len(TOPICS))],
+        "difficulty": DIFFICULTIES[rng.randrange(len(DIFFICULTIES))],
+    }
+
+
+def write_leaderboard(legacy_path: Path, count: int, users: int = 0, seed: int = 0) -> Path:
+    """
+    Write a score store for `legacy_path` holding `count` entries.
+
+    The compacted snapshot is written directly (the layout ScoreStore migrates
+    to), which is far faster than appending entry by entry. `users` defaults
+    to one user per 20 entries.
+    """
+    rng = random.Random(seed)
+    users = users or max(1, count // 20)
+    snapshot = legacy_path.with_name(legacy_path.stem + ".snapshot.jsonl")
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with snapshot.open("wb") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        batch = []
+        for i in range(count):
+            batch.append(_dumps(leaderboard_entry(rng, users, start + timedelta(seconds=i))))
+            if len(batch) >= 10000:
+                f.write(b"".join(batch))
+                batch = []
+        f.write(b"".join(batch))
+        end = f.tell()
+        f.seek(0)
+        f.write(_snapshot_header(f"bench-{count}-{seed}", end, ""))
+    return legacy_path
+
+
+def quiz_results(count: int, seed: int = 0) -> list:
+    """Per-question result dicts shaped like QuizRunner.results."""
+    rng = random.Random(seed)
+    return [
+        {
+            "index": i + 1,
+            "question_id": str(i + 1),
+            "is_correct": rng.random() < 0.6,
+            "difficulty": DIFFICULTIES[rng.randrange(len(DIFFICULTIES))],
+            "topic": TOPICS[rng.randrange(len(TOPICS))],
+            "time_taken": rng.uniform(2.0, 60.0),
+        }
+        for i in range(count)
+    ]
@@ -0,0 +1,489 @@
+"""Headless load test for the Streamlit app.
+
+Runs N simulated sessions through full quiz flows (enter a name, create a
+quiz by topic, answer every question, save the score, open the leaderboard)
+against a private copy of data/. Like Streamlit, every interaction re-executes
+app.py top to bottom, here against a stand-in `streamlit` module that keeps
+per-session state and widget values and replays button clicks; sessions run
+on their own threads as they do in the Streamlit server.
+
+Reports latency percentiles, reruns and file I/O (opens for read and write,
+other filesystem calls, counted with an audit hook) per step, plus retained
+memory per session from a separate tracemalloc pass:
+
+    python -m benchmarks.load_test --sessions 50
+    python -m benchmarks.load_test --sessions 200 --concurrency 20 --quizzes 3 --out load.json
+
+The leaderboard page imports pandas and plotly, so both must be installed.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_FILE = ROOT / "app.py"
+DATA_FILES = ["questions.json", "categories.json", "difficulty_levels.json", "item_stats.json"]
+MAX_RERUNS = 10  # st.rerun() chains longer than this are a bug in the app
+
+# Filesystem audit events counted besides "open"
+FS_EVENTS = {"os.rename", "os.remove", "os.mkdir", "os.listdir", "os.scandir", "os.truncate", "shutil.rmtree"}
+
+
+class FlowError(RuntimeError):
+    """A scripted interaction did not find the widget it expected."""
+
+
+class _Rerun(Exception):
+    pass
+
+
+class _Stop(Exception):
+    pass
+
+
+class SessionState(dict):
+    """st.session_state stand-in: a dict with attribute access."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __delattr__(self, name):
+        del self[name]
+
+
+# -- file I/O accounting -------------------------------------------------------
+
+_io = threading.local()
+_audit_installed = False
+
+
+def _audit(event: str, args) -> None:
+    counts = getattr(_io, "counts", None)
+    if counts is None:
+        return
+    if event == "open":
+        _, mode, flags = args
+        if isinstance(mode, str):
+            write = any(c in mode for c in "wax+")
+        else:
+            write = bool(flags & (os.O_WRONLY | os.O_RDWR))
+        counts["writes" if write else "reads"] += 1
+    elif event in FS_EVENTS:
+        counts["fs_calls"] += 1
+
+
+def _install_audit_hook() -> None:
+    # Audit hooks cannot be removed; the hook is a no-op on threads not counting
+    global _audit_installed
+    if not _audit_installed:
+        sys.addaudithook(_audit)
+        _audit_installed = True
+
+
+# -- streamlit stand-in --------------------------------------------------------
+
+_current = threading.local()
+
+
+def _session() -> "Session":
+    return _current.session
+
+
+class _FakeStreamlit(types.ModuleType):
+    """
+    The parts of the streamlit API used by app.py.
+
+    Output elements are no-ops; widgets return the session's stored values;
+    containers (columns, expanders, the sidebar) are this module itself.
+    Unknown APIs resolve to no-ops so new display calls do not break the run.
+    """
+
+    def __init__(self):
+        super().__init__("streamlit")
+        self.sidebar = self
+
+    @property
+    def session_state(self) -> SessionState:
+        return _session().state
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self._noop
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _noop(self, *args, **kwargs):
+        return None
+
+    def columns(self, spec, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def expander(self, label, **kwargs):
+        return self
+
+    def rerun(self):
+        raise _Rerun
+
+    def stop(self):
+        raise _Stop
+
+    # Widgets: keyed values persist in session state, like Streamlit's; unkeyed
+    # values only last for the interaction that set them
+    def _value(self, key, label, default, valid: Callable[[Any], bool] = lambda v: True):
+        session = _session()
+        if key is None:
+            value = session.inputs.get(label, default)
+            return value if valid(value) else default
+        value = session.state.setdefault(key, default)
+        if not valid(value):
+            value = session.state[key] = default
+        return value
+
+    def text_input(self, label, value="", key=None, **kwargs):
+        return self._value(key, label, value)
+
+    def checkbox(self, label, value=False, key=None, **kwargs):
+        return self._value(key, label, value)
+
+    def slider(self, label, min_value=0, max_value=100, value=None, key=None, **kwargs):
+        default = min_value if value is None else value
+        return self._value(key, label, default, lambda v: min_value <= v <= max_value)
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, key=None, **kwargs):
+        default = value if value is not None else min_value if min_value is not None else 0
+        return self._value(
+            key, label, default,
+            lambda v: (min_value is None or v >= min_value) and (max_value is None or v <= max_value),
+        )
+
+    def selectbox(self, label, options, index=0, format_func=str, key=None, **kwargs):
+        return self._choice(label, options, index, format_func, key)
+
+    def radio(self, label, options, index=0, format_func=str, key=None, **kwargs):
+        return self._choice(label, options, index, format_func, key)
+
+    def _choice(self, label, options, index, format_func, key):
+        options = list(options)
+        for option in options:
+            format_func(option)  # rendering cost of the labels
+        default = options[index] if options and index is not None else None
+        return self._value(key, label, default, lambda v: v in options)
+
+    def button(self, label, key=None, **kwargs):
+        session = _session()
+        clicked = session.click == (key or label)
+        session.rendered.add(key or label)
+        if key is not None:
+            session.state[key] = clicked
+        return clicked
+
+    def download_button(self, label, data=None, key=None, **kwargs):
+        return self.button(label, key=key)
+
+
+# -- sessions ------------------------------------------------------------------
+
+
+@dataclass
+class StepRecord:
+    session: int
+    step: str
+    seconds: float
+    reruns: int
+    reads: int
+    writes: int
+    fs_calls: int
+
+
+class Session:
+    """One simulated browser session."""
+
+    def __init__(self, number: int, code):
+        self.number = number
+        self.code = code
+        self.state = SessionState()
+        self.inputs: Dict[str, Any] = {}
+        self.click: Optional[str] = None
+        self.rendered: set = set()
+        self.records: List[StepRecord] = []
+
+    def interact(self, step: str, click: Optional[str] = None, **values) -> None:
+        """Set widget values, optionally click a button, and rerun the script until it settles."""
+        self.inputs = dict(values)  # unkeyed widgets, by label
+        self.state.update(values)  # keyed widgets
+        if click is not None:
+            self.state[click] = True  # a pressed button reads True from the start of the run
+        self.click = click
+        counts = defaultdict(int)
+        _current.session, _io.counts = self, counts
+        started = time.perf_counter()
+        try:
+            reruns = self._run(click)
+        finally:
+            seconds = time.perf_counter() - started
+            _current.session = _io.counts = None
+        self.records.append(StepRecord(self.number, step, seconds, reruns, counts["reads"], counts["writes"],
+                                       counts["fs_calls"]))
+
+    def _run(self, click: Optional[str]) -> int:
+        for reruns in range(MAX_RERUNS):
+            self.rendered = set()
+            try:
+                exec(self.code, {"__name__": "__main__", "__file__": str(APP_FILE)})
+                rerun = False
+            except _Rerun:
+                rerun = True
+            except _Stop:
+                rerun = False
+            if reruns == 0 and click is not None and click not in self.rendered:
+                raise FlowError(f"session {self.number}: button {click!r} was not rendered")
+            if not rerun:
+                return reruns
+            self.click = None  # buttons are only pressed for one run
+        raise FlowError(f"session {self.number}: more than {MAX_RERUNS} reruns")
+
+
+def quiz_flow(session: Session, rng: random.Random, quizzes: int = 1, count: int = 5) -> None:
+    """Open the app, enter a name, then create, take and score `quizzes` quizzes, viewing the leaderboard after each."""
+    session.interact("open")
+    session.interact("enter_name", home_username=f"load{session.number:05d}")
+    for _ in range(quizzes):
+        session.interact("go_create", click="home_to_create")
+        topic = rng.choice(session.state.creator.get_available_categories())
+        session.interact("create_quiz", click="create_topic", topic_select=topic, topic_count=count,
+                         topic_title=f"{topic} Quiz")
+        session.interact("start_quiz", click="create_to_run")
+        for i in range(len(session.state.current_quiz.questions)):
+            question = session.state.current_quiz.questions[i]
+            letter = chr(ord("A") + rng.randrange(len(question.options)))
+            session.interact("answer", click="next_btn", **{f"question_{i}": letter})
+        session.interact("save_score", click="save_score")
+        session.interact("leaderboard", click="results_to_leader")
+        session.interact("results", **{"Navigate:": "🎮 Run Quiz"})
+        session.interact("home", click="back_home")
+
+
+# -- harness -------------------------------------------------------------------
+
+
+def prepare_data_dir(target: Path, source: Path = ROOT / "data") -> Path:
+    """Copy the question data the app reads into `target`; scores and results start empty."""
+    target.mkdir(parents=True, exist_ok=True)
+    for name in DATA_FILES:
+        if (source / name).exists():
+            shutil.copy2(source / name, target / name)
+    return target
+
+
+def _check_config(data_dir: Path) -> None:
+    from src import config
+
+    if Path(config.DATA_DIR).resolve() != data_dir.resolve():
+        raise RuntimeError(
+            "src.config was imported before the load test set QUIZ_DATA_DIR; run it in a fresh process"
+        )
+
+
+def _run_sessions(code, count: int, concurrency: int, quizzes: int, questions: int, seed: int,
+                  start: int = 0) -> List[StepRecord]:
+    # Imported here so benchmarks.startup can use the stand-in without it
+    from concurrent.futures import ThreadPoolExecutor
+
+    records: List[StepRecord] = []
+    lock = threading.Lock()
+
+    def run(number: int) -> None:
+        session = Session(number, code)
+        try:
+            quiz_flow(session, random.Random(seed + number), quizzes, questions)
+        finally:
+            with lock:
+                records.extend(session.records)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(run, start + n) for n in range(count)]:
+            future.result()
+    return records
+
+
+def _memory_per_session(code, count: int, quizzes: int, questions: int, seed: int) -> Dict[str, float]:
+    """Bytes retained per finished session, traced after one warm-up session."""
+    tracemalloc.start()
+    try:
+        warm = Session(-1, code)
+        quiz_flow(warm, random.Random(seed), quizzes, questions)
+        before = tracemalloc.get_traced_memory()[0]
+        sessions = []
+        for n in range(count):
+            session = Session(-2 - n, code)
+            quiz_flow(session, random.Random(seed + n), quizzes, questions)
+            session.records.clear()
+            sessions.append(session)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"sessions": count, "retained_bytes": (after - before) / count, "peak_traced_bytes": peak}
+
+
+def _percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def summarize(records: List[StepRecord]) -> List[Dict[str, Any]]:
+    """Per-step latency percentiles (ms) and mean reruns and file I/O."""
+    by_step: Dict[str, List[StepRecord]] = defaultdict(list)
+    for r in records:
+        by_step[r.step].append(r)
+    rows = []
+    for step, rs in by_step.items():
+        times = [r.seconds * 1000 for r in rs]
+        rows.append({
+            "step": step,
+            "count": len(rs),
+            "p50_ms": _percentile(times, 50),
+            "p90_ms": _percentile(times, 90),
+            "p99_ms": _percentile(times, 99),
+            "max_ms": max(times),
+            "reruns": statistics.fmean(r.reruns for r in rs),
+            "reads": statistics.fmean(r.reads for r in rs),
+            "writes": statistics.fmean(r.writes for r in rs),
+            "fs_calls": statistics.fmean(r.fs_calls for r in rs),
+        })
+    return rows
+
+
+def run_load_test(
+    sessions: int = 20,
+    concurrency: int = 0,
+    quizzes: int = 1,
+    questions: int = 5,
+    memory_sessions: int = 5,
+    seed: int = 0,
+    data_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Drive `sessions` simulated sessions through the app, `concurrency` at a time
+    (default: all at once), and return the report.
+
+    `data_dir` is where the app's data lives for the run (QUIZ_DATA_DIR); it
+    must be set before anything imports src.config, so call this from a fresh
+    process (main() does).
+    """
+    if data_dir is not None:
+        _check_config(data_dir)
+    code = compile(APP_FILE.read_text(encoding="utf-8"), str(APP_FILE), "exec")
+    _install_audit_hook()
+    saved = sys.modules.get("streamlit")
+    sys.modules["streamlit"] = _FakeStreamlit()
+    try:
+        # One sequential session first, so imports and cold caches are not charged to the run
+        _run_sessions(code, 1, 1, quizzes, questions, seed, start=sessions)
+        started = time.perf_counter()
+        records = _run_sessions(code, sessions, concurrency or sessions, quizzes, questions, seed)
+        wall = time.perf_counter() - started
+        memory = _memory_per_session(code, memory_sessions, quizzes, questions, seed) if memory_sessions else {}
+    finally:
+        if saved is None:
+            sys.modules.pop("streamlit", None)
+        else:
+            sys.modules["streamlit"] = saved
+
+    return {
+        "config": {"sessions": sessions, "concurrency": concurrency or sessions, "quizzes": quizzes,
+                   "questions": questions, "seed": seed},
+        "wall_seconds": wall,
+        "steps_per_second": len(records) / wall if wall else 0.0,
+        "steps": summarize(records),
+        "memory": {**memory, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    config = report["config"]
+    lines = [
+        f"{config['sessions']} sessions ({config['concurrency']} concurrent), {config['quizzes']} quiz(zes) "
+        f"of {config['questions']} questions each: {report['wall_seconds']:.2f} s, "
+        f"{report['steps_per_second']:.1f} steps/s",
+        "",
+        f"{'step':12} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} "
+        f"{'reruns':>7} {'reads':>6} {'writes':>6} {'fs':>5}",
+    ]
+    for row in report["steps"]:
+        lines.append(
+            f"{row['step']:12} {row['count']:>6} {row['p50_ms']:>9.2f} {row['p90_ms']:>9.2f} "
+            f"{row['p99_ms']:>9.2f} {row['max_ms']:>9.2f} {row['reruns']:>7.2f} {row['reads']:>6.1f} "
+            f"{row['writes']:>6.1f} {row['fs_calls']:>5.1f}"
+        )
+    memory = report["memory"]
+    lines.append("")
+    if "retained_bytes" in memory:
+        lines.append(f"memory: {memory['retained_bytes'] / 1024:.1f} KiB retained per session "
+                     f"({memory['sessions']} traced), peak RSS {memory['max_rss_kb'] / 1024:.1f} MiB")
+    else:
+        lines.append(f"memory: peak RSS {memory['max_rss_kb'] / 1024:.1f} MiB")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """Load-test the Streamlit app with simulated sessions."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=0, help="sessions at a time (default: all)")
+    parser.add_argument("--quizzes", type=int, default=1, help="quizzes taken per session")
+    parser.add_argument("--questions", type=int, default=5, help="questions per quiz")
+    parser.add_argument("--memory-sessions", type=int, default=5, help="sessions in the memory pass (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path, help="app data directory (default: a temporary copy of data/)")
+    parser.add_argument("--out", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = Path(tempfile.mkdtemp(prefix="quiz-load-"))
+        # Registered first so it runs last, after stores and sinks flush at exit
+        atexit.register(shutil.rmtree, data_dir, True)
+        prepare_data_dir(data_dir)
+    os.environ["QUIZ_DATA_DIR"] = str(data_dir)
+    os.environ["QUIZ_RESULTS_FILE"] = str(data_dir / "results.csv")
+    os.environ["QUIZ_STORAGE_BACKEND"] = "json"
+
+    report = run_load_test(args.sessions, args.concurrency, args.quizzes, args.questions,
+                           args.memory_sessions, args.seed, data_dir)
+    print(format_report(report))
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
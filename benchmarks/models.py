@@ -0,0 +1,58 @@
+"""Memory per question and serialization throughput of the question models.
+
+Memory is what a question costs once loaded from questions.json (the
+Question object, its options tuple and strings), traced with tracemalloc
+after the parsed JSON has been dropped. Throughput runs the models.*
+benchmarks from benchmarks.run on the same bank:
+
+    python -m benchmarks.models --questions 200000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from src.models.question_model import Question
+
+from .data import write_question_bank
+from .run import _format_time, run_suite
+
+
+def memory_per_question(path: Path) -> float:
+    """Bytes retained per question when loading the bank at `path`."""
+    text = path.read_text(encoding="utf-8")
+    gc.collect()
+    tracemalloc.start()
+    try:
+        items = json.loads(text)
+        questions = [Question.from_dict(item, str(i + 1)) for i, item in enumerate(items)]
+        del items
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return retained / len(questions) if questions else 0.0
+
+
+def main(argv=None) -> int:
+    """Measure memory per question and model serialization throughput."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--questions", type=int, default=100_000, help="questions in the synthetic bank")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="quiz-models-") as tmp:
+        path = write_question_bank(Path(tmp) / f"questions-{args.questions}.json", args.questions)
+        print(f"memory per question: {memory_per_question(path):.0f} B ({args.questions:,} questions)")
+        scale = {"questions": [args.questions]}
+        for m in run_suite(scale, Path(tmp), args.repeat, only=["models."]):
+            print(f"{m.name:28} {_format_time(m.median):>12} {m.ops_per_sec:>14,.1f}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
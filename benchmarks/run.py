@@ -0,0 +1,355 @@
+"""Benchmark suite for the quiz hot paths.
+
+Times question loading, quiz generation, option shuffling, model
+serialization, leaderboard reads and writes, and results analytics over
+synthetic data (see benchmarks.data), writes the measurements as JSON, and
+optionally compares them with a stored baseline run:
+
+    python -m benchmarks.run --scale medium
+    python -m benchmarks.run --compare exports/benchmarks/baseline.json
+
+A comparison flags every benchmark whose median time per operation grew by
+more than the threshold and exits with status 1 if any did.
+"""
+
+import argparse
+import atexit
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.config import BASE_DIR, EXPORTS_DIR
+from src.creators.quiz_creator import QuizCreator
+from src.models.question_model import Question
+from src.models.quiz_model import Quiz
+from src.utils.analytics import ColumnarAnalytics, QuizAnalytics
+from src.utils.leaderboard_handler import LeaderboardHandler
+from src.utils.leaderboard_index import LeaderboardIndex
+from src.utils.question_cache import clear_cache, get_bank
+from src.utils.score_store import ScoreStore
+from src.utils.shuffle import shuffle_options
+
+from . import startup
+from .data import quiz_results, write_leaderboard, write_question_bank
+
+RESULTS_VERSION = 1
+BENCH_DIR = EXPORTS_DIR / "benchmarks"
+
+# Dataset sizes per data kind
+SCALES: Dict[str, Dict[str, List[int]]] = {
+    "small": {"questions": [1_000], "leaderboard": [1_000], "results": [1_000]},
+    "medium": {"questions": [1_000, 100_000], "leaderboard": [1_000, 1_000_000], "results": [1_000, 100_000]},
+    "large": {
+        "questions": [1_000, 100_000, 1_000_000],
+        "leaderboard": [1_000, 1_000_000, 10_000_000],
+        "results": [1_000, 100_000, 1_000_000],
+    },
+}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A timed operation; `setup(data, size)` prepares state and returns the operation."""
+
+    name: str
+    kind: str  # data kind ("" for size-independent benchmarks)
+    setup: Callable[[Any, int], Callable[[], Any]]
+    number: int = 1  # operations per timed run
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, kind: str = "", number: int = 1):
+    """Register a benchmark setup function."""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, kind, setup, number)
+        return setup
+    return register
+
+
+@dataclass
+class Measurement:
+    """Seconds per operation over `repeat` runs of `number` operations."""
+
+    name: str
+    size: int
+    number: int
+    repeat: int
+    min: float
+    median: float
+    max: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1.0 / self.median if self.median else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "ops_per_sec": self.ops_per_sec}
+
+
+# -- benchmarks ----------------------------------------------------------------
+
+
+@benchmark("questions.load", "questions")
+def _questions_load(path: Path, size: int):
+    creator = QuizCreator(questions_file=path)
+
+    def op():
+        clear_cache()
+        creator._load_questions()
+    return op
+
+
+@benchmark("questions.load_cached", "questions", number=1000)
+def _questions_load_cached(path: Path, size: int):
+    creator = QuizCreator(questions_file=path)
+    return creator._load_questions
+
+
+@benchmark("quiz.create_by_topic", "questions", number=200)
+def _create_by_topic(path: Path, size: int):
+    creator = QuizCreator(questions_file=path)
+    return lambda: creator.create_quiz_by_topic("Bench", "Math", count=10)
+
+
+@benchmark("quiz.shuffle_options", number=10000)
+def _shuffle_options(data, size: int):
+    options = ["Paris", "London", "Berlin", "Rome"]
+    return lambda: shuffle_options(options, "A")
+
+
+@benchmark("models.question_from_dict", "questions", number=1000)
+def _question_from_dict(path: Path, size: int):
+    items = itertools.cycle(json.loads(path.read_text(encoding="utf-8"))[:1000])
+    return lambda: Question.from_dict(next(items))
+
+
+@benchmark("models.question_to_dict", "questions", number=1000)
+def _question_to_dict(path: Path, size: int):
+    questions = itertools.cycle(get_bank(path).questions[:1000])
+    return lambda: next(questions).to_dict()
+
+
+@benchmark("models.quiz_to_dict", "questions", number=200)
+def _quiz_to_dict(path: Path, size: int):
+    quiz = Quiz(id="bench", title="Bench", questions=list(get_bank(path).questions[:20]))
+    return quiz.to_dict
+
+
+@benchmark("leaderboard.index_build", "leaderboard")
+def _index_build(path: Path, size: int):
+    LeaderboardHandler(path)  # migrate once, outside the timing
+    store = ScoreStore(path)
+    index_path = path.with_name(path.stem + ".index.json")
+
+    def op():
+        index_path.unlink(missing_ok=True)
+        index = LeaderboardIndex(store)
+        index.refresh()
+        atexit.unregister(index.save)
+    return op
+
+
+@benchmark("leaderboard.get_leaderboard", "leaderboard", number=1000)
+def _get_leaderboard(path: Path, size: int):
+    handler = LeaderboardHandler(path)
+    handler.index.refresh()  # catching up is what index_build measures
+    return lambda: handler.get_leaderboard(10)
+
+
+@benchmark("leaderboard.get_user_history", "leaderboard", number=200)
+def _get_user_history(path: Path, size: int):
+    handler = LeaderboardHandler(path)
+    handler.index.refresh()
+    users = itertools.cycle(sorted(handler.index.users)[:200] or ["nobody"])
+    return lambda: handler.get_user_history(next(users))
+
+
+@benchmark("leaderboard.add_score", "leaderboard", number=200)
+def _add_score(path: Path, size: int):
+    handler = LeaderboardHandler(path)
+    handler.index.refresh()
+    return lambda: handler.add_score("bench-user", "Bench Quiz", 7, 10, category="Math", difficulty="easy")
+
+
+@benchmark("analytics.summary", "results")
+def _analytics_summary(results: list, size: int):
+    return lambda: QuizAnalytics(results).summary()
+
+
+@benchmark("analytics.columnar_summary", "results")
+def _analytics_columnar(results: list, size: int):
+    return lambda: ColumnarAnalytics(results).summary()
+
+
+@benchmark("startup.cli")
+def _startup_cli(data, size: int):
+    return lambda: startup.measure("cli")  # includes interpreter start-up
+
+
+@benchmark("startup.app")
+def _startup_app(data, size: int):
+    return lambda: startup.measure("app")
+
+
+# -- harness -------------------------------------------------------------------
+
+
+def _dataset(kind: str, size: int, data_dir: Path, cache: Dict):
+    key = (kind, size)
+    if key not in cache:
+        if kind == "questions":
+            path = data_dir / f"questions-{size}.json"
+            cache[key] = path if path.exists() else write_question_bank(path, size)
+        elif kind == "leaderboard":
+            path = data_dir / f"leaderboard-{size}" / "leaderboard.json"
+            snapshot = path.with_name("leaderboard.snapshot.jsonl")
+            cache[key] = path if snapshot.exists() else write_leaderboard(path, size)
+        elif kind == "results":
+            cache[key] = quiz_results(size)
+        else:
+            cache[key] = None
+    return cache[key]
+
+
+def measure(op: Callable[[], Any], number: int, repeat: int) -> List[float]:
+    """Seconds per operation for each of `repeat` runs."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        times.append((time.perf_counter() - started) / number)
+    return times
+
+
+def run_suite(
+    scale: Dict[str, List[int]],
+    data_dir: Path,
+    repeat: int = 5,
+    only: Sequence[str] = (),
+    max_number: Optional[int] = None,
+    log: Callable[[str], None] = lambda line: None,
+) -> List[Measurement]:
+    """Run every selected benchmark at every size of its data kind."""
+    cache: Dict = {}
+    measurements = []
+    for bench in BENCHMARKS.values():
+        if only and not any(bench.name.startswith(prefix) for prefix in only):
+            continue
+        number = min(bench.number, max_number) if max_number else bench.number
+        for size in scale.get(bench.kind, []) if bench.kind else [0]:
+            data = _dataset(bench.kind, size, data_dir, cache)
+            times = measure(bench.setup(data, size), number, repeat)
+            m = Measurement(bench.name, size, number, repeat, min(times), statistics.median(times), max(times))
+            measurements.append(m)
+            log(f"{m.name:32} {m.size:>10,} {_format_time(m.median):>12} {m.ops_per_sec:>14,.1f}/s")
+    return measurements
+
+
+def _format_time(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True)
+    except OSError:
+        return ""
+    return out.stdout.strip()
+
+
+def results_document(measurements: List[Measurement], scale_name: str, repeat: int) -> Dict[str, Any]:
+    """Machine-readable results, as written by --out."""
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scale": scale_name,
+            "repeat": repeat,
+        },
+        "results": [m.to_dict() for m in measurements],
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare median times with a baseline document.
+
+    Returns one row per benchmark present in both, with `ratio` (current /
+    baseline) and `status`: "regression" above 1 + threshold, "improvement"
+    below 1 - threshold, "ok" otherwise.
+    """
+    base = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current.get("results", []):
+        b = base.get((r["name"], r["size"]))
+        if b is None or not b["median"]:
+            continue
+        ratio = r["median"] / b["median"]
+        status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "ok"
+        rows.append({"name": r["name"], "size": r["size"], "baseline": b["median"], "current": r["median"],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def main(argv=None) -> int:
+    """Benchmark the quiz hot paths."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--only", nargs="*", default=[], help="benchmark name prefixes to run")
+    parser.add_argument("--quick", action="store_true", help="at most 10 operations per run")
+    parser.add_argument("--data-dir", type=Path, help="keep and reuse generated datasets here")
+    parser.add_argument("--out", type=Path, help="results JSON (default: exports/benchmarks/<time>.json)")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = Path(tempfile.mkdtemp(prefix="quiz-bench-"))
+        # Registered first so it runs last, after stores and indexes flush at exit
+        atexit.register(shutil.rmtree, data_dir, True)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    print(f"{'benchmark':32} {'size':>10} {'median/op':>12} {'throughput':>16}")
+    measurements = run_suite(SCALES[args.scale], data_dir, args.repeat, args.only, 10 if args.quick else None, log=print)
+
+    doc = results_document(measurements, args.scale, args.repeat)
+    out = args.out or BENCH_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"\nWrote {out}")
+
+    if args.compare:
+        rows = compare(doc, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%}):")
+        for row in rows:
+            flag = {"regression": "REGRESSION", "improvement": "faster"}.get(row["status"], "")
+            print(f"{row['name']:32} {row['size']:>10,} {row['ratio']:>7.2f}x  {flag}")
+        if any(row["status"] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
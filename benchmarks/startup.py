@@ -0,0 +1,99 @@
+"""Cold-start time of the CLI and Streamlit entry points.
+
+Each measurement runs in a fresh interpreter. "cli" times importing src.main
+and building the Menu. "app" times the first run of app.py for a new session
+(the Home page), with the load test's streamlit stand-in in place of
+streamlit, against a temporary copy of data/. Both also report which heavy
+modules were imported, since startup should not need them:
+
+    python -m benchmarks.startup
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .load_test import ROOT, prepare_data_dir
+
+# Seconds; generous enough for slow CI machines, tight enough to catch an eager heavy import
+BUDGETS = {"cli": 0.5, "app": 1.5}
+
+# Only needed by some pages and actions
+HEAVY_MODULES = ("pandas", "plotly", "numpy", "pyarrow", "http.server", "concurrent.futures", "sqlite3")
+
+_CLI = """
+import json, sys, time
+started = time.perf_counter()
+from src.main import Menu
+Menu()
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+_APP = """
+import json, sys, time
+from benchmarks import load_test
+sys.modules["streamlit"] = load_test._FakeStreamlit()
+code = compile(load_test.APP_FILE.read_text(encoding="utf-8"), str(load_test.APP_FILE), "exec")
+started = time.perf_counter()
+load_test.Session(0, code).interact("open")
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+SCRIPTS = {"cli": _CLI, "app": _APP}
+
+
+@dataclass
+class Startup:
+    entry: str
+    seconds: float
+    heavy_modules: List[str]
+
+    @property
+    def within_budget(self) -> bool:
+        return self.seconds <= BUDGETS[self.entry]
+
+
+def measure(entry: str, data_dir: Optional[Path] = None) -> Startup:
+    """Start `entry` ("cli" or "app") in a fresh interpreter, using `data_dir` for app data."""
+    scratch = None
+    if data_dir is None:
+        scratch = data_dir = prepare_data_dir(Path(tempfile.mkdtemp(prefix="quiz-startup-")))
+    env = {**os.environ, "QUIZ_DATA_DIR": str(data_dir), "QUIZ_RESULTS_FILE": str(data_dir / "results.csv")}
+    try:
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPTS[entry]], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+    doc = json.loads(out.stdout.strip().splitlines()[-1])
+    return Startup(entry, doc["seconds"], [m for m in HEAVY_MODULES if m in doc["modules"]])
+
+
+def main(argv=None) -> int:
+    """Measure cold-start time of the CLI and Streamlit entry points."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("entries", nargs="*", metavar="entry", help="cli and/or app (default: both)")
+    args = parser.parse_args(argv)
+    unknown = set(args.entries) - set(SCRIPTS)
+    if unknown:
+        parser.error(f"unknown entries: {', '.join(sorted(unknown))}")
+
+    ok = True
+    for entry in args.entries or sorted(SCRIPTS):
+        s = measure(entry)
+        ok = ok and s.within_budget and not s.heavy_modules
+        status = "ok" if s.within_budget else f"OVER BUDGET ({BUDGETS[entry]:.2f} s)"
+        print(f"{entry:4} {s.seconds * 1000:8.1f} ms  {status}  heavy modules: {', '.join(s.heavy_modules) or 'none'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
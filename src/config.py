@@ -4,21 +4,44 @@ import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("QUIZ_DATA_DIR", BASE_DIR / "data"))
 QUIZZES_DIR = DATA_DIR / "quizzes"
 EXPORTS_DIR = BASE_DIR / "exports"
 PDF_DIR = EXPORTS_DIR / "quiz_pdfs"
 REPORTS_DIR = EXPORTS_DIR / "quiz_reports"
-
-# Ensure directories exist
-for d in [DATA_DIR, QUIZZES_DIR, EXPORTS_DIR, PDF_DIR, REPORTS_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
+# Directories are created by whatever first writes into them, not at import
 
 # File paths
 QUESTIONS_FILE = DATA_DIR / "questions.json"
 CATEGORIES_FILE = DATA_DIR / "categories.json"
 DIFFICULTY_LEVELS_FILE = DATA_DIR / "difficulty_levels.json"
 LEADERBOARD_FILE = DATA_DIR / "leaderboard.json"
+ANSWERS_FILE = DATA_DIR / "answers.jsonl"
+ITEM_STATS_FILE = DATA_DIR / "item_stats.json"
+RESULTS_FILE = Path(os.environ.get("QUIZ_RESULTS_FILE", BASE_DIR / "quizzes" / "results.csv"))
+DATABASE_FILE = Path(os.environ.get("QUIZ_DATABASE", DATA_DIR / "quiz.db"))
+
+# Question files at least this large are indexed and loaded lazily
+LAZY_BANK_BYTES = int(os.environ.get("QUIZ_LAZY_BANK_BYTES", 32 * 1024 * 1024))
+
+# results.csv: rotate past this size (and daily if enabled); optionally also write column batches
+RESULTS_MAX_BYTES = int(os.environ.get("QUIZ_RESULTS_MAX_BYTES", 64 * 1024 * 1024))
+RESULTS_ROTATE_DAILY = os.environ.get("QUIZ_RESULTS_ROTATE_DAILY", "") == "1"
+RESULTS_COLUMNAR = os.environ.get("QUIZ_RESULTS_COLUMNAR", "") == "1"
+
+# Instrumentation (src/utils/metrics.py): off unless QUIZ_METRICS=1; /metrics is served on
+# METRICS_PORT (0 disables the endpoint). QUIZ_ADMIN=1 shows the sidebar admin panel.
+METRICS_ENABLED = os.environ.get("QUIZ_METRICS", "") == "1"
+METRICS_PORT = int(os.environ.get("QUIZ_METRICS_PORT", 9464))
+ADMIN_PANEL = os.environ.get("QUIZ_ADMIN", "") == "1"
+
+# Per-rerun profiling of app.py (src/utils/profiler.py): collapsed stacks under PROFILE_DIR
+PROFILE_RERUNS = os.environ.get("QUIZ_PROFILE", "") == "1"
+PROFILE_DIR = EXPORTS_DIR / "profiles"
+PROFILE_INTERVAL = float(os.environ.get("QUIZ_PROFILE_INTERVAL_MS", 1)) / 1000
+
+# Storage backend: "json" (files under data/) or "sqlite" (DATABASE_FILE)
+STORAGE_BACKEND = os.environ.get("QUIZ_STORAGE_BACKEND", "json")
 
 # Default settings
 DEFAULT_TIMER_PER_QUESTION = 60  # seconds
@@ -28,6 +51,13 @@ DEFAULT_CATEGORY = "General"
 # Difficulty levels
 DIFFICULTY_LEVELS = ["easy", "medium", "hard"]
 
+# Leaderboard settings
+PASS_PERCENTAGE = 60.0
+HISTORY_PAGE_SIZE = 20  # scores per page of a user's history
+
+# Item analysis: minimum answers before a question's difficulty is calibrated
+ITEM_MIN_RESPONSES = 30
+
 # Quiz settings
 MIN_QUESTIONS = 1
 MAX_QUESTIONS = 100
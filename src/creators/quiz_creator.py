@@ -1,10 +1,15 @@
 """Quiz creator module for building quizzes interactively."""
 
-from typing import Optional, List
+import random
+from typing import Optional, List, Tuple
 from pathlib import Path
-from src.models.question_model import Question
 from src.models.quiz_model import Quiz
-from src.utils.file_handler import load_json, save_json
+from src.models.question_bank import QuestionBank
+from src.storage.repository import QuestionRepository, QuizRepository
+from src.storage.json_backend import JsonQuestionRepository, JsonQuizRepository
+from src.runners.adaptive_engine import IRTAdaptiveEngine, item_table
+from src.utils.metrics import timed
+from .sampler import make_view, sample_questions
 from src.config import QUESTIONS_FILE, QUIZZES_DIR, CATEGORIES_FILE
 import uuid
 
@@ -12,93 +17,113 @@ import uuid
 class QuizCreator:
     """Create quizzes from existing questions."""
 
-    def __init__(self, questions_file: Path = QUESTIONS_FILE):
+    def __init__(
+        self,
+        questions_file: Path = QUESTIONS_FILE,
+        question_repository: Optional[QuestionRepository] = None,
+        quiz_repository: Optional[QuizRepository] = None,
+    ):
         self.questions_file = questions_file
-        self.questions = self._load_questions()
-
-    def _load_questions(self) -> List[Question]:
-        """Load questions from file."""
-        data = load_json(self.questions_file)
-        if not isinstance(data, list):
-            return []
-        return [Question.from_dict(q) for q in data]
-
+        self.question_repository = question_repository or JsonQuestionRepository(questions_file)
+        self.quiz_repository = quiz_repository or JsonQuizRepository(QUIZZES_DIR, self.question_repository)
+        self.bank = self._load_questions()
+        self.questions = self.bank.questions
+
+    @timed("quiz_creator.load_questions")
+    def _load_questions(self) -> QuestionBank:
+        """Load the indexed question bank (shared and cached by the repository)."""
+        return self.question_repository.load_bank()
+
+    def refresh(self) -> None:
+        """Pick up changes to the questions file (cheap when unchanged)."""
+        self.bank = self._load_questions()
+        self.questions = self.bank.questions
+
+    @timed("quiz_creator.create_by_topic")
     def create_quiz_by_topic(
-        self, title: str, topic: str, count: int = 5, shuffle: bool = True
+        self, title: str, topic: str, count: int = 5, shuffle: bool = True, seed: Optional[str] = None
     ) -> Quiz:
-        """Create a quiz for a specific topic."""
-        import random
-        from copy import deepcopy
-
-        pool = [q for q in self.questions if q.topic and q.topic.lower() == topic.lower()]
-        if not pool:
+        """
+        Create a quiz for a specific topic.
+
+        Sampling and shuffling use a private RNG seeded with `seed` (the new
+        quiz's id by default), so the same seed and bank give the same quiz.
+        """
+        pool = self.bank.by_topic(topic)
+        if not topic or not pool:
             raise ValueError(f"No questions found for topic: {topic}")
 
-        count = min(count, len(pool))
-        selected = random.sample(pool, count)
-        
-        # Create deep copies to avoid modifying original questions
-        selected = [deepcopy(q) for q in selected]
-
-        if shuffle:
-            for q in selected:
-                from src.utils.shuffle import shuffle_options
-
-                q.options, q.answer = shuffle_options(q.options, q.answer)
+        quiz_id = str(uuid.uuid4())
+        seed = quiz_id if seed is None else seed
+        rng = random.Random(seed)
 
         quiz = Quiz(
-            id=str(uuid.uuid4()),
+            id=quiz_id,
             title=title,
-            questions=selected,
+            questions=sample_questions(pool, count, rng, shuffle),
+            seed=seed,
             category=topic,
         )
         return quiz
 
+    @timed("quiz_creator.create_by_difficulty")
     def create_quiz_by_difficulty(
-        self, title: str, difficulty: str, count: int = 5, shuffle: bool = True
+        self, title: str, difficulty: str, count: int = 5, shuffle: bool = True, seed: Optional[str] = None
     ) -> Quiz:
-        """Create a quiz with specific difficulty."""
-        import random
-        from copy import deepcopy
-
-        pool = [q for q in self.questions if q.difficulty == difficulty.lower()]
+        """Create a quiz with specific difficulty (see `create_quiz_by_topic` for `seed`)."""
+        pool = self.bank.by_difficulty(difficulty)
         if not pool:
             raise ValueError(f"No questions found with difficulty: {difficulty}")
 
-        count = min(count, len(pool))
-        selected = random.sample(pool, count)
-        
-        # Create deep copies to avoid modifying original questions
-        selected = [deepcopy(q) for q in selected]
-
-        if shuffle:
-            for q in selected:
-                from src.utils.shuffle import shuffle_options
-
-                q.options, q.answer = shuffle_options(q.options, q.answer)
+        quiz_id = str(uuid.uuid4())
+        seed = quiz_id if seed is None else seed
+        rng = random.Random(seed)
 
         quiz = Quiz(
-            id=str(uuid.uuid4()),
+            id=quiz_id,
             title=title,
-            questions=selected,
+            questions=sample_questions(pool, count, rng, shuffle),
+            seed=seed,
             difficulty=difficulty,
         )
         return quiz
 
+    @timed("quiz_creator.create_adaptive")
+    def create_adaptive_quiz(
+        self, title: str, count: int = 10, topic: Optional[str] = None, shuffle: bool = True, seed: Optional[str] = None
+    ) -> Tuple[Quiz, IRTAdaptiveEngine]:
+        """
+        Create an empty quiz plus the IRT engine that picks its questions.
+
+        Questions are chosen one at a time as answers come in; pass the
+        engine to QuizRunner (or call `next_question`/`log_result` directly).
+        """
+        table = item_table(self.bank, topic or None)
+        if not len(table):
+            raise ValueError(f"No questions found for topic: {topic}")
+
+        quiz_id = str(uuid.uuid4())
+        seed = quiz_id if seed is None else seed
+        rng = random.Random(seed)
+        engine = IRTAdaptiveEngine(table, count, prepare=lambda q: make_view(q, rng, shuffle))
+        quiz = Quiz(
+            id=quiz_id,
+            title=title,
+            questions=[],
+            category=topic or "",
+            difficulty="adaptive",
+            seed=seed,
+        )
+        return quiz, engine
+
     def save_quiz(self, quiz: Quiz, filename: str = None) -> str:
-        """Save quiz to file."""
-        if filename is None:
-            filename = f"{quiz.title.replace(' ', '_')}.json"
-        path = QUIZZES_DIR / filename
-        save_json(path, quiz.to_dict())
-        return str(path)
+        """Save quiz to the quiz repository."""
+        return self.quiz_repository.save_quiz(quiz, filename)
 
     def get_available_categories(self) -> List[str]:
         """Get list of unique topics/categories."""
-        categories = sorted({q.topic for q in self.questions if q.topic})
-        return categories
+        return self.bank.categories()
 
     def get_available_difficulties(self) -> List[str]:
         """Get list of unique difficulties."""
-        difficulties = sorted({q.difficulty for q in self.questions if q.difficulty})
-        return difficulties
+        return self.bank.difficulties()
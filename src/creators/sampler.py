@@ -0,0 +1,27 @@
+"""Question sampling shared by every quiz generator."""
+
+import random
+from typing import List, Sequence
+
+from src.models.question_model import Question
+from src.models.quiz_question import QuizQuestion
+
+
+def make_view(question: Question, rng: random.Random = random, shuffle: bool = True) -> QuizQuestion:
+    """A view of `question` with its own option order; the bank question is shared."""
+    if not shuffle:
+        return QuizQuestion.from_rank(question, 0)
+    return QuizQuestion.shuffled(question, rng)
+
+
+def sample_questions(
+    pool: Sequence[Question], count: int, rng: random.Random = random, shuffle: bool = True
+) -> List[QuizQuestion]:
+    """
+    Draw up to `count` distinct questions from `pool` as quiz views.
+
+    `pool` may be any sequence, including a bank index or a lazy pool; only
+    the drawn questions are touched. Pass a seeded random.Random for a
+    reproducible draw.
+    """
+    return [make_view(q, rng, shuffle) for q in rng.sample(pool, min(count, len(pool)))]
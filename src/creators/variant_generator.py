@@ -0,0 +1,261 @@
+"""Bulk generation of randomized exam variants.
+
+Each variant is drawn from a blueprint (how many questions of which
+topic/difficulty) with its own seeded RNG, so variant i of a run can be
+reproduced from the run seed alone. Variants are produced in shards across a
+process pool and streamed to disk in order as shards complete:
+
+- variant_00001.txt ... : printable exam papers (no answers),
+- variants.jsonl        : one JSON object per variant (seed, questions, answers),
+- answer_key.csv        : variant, question number, question id, answer letter.
+
+Two variants never share the same question-and-option ordering: a repeat is
+redrawn with the next attempt seed.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.config import EXPORTS_DIR, QUESTIONS_FILE
+from src.models.quiz_question import QuizQuestion
+from src.utils.question_cache import get_bank
+from .sampler import make_view
+
+VARIANTS_DIR = EXPORTS_DIR / "variants"
+SHARD_SIZE = 200
+MAX_ATTEMPTS = 100
+
+
+@dataclass(frozen=True)
+class BlueprintSection:
+    """`count` questions matching an optional topic and difficulty."""
+
+    count: int
+    topic: str = ""
+    difficulty: str = ""
+
+
+@dataclass
+class BulkResult:
+    """Summary of a bulk generation run."""
+
+    variants: int
+    redraws: int
+    elapsed: float
+    out_dir: Path
+
+    @property
+    def variants_per_sec(self) -> float:
+        return self.variants / self.elapsed if self.elapsed else 0.0
+
+
+def parse_blueprint(spec: str) -> List[BlueprintSection]:
+    """
+    Parse "topic:difficulty:count,..." (topic/difficulty may be empty).
+
+    "Math:easy:3,Science::2,:hard:1" = 3 easy Math, 2 Science, 1 hard from any topic.
+    """
+    sections = []
+    for part in spec.split(","):
+        topic, difficulty, count = (part.strip().split(":") + ["", ""])[:3]
+        if not count:
+            raise ValueError(f"Blueprint section needs a count: {part!r}")
+        sections.append(BlueprintSection(int(count), topic.strip(), difficulty.strip()))
+    return sections
+
+
+def variant_seed(seed: str, index: int, attempt: int = 0) -> str:
+    """Seed string for one variant of a run (and one redraw attempt)."""
+    return f"{seed}:{index}" if attempt == 0 else f"{seed}:{index}:{attempt}"
+
+
+def draw_variant(pools: Sequence[Tuple[BlueprintSection, Sequence]], seed: str, shuffle_questions: bool = True):
+    """
+    Draw one variant's questions (as QuizQuestion views) from `seed`.
+
+    Raises:
+        ValueError: if overlapping sections leave a later one short of questions.
+    """
+    rng = random.Random(seed)
+    chosen: List = []
+    used = set()
+    for section, pool in pools:
+        # Over-sample so questions already taken by an earlier section can be skipped
+        k = min(len(pool), section.count + len(used))
+        picked = [q for q in rng.sample(pool, k) if (q.id or q.text) not in used][: section.count]
+        if len(picked) != section.count:
+            raise ValueError(
+                f"Blueprint section {section.topic or 'any'}:{section.difficulty or 'any'}:{section.count} "
+                f"has only {len(picked)} questions left after earlier sections"
+            )
+        used.update(q.id or q.text for q in picked)
+        chosen.extend(picked)
+    if shuffle_questions:
+        rng.shuffle(chosen)
+    return [make_view(q, rng) for q in chosen]
+
+
+def fingerprint(views: Sequence[QuizQuestion]) -> bytes:
+    """Digest of a variant's question and option ordering."""
+    h = hashlib.blake2b(digest_size=16)
+    for v in views:
+        h.update(f"{v.id}\x1f{','.join(map(str, v.order))}\x1e".encode("utf-8"))
+    return h.digest()
+
+
+def render_text(title: str, number: int, views: Sequence[QuizQuestion]) -> str:
+    """Printable exam paper for one variant (answers are in the answer key)."""
+    lines = [f"{title} - Variant {number}", ""]
+    for idx, v in enumerate(views, start=1):
+        lines.append(f"{idx}. {v.text}")
+        for opt_idx, opt in enumerate(v.options):
+            lines.append(f"   {chr(ord('A') + opt_idx)}. {opt}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+# Per-process state for pool workers
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(questions_file: Path, blueprint: Sequence[BlueprintSection], title: str, shuffle_questions: bool):
+    bank = get_bank(questions_file)
+    _worker["pools"] = [(s, bank.select(s.topic or None, s.difficulty or None)) for s in blueprint]
+    _worker["title"] = title
+    _worker["shuffle_questions"] = shuffle_questions
+
+
+def _make_variant(index: int, seed: str):
+    views = draw_variant(_worker["pools"], seed, _worker["shuffle_questions"])
+    record = {
+        "variant": index + 1,
+        "seed": seed,
+        "questions": [{"id": v.id, "order": list(v.order), "answer": v.answer} for v in views],
+    }
+    return (
+        fingerprint(views),
+        render_text(_worker["title"], index + 1, views),
+        json.dumps(record, ensure_ascii=False),
+        [(index + 1, n, v.id, v.answer) for n, v in enumerate(views, start=1)],
+    )
+
+
+def _generate_shard(seed: str, start: int, stop: int):
+    return [_make_variant(i, variant_seed(seed, i)) for i in range(start, stop)]
+
+
+def generate_variants(
+    count: int,
+    blueprint: Sequence[BlueprintSection],
+    seed: str = "0",
+    title: str = "Exam",
+    out_dir: Path = VARIANTS_DIR,
+    questions_file: Path = QUESTIONS_FILE,
+    workers: Optional[int] = None,
+    shuffle_questions: bool = True,
+) -> BulkResult:
+    """
+    Generate `count` distinct variants and write them under `out_dir`.
+
+    Raises:
+        ValueError: if a blueprint section asks for more questions than exist
+            (on its own or after overlapping earlier sections), or distinct
+            variants cannot be found.
+    """
+    bank = get_bank(questions_file)
+    for section in blueprint:
+        available = len(bank.select(section.topic or None, section.difficulty or None))
+        if section.count > available:
+            raise ValueError(
+                f"Blueprint asks for {section.count} questions "
+                f"(topic={section.topic or 'any'}, difficulty={section.difficulty or 'any'}), "
+                f"only {available} available"
+            )
+
+    workers = workers or os.cpu_count() or 1
+    out_dir.mkdir(parents=True, exist_ok=True)
+    init_args = (questions_file, tuple(blueprint), title, shuffle_questions)
+    shards = [(seed, start, min(start + SHARD_SIZE, count)) for start in range(0, count, SHARD_SIZE)]
+
+    started = time.perf_counter()
+    seen = set()
+    redraws = 0
+    _init_worker(*init_args)  # for in-process runs and redraws
+
+    with (out_dir / "variants.jsonl").open("w", encoding="utf-8") as jsonl, \
+            (out_dir / "answer_key.csv").open("w", encoding="utf-8", newline="") as key_file:
+        key = csv.writer(key_file)
+        key.writerow(["variant", "question", "question_id", "answer"])
+
+        if workers > 1 and len(shards) > 1:
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args)
+            results = pool.map(_generate_shard, *zip(*shards))
+        else:
+            pool = None
+            results = (_generate_shard(*shard) for shard in shards)
+
+        try:
+            for shard, variants in zip(shards, results):
+                for index, variant in enumerate(variants, start=shard[1]):
+                    attempt = 0
+                    while variant[0] in seen:
+                        attempt += 1
+                        if attempt > MAX_ATTEMPTS:
+                            raise ValueError(f"Could not find {count} distinct variants for this blueprint")
+                        redraws += 1
+                        variant = _make_variant(index, variant_seed(seed, index, attempt))
+                    seen.add(variant[0])
+                    _, text, record, rows = variant
+                    (out_dir / f"variant_{index + 1:05d}.txt").write_text(text, encoding="utf-8")
+                    jsonl.write(record + "\n")
+                    key.writerows(rows)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    return BulkResult(count, redraws, time.perf_counter() - started, out_dir)
+
+
+def main(argv=None) -> None:
+    """Generate randomized exam variants in bulk."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--count", type=int, required=True, help="number of variants")
+    parser.add_argument("--blueprint", required=True, help='sections as "topic:difficulty:count,..."')
+    parser.add_argument("--seed", default="0", help="run seed; variant i uses '<seed>:<i>'")
+    parser.add_argument("--title", default="Exam")
+    parser.add_argument("--out", type=Path, default=VARIANTS_DIR)
+    parser.add_argument("--questions", type=Path, default=QUESTIONS_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--keep-order", action="store_true", help="keep blueprint section order")
+    args = parser.parse_args(argv)
+
+    try:
+        result = generate_variants(
+            args.count,
+            parse_blueprint(args.blueprint),
+            seed=args.seed,
+            title=args.title,
+            out_dir=args.out,
+            questions_file=args.questions,
+            workers=args.workers,
+            shuffle_questions=not args.keep_order,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(
+        f"Wrote {result.variants} variants to {result.out_dir} in {result.elapsed:.2f}s "
+        f"({result.variants_per_sec:.0f} variants/sec, {result.redraws} redraws)"
+    )
+
+
+if __name__ == "__main__":
+    main()
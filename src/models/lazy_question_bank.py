@@ -0,0 +1,236 @@
+"""Question bank that indexes a large questions file and loads questions on demand."""
+
+import codecs
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .question_model import Question
+from .question_bank import normalize_topic
+
+CHUNK_SIZE = 1 << 20
+_WHITESPACE = " \t\r\n,"
+
+
+def scan_json_array(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, int, dict]]:
+    """
+    Stream the objects of a top-level JSON array.
+
+    Yields (byte_offset, byte_length, obj) for each element while holding
+    at most a chunk or so of the file in memory. Non-array files yield nothing.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        buf = ""
+        pos = 0          # cursor in buf
+        byte_pos = 0     # file offset of buf[pos]
+        eof = False
+        started = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            data = f.read(chunk_size)
+            eof = not data
+            buf = buf[pos:] + utf8.decode(data, final=eof)
+            pos = 0
+
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                byte_pos += 1
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                fill()
+                continue
+            if not started:
+                if buf[pos] != "[":
+                    return
+                started = True
+                byte_pos += 1
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            length = len(buf[pos:end].encode("utf-8"))
+            yield byte_pos, length, obj
+            byte_pos += length
+            pos = end
+
+
+class LazyPool(Sequence):
+    """A read-only sequence of questions backed by row numbers in a LazyQuestionBank."""
+
+    def __init__(self, bank: "LazyQuestionBank", rows: array):
+        self._bank = bank
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._bank.question(row) for row in self._rows[index]]
+        return self._bank.question(self._rows[index])
+
+    def ids(self) -> List[str]:
+        """Question ids, without loading the questions."""
+        return [self._bank.ids[row] for row in self._rows]
+
+    def difficulties(self) -> List[str]:
+        """Question difficulties, without loading the questions."""
+        labels = self._bank._difficulty_labels
+        codes = self._bank._difficulty_codes
+        return [labels[codes[row]] for row in self._rows]
+
+
+class LazyQuestionBank:
+    """
+    QuestionBank interface over a compact index of a questions file.
+
+    At load time only the id, byte offset and length plus a difficulty code
+    are kept per question, in arrays, with topic/difficulty pools holding
+    row numbers; a Question is parsed from the file when it is
+    indexed, e.g. by random.sample on a pool. Recently hydrated questions
+    are kept in a small LRU cache, shared by every thread using the bank.
+    """
+
+    def __init__(self, path: Path, cache_size: int = 1024):
+        self.path = Path(path)
+        self.ids: List[str] = []
+        self._offsets = array("q")
+        self._lengths = array("l")
+        self._difficulty_codes = array("H")
+        self._difficulty_labels: List[str] = []
+        self._cache: "OrderedDict[int, Question]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._rows_by_id: Optional[Dict[str, int]] = None
+
+        difficulty_code: Dict[str, int] = {}
+        by_topic: Dict[str, array] = {}
+        by_difficulty: Dict[str, array] = {}
+        by_pair: Dict[Tuple[str, str], array] = {}
+        topic_counts: Dict[str, int] = {}
+        difficulty_counts: Dict[str, int] = {}
+
+        try:
+            st = self.path.stat()
+            self._signature = (st.st_mtime_ns, st.st_size)
+            items = scan_json_array(self.path)
+        except FileNotFoundError:
+            self._signature = (0, 0)
+            items = iter(())
+
+        for row, (offset, length, item) in enumerate(items):
+            if not isinstance(item, dict):
+                raise ValueError(
+                    f"{self.path}: element {row + 1} (byte {offset}) is a {type(item).__name__}, not a question object"
+                )
+            topic = item.get("topic", "") or ""
+            difficulty = item.get("difficulty", "medium") or ""
+            if difficulty not in difficulty_code:
+                difficulty_code[difficulty] = len(self._difficulty_labels)
+                self._difficulty_labels.append(difficulty)
+            self.ids.append(str(item.get("id", row + 1)))
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            self._difficulty_codes.append(difficulty_code[difficulty])
+
+            topic_key = normalize_topic(topic)
+            by_topic.setdefault(topic_key, array("L")).append(row)
+            by_difficulty.setdefault(difficulty, array("L")).append(row)
+            by_pair.setdefault((topic_key, difficulty), array("L")).append(row)
+            topic_counts[topic] = topic_counts.get(topic, 0) + 1
+            difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
+
+        self.questions = LazyPool(self, array("L", range(len(self.ids))))
+        self._by_topic = {k: LazyPool(self, v) for k, v in by_topic.items()}
+        self._by_difficulty = {k: LazyPool(self, v) for k, v in by_difficulty.items()}
+        self._by_pair = {k: LazyPool(self, v) for k, v in by_pair.items()}
+        self._topic_counts = topic_counts
+        self._difficulty_counts = difficulty_counts
+        self._categories = sorted(t for t in topic_counts if t)
+        self._difficulties = sorted(d for d in difficulty_counts if d)
+        self._empty = LazyPool(self, array("L"))
+        # Adaptive item tables over this bank, by topic (see runners.adaptive_engine.item_table)
+        self.item_tables: Dict[Optional[str], Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def question(self, row: int) -> Question:
+        """Parse (or fetch from cache) the question at `row`."""
+        with self._cache_lock:
+            cached = self._cache.get(row)
+            if cached is not None:
+                self._cache.move_to_end(row)
+                return cached
+        st = self.path.stat()
+        if (st.st_mtime_ns, st.st_size) != self._signature:
+            raise RuntimeError(f"{self.path} changed since it was indexed; reload the question bank")
+        with open(self.path, "rb") as f:
+            data = os.pread(f.fileno(), self._lengths[row], self._offsets[row])
+        question = Question.from_dict(json.loads(data), self.ids[row])
+        with self._cache_lock:
+            self._cache[row] = question
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return question
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """The question with the given id, or None (the id map is built on first use)."""
+        if self._rows_by_id is None:
+            rows: Dict[str, int] = {}
+            for row, qid in enumerate(self.ids):
+                rows.setdefault(qid, row)
+            self._rows_by_id = rows
+        row = self._rows_by_id.get(question_id)
+        return self.question(row) if row is not None else None
+
+    def by_topic(self, topic: str) -> LazyPool:
+        """Questions whose topic matches `topic` (case-insensitive)."""
+        return self._by_topic.get(normalize_topic(topic), self._empty)
+
+    def by_difficulty(self, difficulty: str) -> LazyPool:
+        """Questions with the given difficulty."""
+        return self._by_difficulty.get(difficulty.lower(), self._empty)
+
+    def select(self, topic: Optional[str] = None, difficulty: Optional[str] = None) -> LazyPool:
+        """Questions matching an optional topic and/or difficulty."""
+        if topic and difficulty:
+            return self._by_pair.get((normalize_topic(topic), difficulty.lower()), self._empty)
+        if topic:
+            return self.by_topic(topic)
+        if difficulty:
+            return self.by_difficulty(difficulty)
+        return self.questions
+
+    def categories(self) -> List[str]:
+        """Sorted list of distinct topics."""
+        return list(self._categories)
+
+    def difficulties(self) -> List[str]:
+        """Sorted list of distinct difficulties."""
+        return list(self._difficulties)
+
+    def topic_counts(self) -> Dict[str, int]:
+        """Number of questions per topic ('' for questions without a topic)."""
+        return dict(self._topic_counts)
+
+    def difficulty_counts(self) -> Dict[str, int]:
+        """Number of questions per difficulty."""
+        return dict(self._difficulty_counts)
@@ -0,0 +1,86 @@
+"""Immutable question bank, indexed by id, topic and difficulty."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from .question_model import Question
+
+
+def normalize_topic(topic: Optional[str]) -> str:
+    """Return the lookup key used for a topic."""
+    return topic.lower() if topic else ""
+
+
+class QuestionBank:
+    """Immutable question collection with prebuilt topic/difficulty indexes."""
+
+    def __init__(self, questions: Iterable[Question]):
+        self.questions: Tuple[Question, ...] = tuple(questions)
+
+        by_topic: Dict[str, List[Question]] = {}
+        by_difficulty: Dict[str, List[Question]] = {}
+        by_pair: Dict[Tuple[str, str], List[Question]] = {}
+        topic_counts: Dict[str, int] = {}
+        difficulty_counts: Dict[str, int] = {}
+
+        by_id: Dict[str, Question] = {}
+
+        for q in self.questions:
+            by_id.setdefault(q.id, q)
+            topic_key = normalize_topic(q.topic)
+            difficulty = q.difficulty or ""
+            by_topic.setdefault(topic_key, []).append(q)
+            by_difficulty.setdefault(difficulty, []).append(q)
+            by_pair.setdefault((topic_key, difficulty), []).append(q)
+            topic_counts[q.topic or ""] = topic_counts.get(q.topic or "", 0) + 1
+            difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
+
+        self._by_id = by_id
+        self._by_topic = {k: tuple(v) for k, v in by_topic.items()}
+        self._by_difficulty = {k: tuple(v) for k, v in by_difficulty.items()}
+        self._by_pair = {k: tuple(v) for k, v in by_pair.items()}
+        self._topic_counts = topic_counts
+        self._difficulty_counts = difficulty_counts
+        self._categories = sorted(t for t in topic_counts if t)
+        self._difficulties = sorted(d for d in difficulty_counts if d)
+        # Adaptive item tables over this bank, by topic (see runners.adaptive_engine.item_table)
+        self.item_tables: Dict[Optional[str], Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """The question with the given id, or None."""
+        return self._by_id.get(question_id)
+
+    def by_topic(self, topic: str) -> Tuple[Question, ...]:
+        """Questions whose topic matches `topic` (case-insensitive)."""
+        return self._by_topic.get(normalize_topic(topic), ())
+
+    def by_difficulty(self, difficulty: str) -> Tuple[Question, ...]:
+        """Questions with the given difficulty."""
+        return self._by_difficulty.get(difficulty.lower(), ())
+
+    def select(self, topic: Optional[str] = None, difficulty: Optional[str] = None) -> Tuple[Question, ...]:
+        """Questions matching an optional topic and/or difficulty."""
+        if topic and difficulty:
+            return self._by_pair.get((normalize_topic(topic), difficulty.lower()), ())
+        if topic:
+            return self.by_topic(topic)
+        if difficulty:
+            return self.by_difficulty(difficulty)
+        return self.questions
+
+    def categories(self) -> List[str]:
+        """Sorted list of distinct topics."""
+        return list(self._categories)
+
+    def difficulties(self) -> List[str]:
+        """Sorted list of distinct difficulties."""
+        return list(self._difficulties)
+
+    def topic_counts(self) -> Dict[str, int]:
+        """Number of questions per topic ('' for questions without a topic)."""
+        return dict(self._topic_counts)
+
+    def difficulty_counts(self) -> Dict[str, int]:
+        """Number of questions per difficulty."""
+        return dict(self._difficulty_counts)
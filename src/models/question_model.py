@@ -1,30 +1,95 @@
-from dataclasses import dataclass, asdict, field
-from typing import Optional, Dict, Any
+import sys
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Tuple
 
+from src.utils.shuffle import correct_index
 
-@dataclass
-class Question:
-    """Represents a single quiz question."""
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Share one copy of repeated labels (topics, difficulties) across questions."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Answerable:
+    """
+    Answer checking shared by Question and QuizQuestion.
+
+    Subclasses provide `options` and `answer_index`, the position of the
+    correct option resolved once when the question is built (-1 when the
+    stored answer is free text that matches no option).
+    """
+
+    __slots__ = ()
+
+    @property
+    def correct_letter(self) -> str:
+        """Letter of the correct option ('' if the answer is not an option)."""
+        return chr(ord("A") + self.answer_index) if self.answer_index >= 0 else ""
+
+    @property
+    def correct_text(self) -> str:
+        """Text of the correct option (the stored answer if it is not an option)."""
+        if self.answer_index >= 0:
+            return self.options[self.answer_index]
+        return "" if _is_letter(self.answer) else self.answer
+
+    def grade(self, response: str) -> Tuple[bool, int]:
+        """
+        Check a response given as an option letter or as option text.
+
+        Returns:
+            (is_correct, chosen option index or -1 if it matches no option)
+        """
+        response = (response or "").strip()
+        if not response:
+            return False, -1
+        idx = correct_index(self.options, response)
+        if self.answer_index >= 0:
+            return idx == self.answer_index, idx
+        return bool(self.correct_text) and response == self.correct_text, idx
+
+
+def _is_letter(value: Any) -> bool:
+    return isinstance(value, str) and len(value) == 1 and value.isalpha()
+
+
+@dataclass(frozen=True, slots=True)
+class Question(Answerable):
+    """Represents a single quiz question (immutable; options are a tuple)."""
 
     id: str
     text: str
-    options: list
+    options: Tuple[str, ...]
     answer: str  # Letter (A/B/C/D) or text
     topic: Optional[str] = ""
     difficulty: Optional[str] = "medium"  # easy, medium, hard
     explanation: Optional[str] = ""
+    answer_index: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if type(self.options) is not tuple:
+            object.__setattr__(self, "options", tuple(self.options))
+        object.__setattr__(self, "answer_index", correct_index(self.options, self.answer))
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "text": self.text,
+            "options": list(self.options),
+            "answer": self.answer,
+            "topic": self.topic,
+            "difficulty": self.difficulty,
+            "explanation": self.explanation,
+        }
 
     @staticmethod
-    def from_dict(d: Dict[str, Any]) -> "Question":
+    def from_dict(d: Dict[str, Any], default_id: str = "") -> "Question":
         return Question(
-            id=str(d.get("id", "")),
-            text=d["text"],
-            options=d.get("options", []),
-            answer=d["answer"],
-            topic=d.get("topic", ""),
-            difficulty=d.get("difficulty", "medium"),
-            explanation=d.get("explanation", ""),
+            str(d.get("id", default_id)),
+            d["text"],
+            tuple(d.get("options", ())),
+            d["answer"],
+            _intern(d.get("topic", "")),
+            _intern(d.get("difficulty", "medium")),
+            d.get("explanation", ""),
         )
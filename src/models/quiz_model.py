@@ -1,12 +1,13 @@
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from .question_model import Question
+from .quiz_question import QuizQuestion
 
 
-@dataclass
+@dataclass(slots=True)
 class Quiz:
-    """Represents a quiz."""
+    """Represents a quiz (adaptive quizzes append to `questions` as they run)."""
 
     id: str
     title: str
@@ -15,26 +16,62 @@ class Quiz:
     difficulty: str = "mixed"  # easy, medium, hard, mixed
     timer_per_question: int = 0  # seconds; 0 = no timer
     created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    seed: str = ""  # RNG seed the questions were sampled and shuffled with
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def is_compact(self) -> bool:
+        """True when every question is a view of a bank question (see `to_dict`)."""
+        return all(isinstance(q, QuizQuestion) for q in self.questions)
+
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
+        """
+        Serialize the quiz.
+
+        With `compact=True` (only valid when `is_compact()`), questions are
+        stored as [question id, option permutation rank] pairs instead of
+        full copies; `from_dict` resolves them against the question bank.
+        """
+        d = {
             "id": self.id,
             "title": self.title,
-            "questions": [q.to_dict() for q in self.questions],
             "category": self.category,
             "difficulty": self.difficulty,
             "timer_per_question": self.timer_per_question,
             "created_at": self.created_at,
+            "seed": self.seed,
         }
+        if compact:
+            d["items"] = [[q.id, q.rank] for q in self.questions]
+        else:
+            d["questions"] = [q.to_dict() for q in self.questions]
+        return d
 
     @staticmethod
-    def from_dict(d: Dict[str, Any]) -> "Quiz":
+    def from_dict(d: Dict[str, Any], bank=None) -> "Quiz":
+        """
+        Build a quiz from `to_dict` output.
+
+        Raises:
+            ValueError: if compact items cannot be resolved (no bank given,
+                or a referenced question is no longer in it).
+        """
+        if "items" in d:
+            if bank is None:
+                raise ValueError("A question bank is needed to load a compact quiz")
+            questions = []
+            for question_id, rank in d["items"]:
+                question = bank.get(question_id)
+                if question is None:
+                    raise ValueError(f"Question {question_id} is no longer in the question bank")
+                questions.append(QuizQuestion.from_rank(question, rank))
+        else:
+            questions = [Question.from_dict(q) for q in d.get("questions", [])]
         return Quiz(
             id=d.get("id", ""),
             title=d.get("title", ""),
-            questions=[Question.from_dict(q) for q in d.get("questions", [])],
+            questions=questions,
             category=d.get("category", ""),
             difficulty=d.get("difficulty", "mixed"),
             timer_per_question=d.get("timer_per_question", 0),
             created_at=d.get("created_at", datetime.now(timezone.utc).isoformat()),
+            seed=d.get("seed", ""),
         )
@@ -0,0 +1,86 @@
+import random
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.shuffle import permutation_from_rank, permutation_rank
+from .question_model import Answerable, Question
+
+
+class QuizQuestion(Answerable):
+    """
+    A bank question as it appears in one quiz: shared question, own option order.
+
+    Only the permutation and the remapped answer index are stored; text and
+    options are read through from the (immutable) bank question, so quizzes
+    never copy question data. Reads like a Question.
+    """
+
+    __slots__ = ("question", "order", "answer_index")
+
+    def __init__(self, question: Question, order: Tuple[int, ...], answer_index: int):
+        self.question = question
+        self.order = order
+        self.answer_index = answer_index
+
+    @staticmethod
+    def from_rank(question: Question, rank: int) -> "QuizQuestion":
+        """Rebuild a view from its permutation rank (see `rank`)."""
+        order = permutation_from_rank(rank, len(question.options))
+        idx = question.answer_index
+        return QuizQuestion(question, order, order.index(idx) if idx >= 0 else -1)
+
+    @staticmethod
+    def shuffled(question: Question, rng: random.Random = random) -> "QuizQuestion":
+        """A view with a random option order drawn from `rng`."""
+        order = list(range(len(question.options)))
+        rng.shuffle(order)
+        idx = question.answer_index
+        return QuizQuestion(question, tuple(order), order.index(idx) if idx >= 0 else -1)
+
+    @property
+    def rank(self) -> int:
+        """Compact encoding of the option order (its lexicographic rank)."""
+        return permutation_rank(self.order)
+
+    @property
+    def id(self) -> str:
+        return self.question.id
+
+    @property
+    def text(self) -> str:
+        return self.question.text
+
+    @property
+    def topic(self) -> Optional[str]:
+        return self.question.topic
+
+    @property
+    def difficulty(self) -> Optional[str]:
+        return self.question.difficulty
+
+    @property
+    def explanation(self) -> Optional[str]:
+        return self.question.explanation
+
+    @property
+    def options(self) -> Tuple[str, ...]:
+        options = self.question.options
+        return tuple(options[i] for i in self.order)
+
+    @property
+    def answer(self) -> str:
+        """
+        Letter of the correct option in this quiz's order.
+
+        An answer that matches no option (answer_index -1) is passed through
+        as stored, so it is graded as free text exactly like the bank question.
+        """
+        return self.correct_letter if self.answer_index >= 0 else self.question.answer
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = self.question.to_dict()
+        d["options"] = list(self.options)
+        d["answer"] = self.answer
+        return d
+
+    def __repr__(self) -> str:
+        return f"QuizQuestion(id={self.id!r}, order={self.order!r}, answer={self.answer!r})"
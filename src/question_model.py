@@ -1,24 +1,5 @@
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
+"""Legacy import path for the question model (see src.models.question_model)."""
 
+from .models.question_model import Question
 
-@dataclass
-class Question:
-    id: str
-    text: str
-    options: List[str]
-    answer: str
-    topic: Optional[str] = ""
-
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-    @staticmethod
-    def from_dict(d: Dict[str, Any]) -> "Question":
-        return Question(
-            id=str(d.get("id", "")),
-            text=d["text"],
-            options=d.get("options", []),
-            answer=d["answer"],
-            topic=d.get("topic", ""),
-        )
+__all__ = ["Question"]
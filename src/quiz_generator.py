@@ -1,56 +1,31 @@
 import random
 from pathlib import Path
 import json
-from typing import List
+from typing import List, Sequence
 from .question_model import Question
+from .creators.sampler import sample_questions
+from .models.question_bank import normalize_topic
+from .models.quiz_question import QuizQuestion
 
 
-def generate_quiz(questions: List[Question], count: int = 5, topic: str | None = None) -> List[Question]:
-    """Return a random sample of questions.
+def generate_quiz(
+    questions: Sequence[Question], count: int = 5, topic: str | None = None, rng: random.Random = random
+) -> List[QuizQuestion]:
+    """Return a random sample of questions with shuffled options and letter answers.
 
     If `topic` is provided, only questions whose `topic` matches (case-insensitive)
-    will be considered.
+    will be considered. Pass a seeded `random.Random` as `rng` for a reproducible quiz.
     """
     pool = questions
     if topic:
-        pool = [q for q in questions if q.topic and q.topic.lower() == topic.lower()]
+        key = normalize_topic(topic)
+        pool = [q for q in questions if normalize_topic(q.topic) == key]
         if not pool:
             raise ValueError(f"No questions found for topic: {topic}")
-    count = min(count, len(pool))
+    return sample_questions(pool, count, rng)
 
-    def _make_shuffled_question(q: Question) -> Question:
-        # Create a shuffled copy of the question and set answer as a letter (A/B/...)
-        opts = list(q.options)
-        # Determine original correct option text (supports both text and letter answers)
-        correct_text = None
-        if isinstance(q.answer, str) and len(q.answer) == 1 and q.answer.isalpha():
-            # letter given relative to original ordering
-            idx = ord(q.answer.upper()) - ord("A")
-            if 0 <= idx < len(q.options):
-                correct_text = q.options[idx]
-        if correct_text is None:
-            # fallback: match by option text
-            for o in q.options:
-                if o == q.answer:
-                    correct_text = o
-                    break
-        if correct_text is None and q.options:
-            # last resort: assume first option
-            correct_text = q.options[0]
 
-        random.shuffle(opts)
-        try:
-            new_idx = opts.index(correct_text)
-        except ValueError:
-            new_idx = 0
-        new_answer_letter = chr(ord("A") + new_idx)
-        return Question(id=q.id, text=q.text, options=opts, answer=new_answer_letter, topic=q.topic)
-
-    sampled = random.sample(pool, count)
-    return [_make_shuffled_question(q) for q in sampled]
-
-
-def save_quiz_text(questions: List[Question], out_path: Path) -> None:
+def save_quiz_text(questions: Sequence[Question], out_path: Path) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", encoding="utf-8") as f:
         # Optional header with topics covered
@@ -65,23 +40,15 @@ def save_quiz_text(questions: List[Question], out_path: Path) -> None:
             f.write("\n")
         f.write("Answer Key:\n")
         for idx, q in enumerate(questions, start=1):
-            # q.answer is now a letter; show both letter and text when possible
-            ans = q.answer
-            ans_text = ""
-            if isinstance(ans, str) and len(ans) == 1 and ans.isalpha():
-                try:
-                    ans_text = q.options[ord(ans.upper()) - ord("A")]
-                except Exception:
-                    ans_text = ""
-            else:
-                ans_text = str(ans)
-            if ans_text:
+            ans = q.correct_letter or q.answer
+            ans_text = q.correct_text
+            if ans_text and ans_text != ans:
                 f.write(f"{idx}: {ans} ({ans_text})\n")
             else:
                 f.write(f"{idx}: {ans}\n")
 
 
-def save_quiz_json(questions: List[Question], out_path: Path) -> None:
+def save_quiz_json(questions: Sequence[Question], out_path: Path) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", encoding="utf-8") as f:
         json.dump([q.to_dict() for q in questions], f, indent=2, ensure_ascii=False)
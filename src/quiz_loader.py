@@ -1,16 +1,12 @@
 from pathlib import Path
-import json
-from typing import List
+from typing import Sequence
 from .question_model import Question
+from .utils.question_cache import get_questions
 
 
-def load_questions(path: Path) -> List[Question]:
+def load_questions(path: Path) -> Sequence[Question]:
+    """Questions stored in `path`, from the shared question cache (ids default to positions)."""
     p = Path(path)
-    with p.open(encoding="utf-8") as f:
-        data = json.load(f)
-    questions = []
-    for i, item in enumerate(data):
-        if "id" not in item:
-            item["id"] = str(i + 1)
-        questions.append(Question.from_dict(item))
-    return questions
+    if not p.exists():
+        raise FileNotFoundError(p)
+    return get_questions(p)
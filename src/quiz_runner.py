@@ -1,11 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from .question_model import Question
-import csv
-from datetime import datetime
 from pathlib import Path
+import time
 
+from .utils.results_sink import get_sink
 
-def run_interactive(questions: List[Question], export_csv: Optional[str] = None) -> None:
+
+def run_interactive(
+    questions: Sequence[Question],
+    export_csv: Optional[str] = None,
+    username: str = "",
+    quiz_title: str = "",
+) -> None:
     print(f"Running quiz: {len(questions)} questions\n")
     correct = 0
     results = []
@@ -15,19 +21,10 @@ def run_interactive(questions: List[Question], export_csv: Optional[str] = None)
             label = chr(ord("A") + oi)
             print(f"  {label}. {opt}")
 
-        # Determine if stored answer is letter or text
-        stored_answer = q.answer
-        correct_letter = None
-        correct_text = None
-        if isinstance(stored_answer, str) and len(stored_answer) == 1 and stored_answer.isalpha():
-            correct_letter = stored_answer.upper()
-            try:
-                correct_text = q.options[ord(correct_letter) - ord("A")]
-            except Exception:
-                correct_text = None
-        else:
-            correct_text = stored_answer
+        correct_letter = q.correct_letter
+        correct_text = q.correct_text
 
+        started = time.perf_counter()
         while True:
             ans = input("Your answer (letter), or type 'skip'/'quit': ").strip()
             if not ans:
@@ -46,31 +43,20 @@ def run_interactive(questions: List[Question], export_csv: Optional[str] = None)
                 print("Quitting quiz early.")
                 # export partial results if requested
                 if export_csv:
-                    _write_results_csv(export_csv, results)
+                    _write_results_csv(export_csv, results, username, quiz_title)
                     print(f"Saved partial results to {export_csv}")
                 return
             # accept letter or full text
-            a = ans.strip().upper()
-            chosen_letter = ""
-            chosen_text = ""
-            if len(a) == 1 and a.isalpha():
-                chosen_letter = a
-                try:
-                    chosen_text = q.options[ord(a) - ord("A")]
-                except Exception:
-                    chosen_text = ""
-            else:
-                chosen_text = ans
-
-            if chosen_text == "":
+            is_correct, chosen_idx = q.grade(ans)
+            if chosen_idx >= 0:
+                chosen_letter = chr(ord("A") + chosen_idx)
+                chosen_text = q.options[chosen_idx]
+            elif len(ans) == 1 and ans.isalpha():
                 print("Invalid choice, please enter a valid option letter or 'skip'/'quit'.")
                 continue
-
-            # Determine correctness
-            if correct_letter:
-                is_correct = (chosen_letter.upper() == correct_letter)
             else:
-                is_correct = (chosen_text == correct_text)
+                chosen_letter = ""
+                chosen_text = ans
 
             if is_correct:
                 print("Correct!\n")
@@ -93,33 +79,19 @@ def run_interactive(questions: List[Question], export_csv: Optional[str] = None)
             "correct_letter": correct_letter or "",
             "correct_text": correct_text or "",
             "is_correct": is_correct,
+            "question_id": q.id,
+            "time_taken": time.perf_counter() - started,
         })
 
     print(f"Score: {correct}/{len(questions)} ({correct/len(questions)*100:.1f}%)")
 
     if export_csv:
-        _write_results_csv(export_csv, results)
+        _write_results_csv(export_csv, results, username, quiz_title)
         print(f"Saved results to {export_csv}")
 
 
-def _write_results_csv(path: str, rows: List[dict]) -> None:
-    fieldnames = [
-        "timestamp",
-        "index",
-        "question",
-        "chosen_letter",
-        "chosen_text",
-        "correct_letter",
-        "correct_text",
-        "is_correct",
-    ]
-    ts = datetime.utcnow().isoformat()
-    write_header = not Path(path).exists()
-    with open(path, "a", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        for r in rows:
-            row = {"timestamp": ts}
-            row.update(r)
-            writer.writerow(row)
+def _write_results_csv(path: str, rows: List[dict], username: str = "", quiz_title: str = "") -> None:
+    # One attempt per CLI run, so write it out now rather than waiting for a batch
+    sink = get_sink(Path(path))
+    sink.write_attempt(rows, username, quiz_title)
+    sink.flush()
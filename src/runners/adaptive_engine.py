@@ -1,6 +1,15 @@
 """Adaptive difficulty engine."""
 
-from typing import List, Dict, Any
+import bisect
+import math
+from array import array
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple, Union
+
+from src.config import ITEM_MIN_RESPONSES, ITEM_STATS_FILE
+from src.models.question_bank import QuestionBank
+from src.models.lazy_question_bank import LazyPool, LazyQuestionBank
+from src.models.question_model import Question
+from src.utils.item_stats import ItemAccumulator, ItemStatistics
 
 
 class AdaptiveEngine:
@@ -58,3 +67,170 @@ class AdaptiveEngine:
             "percentage": (correct / total * 100) if total > 0 else 0,
             "by_difficulty": by_difficulty,
         }
+
+
+# --- Item response theory -------------------------------------------------
+
+# Default 2PL difficulty (b) for authored labels, used until an item has
+# enough recorded answers to be estimated from its p-value.
+LABEL_DIFFICULTY = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+
+
+def _clip(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def item_parameters(difficulty: Optional[str], stats: Optional[ItemAccumulator] = None) -> Tuple[float, float]:
+    """Return (a, b) 2PL parameters for a question with an authored difficulty label."""
+    if stats is not None and stats.n >= ITEM_MIN_RESPONSES:
+        p = _clip(stats.p_value(), 0.02, 0.98)
+        b = _clip(-math.log(p / (1 - p)), -3.0, 3.0)
+        r = _clip(stats.discrimination(), 0.05, 0.95)
+        a = _clip(1.702 * r / math.sqrt(1 - r * r), 0.2, 3.0)
+        return a, b
+    return 1.0, LABEL_DIFFICULTY.get(difficulty or "", 0.0)
+
+
+def probability(theta: float, a: float, b: float) -> float:
+    """2PL probability of a correct answer (1PL when a == 1)."""
+    return 1.0 / (1.0 + math.exp(-a * (theta - b)))
+
+
+class ItemTable:
+    """Per-question (a, b) parameters, sorted by difficulty for fast selection."""
+
+    def __init__(self, questions: Sequence[Question], stats: Optional[ItemStatistics] = None):
+        items = stats.items if stats is not None else {}
+        if isinstance(questions, LazyPool):
+            # Parameters come from the index; questions are loaded only when served
+            fields = zip(questions.ids(), questions.difficulties())
+        else:
+            fields = ((q.id, q.difficulty) for q in questions)
+        params = [item_parameters(difficulty, items.get(qid)) for qid, difficulty in fields]
+        order = sorted(range(len(params)), key=lambda i: params[i][1])
+        self._questions = questions
+        self._order = array("L", order)
+        self.a = array("d", (params[i][0] for i in order))
+        self.b = array("d", (params[i][1] for i in order))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def question(self, idx: int) -> Question:
+        """The question at position `idx` in difficulty order."""
+        return self._questions[self._order[idx]]
+
+    def best(self, theta: float, used: set, window: int = 32) -> Optional[int]:
+        """
+        Index of the unused item with maximum information at `theta`.
+
+        Information a^2 P (1 - P) peaks where b == theta, so only the `window`
+        nearest unused items on each side of theta are scored; with the table
+        sorted by b this costs O(log n + window) regardless of bank size.
+        """
+        pos = bisect.bisect_left(self.b, theta)
+        best_idx, best_info = None, -1.0
+        for indices in (range(pos, len(self.b)), range(pos - 1, -1, -1)):
+            seen = 0
+            for i in indices:
+                if i in used:
+                    continue
+                p = probability(theta, self.a[i], self.b[i])
+                info = self.a[i] * self.a[i] * p * (1 - p)
+                if info > best_info:
+                    best_idx, best_info = i, info
+                seen += 1
+                if seen >= window:
+                    break
+        return best_idx
+
+
+def item_table(bank: Union[QuestionBank, LazyQuestionBank], topic: Optional[str] = None) -> ItemTable:
+    """
+    Item table for a bank (optionally one topic), rebuilt when item stats change.
+
+    Tables are kept on the bank itself, so they go away with it when the
+    question file is reloaded.
+    """
+    try:
+        st = ITEM_STATS_FILE.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        sig = (0, 0)
+    cached = bank.item_tables.get(topic)
+    if cached is None or cached[0] != sig:
+        stats = ItemStatistics.load(ITEM_STATS_FILE) if sig != (0, 0) else None
+        cached = bank.item_tables[topic] = (sig, ItemTable(bank.select(topic=topic), stats))
+    return cached[1]
+
+
+class IRTAdaptiveEngine(AdaptiveEngine):
+    """
+    Computerized adaptive testing with a 2PL model.
+
+    After each answer the ability estimate (theta) is updated by a few
+    Newton steps on the posterior with a standard normal prior (MAP), and the
+    next question is the unused item with maximum Fisher information at the
+    current estimate.
+    """
+
+    def __init__(
+        self,
+        table: ItemTable,
+        max_questions: int,
+        prepare: Optional[Callable[[Question], Question]] = None,
+        prior_sd: float = 1.0,
+    ):
+        super().__init__()
+        self.table = table
+        self.max_questions = min(max_questions, len(table))
+        self.prepare = prepare
+        self.prior_sd = prior_sd
+        self.theta = 0.0
+        self._information = 1.0 / (prior_sd * prior_sd)  # Fisher information of theta; the prior's alone at first
+        self._used: set = set()
+        self._responses: List[Tuple[int, bool]] = []
+        self._pending: Optional[int] = None
+
+    def next_question(self) -> Optional[Question]:
+        """Pick the most informative unused question, or None when the test is over."""
+        if len(self._used) >= self.max_questions:
+            return None
+        idx = self.table.best(self.theta, self._used)
+        if idx is None:
+            return None
+        self._used.add(idx)
+        self._pending = idx
+        question = self.table.question(idx)
+        return self.prepare(question) if self.prepare else question
+
+    def log_result(self, result: Dict[str, Any]) -> None:
+        """Record the answer to the last served question and update theta."""
+        super().log_result(result)
+        if self._pending is None:
+            return
+        self._responses.append((self._pending, bool(result.get("is_correct"))))
+        self._pending = None
+        self._update_theta()
+
+    def _update_theta(self) -> None:
+        theta = self.theta
+        prior_precision = 1.0 / (self.prior_sd * self.prior_sd)
+        for _ in range(10):
+            gradient = -theta * prior_precision
+            information = prior_precision
+            for i, correct in self._responses:
+                a, b = self.table.a[i], self.table.b[i]
+                p = probability(theta, a, b)
+                gradient += a * ((1.0 if correct else 0.0) - p)
+                information += a * a * p * (1 - p)
+            step = gradient / information
+            theta = _clip(theta + step, -4.0, 4.0)
+            if abs(step) < 1e-4:
+                break
+        self.theta = theta
+        self._information = information
+
+    def standard_error(self) -> float:
+        """Standard error of the current ability estimate."""
+        return 1.0 / math.sqrt(self._information)
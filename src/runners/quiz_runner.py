@@ -5,14 +5,22 @@ from src.models.question_model import Question
 from src.models.quiz_model import Quiz
 from src.utils.timer import CountdownTimer
 from src.utils.analytics import QuizAnalytics
+from src.runners.adaptive_engine import IRTAdaptiveEngine
 import time
 
 
 class QuizRunner:
     """Run a quiz interactively and track results."""
 
-    def __init__(self, quiz: Quiz):
+    def __init__(self, quiz: Quiz, engine: Optional[IRTAdaptiveEngine] = None):
+        """
+        Args:
+            quiz: The quiz to run.
+            engine: Optional adaptive engine; when given, questions are drawn
+                from it one at a time and appended to `quiz.questions`.
+        """
         self.quiz = quiz
+        self.engine = engine
         self.results = []
         self.start_time = None
         self.end_time = None
@@ -23,16 +31,27 @@ class QuizRunner:
         print(f"Quiz: {self.quiz.title}")
         print(f"Category: {self.quiz.category or 'General'}")
         print(f"Difficulty: {self.quiz.difficulty}")
-        print(f"Questions: {len(self.quiz.questions)}")
+        total = self.engine.max_questions if self.engine else len(self.quiz.questions)
+        print(f"Questions: {total}")
         if self.quiz.timer_per_question:
             print(f"Time per question: {self.quiz.timer_per_question}s")
         print(f"{'='*60}\n")
 
         self.start_time = time.time()
 
-        for idx, question in enumerate(self.quiz.questions, 1):
-            result = self._run_question(idx, question)
-            self.results.append(result)
+        if self.engine:
+            while True:
+                question = self.engine.next_question()
+                if question is None:
+                    break
+                self.quiz.questions.append(question)
+                result = self._run_question(len(self.quiz.questions), question)
+                self.results.append(result)
+                self.engine.log_result(result)
+        else:
+            for idx, question in enumerate(self.quiz.questions, 1):
+                result = self._run_question(idx, question)
+                self.results.append(result)
 
         self.end_time = time.time()
 
@@ -40,6 +59,8 @@ class QuizRunner:
         analytics = QuizAnalytics(self.results)
         print(f"\n{'='*60}")
         print(analytics.summary())
+        if self.engine:
+            print(f"Estimated ability: {self.engine.theta:+.2f} (SE {self.engine.standard_error():.2f})")
         print(f"{'='*60}\n")
 
         return analytics
@@ -58,69 +79,63 @@ class QuizRunner:
             print(f"   (Time limit: {self.quiz.timer_per_question}s)", end=" ")
 
         q_start = time.time()
-        answer = self._get_answer(timer)
+        answer = self._get_answer(timer, question)
         q_time = time.time() - q_start
 
         if timer:
             timer.stop()
 
         # Validate and grade
-        is_correct, chosen_text = self._validate_answer(answer, question)
+        is_correct, chosen_idx = question.grade(answer)
+        chosen_text = question.options[chosen_idx] if chosen_idx >= 0 else answer
 
         result = {
             "index": question_num,
+            "question_id": question.id,
             "question": question.text,
+            "topic": question.topic,
             "difficulty": question.difficulty,
-            "chosen_letter": answer,
+            "chosen_letter": chr(ord("A") + chosen_idx) if chosen_idx >= 0 else "",
             "chosen_text": chosen_text,
-            "correct_letter": question.answer,
+            "correct_letter": question.correct_letter,
+            "correct_text": question.correct_text,
             "is_correct": is_correct,
             "time_taken": q_time,
         }
 
         if is_correct:
             print("✓ Correct!\n")
+        elif question.correct_letter:
+            print(f"✗ Incorrect. Answer: {question.correct_letter} ({question.correct_text})\n")
         else:
-            correct_text = ""
-            try:
-                idx = ord(question.answer.upper()) - ord("A")
-                correct_text = question.options[idx]
-            except Exception:
-                correct_text = question.answer
-            print(f"✗ Incorrect. Answer: {question.answer} ({correct_text})\n")
+            print(f"✗ Incorrect. Answer: {question.correct_text}\n")
 
         return result
 
-    def _get_answer(self, timer: Optional[CountdownTimer]) -> str:
-        """Get user's answer with validation."""
+    def _get_answer(self, timer: Optional[CountdownTimer], question: Optional[Question] = None) -> str:
+        """Get user's answer (option letter or text) with validation."""
         while True:
             if timer and timer.is_expired():
                 print("TIME UP!")
                 return ""
 
-            ans = input("Your answer (letter) or 'skip'/'quit': ").strip().upper()
+            ans = input("Your answer (letter or text) or 'skip'/'quit': ").strip()
 
-            if ans in {"SKIP", "S"}:
+            if ans.upper() in {"SKIP", "S"}:
                 print("Skipped\n")
                 return ""
-            if ans in {"QUIT", "Q"}:
+            if ans.upper() in {"QUIT", "Q"}:
                 print("Quiz terminated.")
                 raise KeyboardInterrupt()
-            if len(ans) == 1 and ans.isalpha():
+            if len(ans) == 1 and ans.isalpha() and question is not None and question.grade(ans)[1] < 0:
+                print("Invalid. Enter A, B, C, D, the answer text, or 'skip'/'quit'.")
+                continue
+            if ans:
                 return ans
 
-            print("Invalid. Enter A, B, C, D, or 'skip'/'quit'.")
+            print("Invalid. Enter A, B, C, D, the answer text, or 'skip'/'quit'.")
 
     def _validate_answer(self, answer: str, question: Question) -> tuple:
-        """Check if answer is correct."""
-        if not answer:
-            return False, ""
-
-        try:
-            idx = ord(answer) - ord("A")
-            chosen_text = question.options[idx]
-        except (ValueError, IndexError):
-            return False, ""
-
-        is_correct = answer == question.answer
-        return is_correct, chosen_text
+        """Check if an answer (option letter or text) is correct; returns (is_correct, chosen_text)."""
+        is_correct, idx = question.grade(answer)
+        return is_correct, question.options[idx] if idx >= 0 else ""
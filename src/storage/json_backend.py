@@ -0,0 +1,85 @@
+"""JSON file storage backend (the default)."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.config import LEADERBOARD_FILE, QUESTIONS_FILE, QUIZZES_DIR
+from src.models.question_bank import QuestionBank
+from src.models.quiz_model import Quiz
+from src.utils.file_handler import load_json, save_json
+from src.utils.leaderboard_handler import LeaderboardHandler
+from src.utils.question_cache import get_bank
+from .repository import QuestionRepository, QuizRepository, Storage
+
+
+class JsonQuestionRepository(QuestionRepository):
+    """Questions from a JSON array file, via the process-wide question cache."""
+
+    def __init__(self, questions_file: Path = QUESTIONS_FILE):
+        self.questions_file = questions_file
+
+    def load_bank(self) -> QuestionBank:
+        return get_bank(self.questions_file)
+
+    def apply_item_stats(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        data = load_json(self.questions_file)
+        if not isinstance(data, list) or not updates:
+            return 0
+        changed = 0
+        for i, item in enumerate(data):
+            update = updates.get(str(item.get("id", i + 1)))
+            if update is None:
+                continue
+            item.setdefault("authored_difficulty", item.get("difficulty", "medium"))
+            if item.get("difficulty") != update["difficulty"]:
+                changed += 1
+            item.update(update)
+        save_json(self.questions_file, data)
+        return changed
+
+
+class JsonQuizRepository(QuizRepository):
+    """
+    One JSON file per quiz in a directory.
+
+    With a question repository, quizzes built from bank questions are saved
+    compactly (question ids plus option permutations) and resolved on load.
+    """
+
+    def __init__(self, quizzes_dir: Path = QUIZZES_DIR, question_repository: Optional[QuestionRepository] = None):
+        self.quizzes_dir = quizzes_dir
+        self.question_repository = question_repository
+
+    def save_quiz(self, quiz: Quiz, name: Optional[str] = None) -> str:
+        if name is None:
+            name = f"{quiz.title.replace(' ', '_')}.json"
+        path = self.quizzes_dir / name
+        save_json(path, quiz.to_dict(compact=self.question_repository is not None and quiz.is_compact()))
+        return str(path)
+
+    def load_quiz(self, name: str) -> Optional[Quiz]:
+        path = self.quizzes_dir / name
+        if not path.exists():
+            return None
+        data = load_json(path)
+        bank = self.question_repository.load_bank() if self.question_repository and "items" in data else None
+        return Quiz.from_dict(data, bank)
+
+    def list_quizzes(self) -> List[str]:
+        if not self.quizzes_dir.exists():
+            return []
+        return sorted(p.name for p in self.quizzes_dir.glob("*.json"))
+
+
+def open_json_storage(
+    questions_file: Path = QUESTIONS_FILE,
+    quizzes_dir: Path = QUIZZES_DIR,
+    leaderboard_file: Path = LEADERBOARD_FILE,
+) -> Storage:
+    """Build the JSON-backed repositories."""
+    questions = JsonQuestionRepository(questions_file)
+    return Storage(
+        questions=questions,
+        quizzes=JsonQuizRepository(quizzes_dir, questions),
+        scores=LeaderboardHandler(leaderboard_file),
+    )
@@ -0,0 +1,131 @@
+"""Repository interfaces for questions, quizzes and scores."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.models.question_bank import QuestionBank
+from src.models.quiz_model import Quiz
+from src.utils.score_aggregates import ScoreAggregates
+
+
+class QuestionRepository(ABC):
+    """Source of the question bank."""
+
+    @abstractmethod
+    def load_bank(self) -> QuestionBank:
+        """Return the current (cached, read-only) question bank."""
+
+    @abstractmethod
+    def apply_item_stats(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Store empirical statistics and a calibrated difficulty per question.
+
+        `updates` maps question ids to {"difficulty", "p_value",
+        "discrimination", "avg_time"}; unknown ids are ignored. The first
+        authored difficulty is kept as `authored_difficulty`. Returns the
+        number of questions whose difficulty changed.
+        """
+
+
+class QuizRepository(ABC):
+    """Persistence for generated quizzes."""
+
+    @abstractmethod
+    def save_quiz(self, quiz: Quiz, name: Optional[str] = None) -> str:
+        """Store a quiz and return where it was saved."""
+
+    @abstractmethod
+    def load_quiz(self, name: str) -> Optional[Quiz]:
+        """Load a saved quiz by name, or None if it does not exist."""
+
+    @abstractmethod
+    def list_quizzes(self) -> List[str]:
+        """Names of all saved quizzes."""
+
+
+class ScoreRepository(ABC):
+    """Persistence and queries for leaderboard scores."""
+
+    @abstractmethod
+    def add_score(
+        self, username: str, quiz_title: str, score: float, total: int, category: str = "", difficulty: str = ""
+    ) -> None:
+        """Add a score entry to leaderboard (category/difficulty describe the quiz)."""
+
+    @abstractmethod
+    def get_leaderboard(self, limit: int = 10) -> List[Dict]:
+        """Get top scores, best first."""
+
+    @abstractmethod
+    def get_user_history(self, username: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Get a user's scores, oldest first; `offset`/`limit` page through them."""
+
+    @abstractmethod
+    def get_user_stats(self, username: str) -> Dict[str, Any]:
+        """Get aggregates (count, mean/best percentage, best score) for a user."""
+
+    @abstractmethod
+    def get_aggregates(self) -> ScoreAggregates:
+        """A snapshot of the materialized per-user/quiz/topic/difficulty/day aggregates over all scores."""
+
+    @abstractmethod
+    def iter_scores(self, cursor: Optional[List] = None) -> Iterator[Tuple[List, Dict]]:
+        """
+        Stream scores in the order they were added, as (cursor, entry) pairs.
+
+        A cursor is a JSON-serializable marker for its entry; passing it back
+        resumes after that entry (None starts from the first score).
+        Raises ValueError if the cursor is not from this store, e.g. after the
+        scores were rebuilt or the backend was switched.
+        """
+
+    def display_leaderboard(self, limit: int = 10) -> str:
+        """Format leaderboard for display."""
+        scores = self.get_leaderboard(limit)
+        if not scores:
+            return "Leaderboard is empty."
+
+        output = "=== TOP SCORES ===\n"
+        output += f"{'Rank':<5} {'User':<15} {'Quiz':<20} {'Score':<10} {'%':<6}\n"
+        output += "-" * 60 + "\n"
+
+        for idx, entry in enumerate(scores, 1):
+            user = entry.get("username", "Unknown")[:15]
+            quiz = entry.get("quiz_title", "Unknown")[:20]
+            score = entry.get("score", 0)
+            pct = entry.get("percentage", 0)
+            output += f"{idx:<5} {user:<15} {quiz:<20} {score:<10} {pct:.1f}%\n"
+
+        return output
+
+
+@dataclass
+class Storage:
+    """The set of repositories used by the application."""
+
+    questions: QuestionRepository
+    quizzes: QuizRepository
+    scores: ScoreRepository
+
+
+def open_storage(backend: Optional[str] = None) -> Storage:
+    """
+    Open the configured storage backend.
+
+    Args:
+        backend: "json" (files under data/) or "sqlite" (a single WAL-mode
+            database). Defaults to STORAGE_BACKEND from config.
+    """
+    from src.config import STORAGE_BACKEND
+
+    backend = (backend or STORAGE_BACKEND).lower()
+    if backend == "json":
+        from .json_backend import open_json_storage
+
+        return open_json_storage()
+    if backend == "sqlite":
+        from .sqlite_backend import open_sqlite_storage
+
+        return open_sqlite_storage()
+    raise ValueError(f"Unknown storage backend: {backend}")
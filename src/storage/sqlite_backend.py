@@ -0,0 +1,417 @@
+"""Embedded SQLite storage backend.
+
+All repositories share one connection per database file and process. The
+database runs in WAL mode so readers never block the (single) writer, and
+indexes cover the topic/difficulty/username/percentage lookups the app makes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.config import DATABASE_FILE, LEADERBOARD_FILE, QUESTIONS_FILE
+from src.models.question_bank import QuestionBank, normalize_topic
+from src.models.question_model import Question
+from src.models.quiz_model import Quiz
+from src.utils.file_handler import load_json
+from src.utils.score_aggregates import AggregateBucket, ScoreAggregates
+from .repository import QuestionRepository, QuizRepository, ScoreRepository, Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    topic TEXT NOT NULL DEFAULT '',
+    topic_key TEXT NOT NULL DEFAULT '',
+    difficulty TEXT NOT NULL DEFAULT 'medium',
+    explanation TEXT NOT NULL DEFAULT '',
+    authored_difficulty TEXT,
+    p_value REAL,
+    discrimination REAL,
+    avg_time REAL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions (topic_key);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions (difficulty);
+CREATE INDEX IF NOT EXISTS idx_questions_topic_difficulty ON questions (topic_key, difficulty);
+
+CREATE TABLE IF NOT EXISTS quizzes (
+    name TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scores (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    username TEXT NOT NULL,
+    quiz_title TEXT NOT NULL,
+    score REAL NOT NULL,
+    total INTEGER NOT NULL,
+    percentage REAL NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    difficulty TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_scores_username ON scores (username, seq);
+CREATE INDEX IF NOT EXISTS idx_scores_percentage ON scores (percentage DESC, seq);
+
+CREATE TABLE IF NOT EXISTS score_aggregates (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+"""
+
+# Columns added after the first release, applied to existing databases.
+MIGRATIONS = [
+    ("scores", "category", "ALTER TABLE scores ADD COLUMN category TEXT NOT NULL DEFAULT ''"),
+    ("scores", "difficulty", "ALTER TABLE scores ADD COLUMN difficulty TEXT NOT NULL DEFAULT ''"),
+    ("questions", "authored_difficulty", "ALTER TABLE questions ADD COLUMN authored_difficulty TEXT"),
+    ("questions", "p_value", "ALTER TABLE questions ADD COLUMN p_value REAL"),
+    ("questions", "discrimination", "ALTER TABLE questions ADD COLUMN discrimination REAL"),
+    ("questions", "avg_time", "ALTER TABLE questions ADD COLUMN avg_time REAL"),
+]
+
+_connections: Dict[Tuple[Path, int], Tuple[sqlite3.Connection, threading.RLock]] = {}
+_connections_lock = threading.Lock()
+# Writes to `questions` through each shared connection; PRAGMA data_version
+# only reports commits from other connections.
+_question_generations: Dict[sqlite3.Connection, int] = {}
+
+
+def get_connection(db_path: Path) -> Tuple[sqlite3.Connection, threading.RLock]:
+    """Return this process's shared connection (and its lock) for `db_path`."""
+    key = (Path(db_path).resolve(), os.getpid())
+    with _connections_lock:
+        cached = _connections.get(key)
+        if cached is None:
+            key[0].parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(key[0]), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            for table, column, statement in MIGRATIONS:
+                if column not in {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}:
+                    conn.execute(statement)
+            cached = (conn, threading.RLock())
+            _connections[key] = cached
+        return cached
+
+
+class SQLiteQuestionRepository(QuestionRepository):
+    """Questions stored in the `questions` table."""
+
+    def __init__(self, db_path: Path):
+        self.conn, self.lock = get_connection(db_path)
+        self._bank: Optional[QuestionBank] = None
+        self._version = None
+
+    def _data_version(self) -> Tuple[int, int]:
+        # data_version changes on commits from other connections; the generation on ours.
+        return (self.conn.execute("PRAGMA data_version").fetchone()[0], _question_generations.get(self.conn, 0))
+
+    def _questions_changed(self) -> None:
+        """Record a committed write to `questions` (call with the lock held)."""
+        _question_generations[self.conn] = _question_generations.get(self.conn, 0) + 1
+
+    def load_bank(self) -> QuestionBank:
+        with self.lock:
+            version = self._data_version()
+            if self._bank is None or version != self._version:
+                rows = self.conn.execute("SELECT * FROM questions ORDER BY rowid").fetchall()
+                self._bank = QuestionBank(
+                    Question(
+                        id=r["id"],
+                        text=r["text"],
+                        options=json.loads(r["options"]),
+                        answer=r["answer"],
+                        topic=r["topic"],
+                        difficulty=r["difficulty"],
+                        explanation=r["explanation"],
+                    )
+                    for r in rows
+                )
+                self._version = version
+            return self._bank
+
+    def import_questions(self, items: List[Dict[str, Any]]) -> int:
+        """Insert or replace questions given as dicts (questions.json format)."""
+        rows = []
+        for i, item in enumerate(items):
+            q = Question.from_dict({"id": str(i + 1), **item})
+            rows.append((q.id, q.text, json.dumps(list(q.options), ensure_ascii=False), q.answer,
+                         q.topic or "", normalize_topic(q.topic), q.difficulty or "", q.explanation or ""))
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO questions"
+                    " (id, text, options, answer, topic, topic_key, difficulty, explanation)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._questions_changed()
+        return len(rows)
+
+    def apply_item_stats(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        changed = 0
+        with self.lock:
+            with self.conn:
+                for qid, u in updates.items():
+                    row = self.conn.execute("SELECT difficulty FROM questions WHERE id = ?", (qid,)).fetchone()
+                    if row is None:
+                        continue
+                    changed += row["difficulty"] != u["difficulty"]
+                    self.conn.execute(
+                        "UPDATE questions SET authored_difficulty = COALESCE(authored_difficulty, difficulty),"
+                        " difficulty = ?, p_value = ?, discrimination = ?, avg_time = ? WHERE id = ?",
+                        (u["difficulty"], u["p_value"], u["discrimination"], u["avg_time"], qid),
+                    )
+            self._questions_changed()
+        return changed
+
+
+class SQLiteQuizRepository(QuizRepository):
+    """
+    Quizzes stored as JSON documents in the `quizzes` table.
+
+    Quizzes built from bank questions are stored compactly and resolved
+    against the `questions` table on load.
+    """
+
+    def __init__(self, db_path: Path, question_repository: Optional[SQLiteQuestionRepository] = None):
+        self.db_path = Path(db_path)
+        self.conn, self.lock = get_connection(db_path)
+        self.question_repository = question_repository or SQLiteQuestionRepository(db_path)
+
+    def save_quiz(self, quiz: Quiz, name: Optional[str] = None) -> str:
+        if name is None:
+            name = f"{quiz.title.replace(' ', '_')}.json"
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO quizzes (name, id, title, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                (name, quiz.id, quiz.title, json.dumps(quiz.to_dict(compact=quiz.is_compact()), ensure_ascii=False),
+                 quiz.created_at),
+            )
+        return f"{self.db_path}#{name}"
+
+    def load_quiz(self, name: str) -> Optional[Quiz]:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM quizzes WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row["data"])
+        return Quiz.from_dict(data, self.question_repository.load_bank() if "items" in data else None)
+
+    def list_quizzes(self) -> List[str]:
+        with self.lock:
+            return [r["name"] for r in self.conn.execute("SELECT name FROM quizzes ORDER BY name")]
+
+
+class SQLiteScoreRepository(ScoreRepository):
+    """Leaderboard scores stored in the `scores` table."""
+
+    _COLUMNS = "timestamp, username, quiz_title, score, total, percentage, category, difficulty"
+    PAGE_SIZE = 10_000  # rows fetched per query by iter_scores
+    IMPORT_CHUNK = 10_000  # entries inserted per executemany by import_scores
+
+    def __init__(self, db_path: Path):
+        self.conn, self.lock = get_connection(db_path)
+        self._aggregates: Optional[ScoreAggregates] = None
+        self._version = None
+        self._backfill_aggregates()
+
+    def _backfill_aggregates(self) -> None:
+        """Build score_aggregates from scores in databases created before it existed."""
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM score_aggregates LIMIT 1").fetchone() is not None:
+                return
+            with self.conn:
+                aggregates = ScoreAggregates()
+                for row in self.conn.execute(f"SELECT {self._COLUMNS} FROM scores ORDER BY seq"):
+                    aggregates.add(dict(row))
+                if aggregates.overall.count:
+                    self._write_buckets(aggregates, {("overall", "")} | {
+                        (d, k) for d, groups in aggregates.groups.items() for k in groups
+                    })
+
+    def _write_buckets(self, aggregates: ScoreAggregates, keys) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO score_aggregates (dimension, key, state) VALUES (?, ?, ?)",
+            [
+                (d, k, json.dumps((aggregates.overall if d == "overall" else aggregates.groups[d][k]).to_state()))
+                for d, k in keys
+            ],
+        )
+
+    def add_score(
+        self, username: str, quiz_title: str, score: float, total: int, category: str = "", difficulty: str = ""
+    ) -> None:
+        self.import_scores([{
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "username": username,
+            "quiz_title": quiz_title,
+            "score": score,
+            "total": total,
+            "percentage": (score / total * 100) if total > 0 else 0,
+            "category": category,
+            "difficulty": difficulty,
+        }])
+
+    def import_scores(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk-insert leaderboard entries (dicts in leaderboard format) and update the aggregates.
+
+        `entries` is consumed IMPORT_CHUNK entries at a time, all in one transaction.
+        """
+        with self.lock:
+            try:
+                return self._insert_scores(iter(entries))
+            except Exception:
+                self._aggregates = None  # may hold rows that were rolled back
+                raise
+
+    def _insert_scores(self, entries: Iterator[Dict[str, Any]]) -> int:
+        count = 0
+        with self.conn:
+            # Materialize aggregates in the same transaction: fold the new rows
+            # into the touched buckets only. The cache and its data_version are
+            # current as of this transaction, and our own commit leaves
+            # data_version unchanged, so they stay in step afterwards.
+            aggregates = self._load_aggregates()
+            touched = {("overall", "")}
+            while True:
+                chunk = list(islice(entries, self.IMPORT_CHUNK))
+                if not chunk:
+                    break
+                self.conn.executemany(
+                    f"INSERT INTO scores ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (e.get("timestamp", ""), e.get("username", ""), e.get("quiz_title", ""),
+                         e.get("score", 0), e.get("total", 0), e.get("percentage", 0),
+                         e.get("category", ""), e.get("difficulty", ""))
+                        for e in chunk
+                    ],
+                )
+                for e in chunk:
+                    touched.update(aggregates.add(e).items())
+                count += len(chunk)
+            if count:
+                self._write_buckets(aggregates, touched)
+        return count
+
+    def _data_version(self) -> int:
+        # Changes only when another connection commits
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _load_aggregates(self) -> ScoreAggregates:
+        """Aggregates as stored in the database, re-read only after other writers commit."""
+        version = self._data_version()
+        if self._aggregates is None or version != self._version:
+            aggregates = ScoreAggregates()
+            for row in self.conn.execute("SELECT dimension, key, state FROM score_aggregates"):
+                bucket = AggregateBucket.from_state(json.loads(row["state"]))
+                if row["dimension"] == "overall":
+                    aggregates.overall = bucket
+                else:
+                    aggregates.groups.setdefault(row["dimension"], {})[row["key"]] = bucket
+            self._aggregates = aggregates
+            self._version = version
+        return self._aggregates
+
+    def get_aggregates(self) -> ScoreAggregates:
+        with self.lock:
+            return self._load_aggregates().copy()
+
+    def get_leaderboard(self, limit: int = 10) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM scores ORDER BY percentage DESC, seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_user_history(self, username: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM scores WHERE username = ? ORDER BY seq LIMIT ? OFFSET ?",
+                (username, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_user_stats(self, username: str) -> Dict[str, Any]:
+        with self.lock:
+            count, total_pct, best_pct = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(percentage), 0), COALESCE(MAX(percentage), 0)"
+                " FROM scores WHERE username = ?",
+                (username,),
+            ).fetchone()
+            best = self.conn.execute(
+                "SELECT score FROM scores WHERE username = ? ORDER BY percentage DESC, seq LIMIT 1",
+                (username,),
+            ).fetchone()
+        return {
+            "count": count,
+            "total_percentage": total_pct,
+            "mean_percentage": total_pct / count if count else 0.0,
+            "best_percentage": best_pct,
+            "best_score": best["score"] if best else 0,
+        }
+
+    def iter_scores(self, cursor: Optional[List] = None) -> Iterator[Tuple[List, Dict]]:
+        """Stream scores by insertion order a page at a time; cursors are ["sqlite", seq]."""
+        if cursor is None:
+            seq = 0
+        elif len(cursor) == 2 and cursor[0] == "sqlite":
+            seq = cursor[1]
+        else:
+            raise ValueError("Score cursor is not from this SQLite database")
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT seq, {self._COLUMNS} FROM scores WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (seq, self.PAGE_SIZE),
+                ).fetchall()
+            for row in rows:
+                seq = row["seq"]
+                entry = dict(row)
+                del entry["seq"]
+                yield ["sqlite", seq], entry
+            if len(rows) < self.PAGE_SIZE:
+                return
+
+
+def open_sqlite_storage(
+    db_path: Path = DATABASE_FILE,
+    questions_file: Path = QUESTIONS_FILE,
+    leaderboard_file: Path = LEADERBOARD_FILE,
+) -> Storage:
+    """
+    Build the SQLite-backed repositories.
+
+    On first use the empty tables are seeded from the JSON question bank and
+    leaderboard, so switching backends keeps existing data. The JSON
+    leaderboard is only read, never created or migrated.
+    """
+    questions = SQLiteQuestionRepository(db_path)
+    scores = SQLiteScoreRepository(db_path)
+    with questions.lock:
+        conn = questions.conn
+        if conn.execute("SELECT 1 FROM questions LIMIT 1").fetchone() is None:
+            data = load_json(Path(questions_file))
+            if isinstance(data, list):
+                questions.import_questions(data)
+        if conn.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None:
+            from src.utils.score_store import read_entries
+
+            scores.import_scores(read_entries(Path(leaderboard_file)))
+    return Storage(questions=questions, quizzes=SQLiteQuizRepository(db_path, questions), scores=scores)
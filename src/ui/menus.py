@@ -1,25 +1,45 @@
 """Main menu and navigation."""
 
+from functools import cached_property
+
 from src.ui.cli_ui import CLIUI
-from src.creators.quiz_creator import QuizCreator
-from src.runners.quiz_runner import QuizRunner
-from src.runners.adaptive_engine import AdaptiveEngine
-from src.utils.leaderboard_handler import LeaderboardHandler
-from src.utils.pdf_exporter import PDFExporter
-from src.utils.file_handler import load_json
-from src.config import LEADERBOARD_FILE, PDF_DIR
-from pathlib import Path
+from src.config import PDF_DIR
 
 
 class Menu:
-    """Main application menu."""
+    """
+    Main application menu.
+
+    Storage, the quiz creator and the PDF exporter are built (and their
+    modules imported) on first use, so the menu starts without loading the
+    question bank or the score store.
+    """
 
     def __init__(self):
-        self.creator = QuizCreator()
-        self.leaderboard = LeaderboardHandler(LEADERBOARD_FILE)
-        self.pdf_exporter = PDFExporter(PDF_DIR)
         self.username = None
 
+    @cached_property
+    def storage(self):
+        from src.storage.repository import open_storage
+        return open_storage()
+
+    @cached_property
+    def creator(self):
+        from src.creators.quiz_creator import QuizCreator
+        return QuizCreator(
+            question_repository=self.storage.questions,
+            quiz_repository=self.storage.quizzes,
+        )
+
+    @property
+    def leaderboard(self):
+        return self.storage.scores
+
+    @cached_property
+    def pdf_exporter(self):
+        from src.utils.pdf_exporter import PDFExporter
+        return PDFExporter(PDF_DIR)
+
     def start(self):
         """Start the application."""
         CLIUI.clear_screen()
@@ -41,6 +61,7 @@ class Menu:
                     [
                         "Generate Quiz by Topic",
                         "Generate Quiz by Difficulty",
+                        "Adaptive Quiz",
                         "View Leaderboard",
                         "View My History",
                         "Settings",
@@ -53,12 +74,14 @@ class Menu:
                 elif choice == 2:
                     self._generate_by_difficulty()
                 elif choice == 3:
-                    self._view_leaderboard()
+                    self._adaptive_quiz()
                 elif choice == 4:
-                    self._view_my_history()
+                    self._view_leaderboard()
                 elif choice == 5:
-                    self._settings()
+                    self._view_my_history()
                 elif choice == 6:
+                    self._settings()
+                elif choice == 7:
                     print("Goodbye!")
                     break
             except KeyboardInterrupt:
@@ -110,9 +133,27 @@ class Menu:
         except Exception as e:
             CLIUI.print_error(str(e))
 
-    def _run_quiz(self, quiz):
+    def _adaptive_quiz(self):
+        """Run an adaptive quiz whose questions follow the user's ability."""
+        topics = ["Any"] + self.creator.get_available_categories()
+        topic = CLIUI.get_choice("Select a topic", topics)
+        count = CLIUI.get_number_input("How many questions", 1, 20)
+        title = CLIUI.get_input("Quiz title", "Adaptive Quiz")
+
+        try:
+            quiz, engine = self.creator.create_adaptive_quiz(title, count, None if topic == "Any" else topic)
+        except ValueError as e:
+            CLIUI.print_error(str(e))
+            return
+        self._run_quiz(quiz, engine)
+
+    def _run_quiz(self, quiz, engine=None):
         """Run a quiz."""
-        runner = QuizRunner(quiz)
+        from src.runners.quiz_runner import QuizRunner
+        from src.utils.item_stats import record_answers
+        from src.utils.results_sink import get_sink
+
+        runner = QuizRunner(quiz, engine)
         try:
             analytics = runner.run()
             
@@ -122,13 +163,18 @@ class Menu:
                 quiz.title,
                 analytics.correct_count(),
                 analytics.total_questions(),
+                category=quiz.category,
+                difficulty=quiz.difficulty,
             )
+            record_answers(runner.results, self.username, quiz.title)
+            get_sink().write_attempt(runner.results, self.username, quiz.title)
             CLIUI.print_success("Score saved to leaderboard!")
 
             # Export option
             if input("Export as PDF? (y/n): ").lower() == "y":
-                pdf_path = self.pdf_exporter.export_results_as_pdf(quiz.title, runner.results)
-                CLIUI.print_success(f"Exported to {pdf_path}")
+                # Rendered on the export pool so the menu stays responsive
+                self.pdf_exporter.submit_results_export(quiz.title, runner.results)
+                CLIUI.print_success(f"Exporting to {self.pdf_exporter.results_path(quiz.title)}")
 
         except KeyboardInterrupt:
             print("\nQuiz cancelled.")
@@ -1,7 +1,21 @@
 """Analytics for quiz performance."""
 
-from typing import List, Dict, Any
-from datetime import datetime
+import math
+from array import array
+from functools import cached_property, lru_cache
+from typing import List, Dict, Any, Iterable
+
+from .metrics import timed
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """NumPy, imported on first use (it is slow to import); None when not installed."""
+    try:
+        import numpy
+    except ImportError:  # optional; columnar analytics falls back to pure Python
+        return None
+    return numpy
 
 
 class QuizAnalytics:
@@ -13,7 +27,9 @@ class QuizAnalytics:
     def total_questions(self) -> int:
         return len(self.results)
 
+    @timed("analytics.correct_count")
     def correct_count(self) -> int:
+        # Recounted on every call: results may be edited in place between calls.
         return sum(1 for r in self.results if r.get("is_correct", False))
 
     def incorrect_count(self) -> int:
@@ -24,6 +40,7 @@ class QuizAnalytics:
             return 0.0
         return (self.correct_count() / self.total_questions()) * 100
 
+    @timed("analytics.average_time")
     def average_time_per_question(self) -> float:
         """Average seconds per question (if time_taken is in results)."""
         times = [r.get("time_taken", 0) for r in self.results if "time_taken" in r]
@@ -31,6 +48,7 @@ class QuizAnalytics:
             return 0.0
         return sum(times) / len(times)
 
+    @timed("analytics.difficulty_breakdown")
     def difficulty_breakdown(self) -> Dict[str, Dict[str, int]]:
         """Group results by difficulty."""
         breakdown = {}
@@ -43,11 +61,146 @@ class QuizAnalytics:
                 breakdown[difficulty]["correct"] += 1
         return breakdown
 
+    def columnar(self) -> "ColumnarAnalytics":
+        """Columnar view of these results, for large result sets."""
+        return ColumnarAnalytics(self.results)
+
+    @timed("analytics.summary")
+    def summary(self) -> str:
+        """Return formatted summary."""
+        return _format_summary(self)
+
+
+def _format_summary(a) -> str:
+    correct, total = a.correct_count(), a.total_questions()  # count once per summary
+    pct = correct / total * 100 if total else 0.0
+    return (
+        f"Score: {correct}/{total} ({pct:.1f}%)\n"
+        f"Correct: {correct}, Incorrect: {total - correct}\n"
+        f"Avg time/question: {a.average_time_per_question():.1f}s"
+    )
+
+
+class _Categories:
+    """Dictionary-encodes a string column into small integer codes."""
+
+    def __init__(self):
+        self.labels: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self.codes = array("I")
+
+    def add(self, value: Any) -> None:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.labels)
+            self.labels.append(value)
+        self.codes.append(code)
+
+
+class ColumnarAnalytics:
+    """
+    Same metrics as QuizAnalytics, computed over columns built in one pass.
+
+    Results are converted once into is_correct / difficulty / topic /
+    time_taken columns (NumPy arrays when NumPy is installed). Every metric is
+    then a single vectorized pass whose result is cached, so this scales to
+    hundreds of thousands of historical results. `results` may be any
+    iterable, including a generator streaming rows from disk.
+    """
+
+    def __init__(self, results: Iterable[Dict[str, Any]]):
+        correct = bytearray()
+        times = array("d")
+        difficulty = _Categories()
+        topic = _Categories()
+        nan = math.nan
+        for r in results:
+            correct.append(1 if r.get("is_correct", False) else 0)
+            difficulty.add(r.get("difficulty", "unknown"))
+            topic.add(r.get("topic") or "Unknown")
+            t = r.get("time_taken", nan) if "time_taken" in r else nan
+            times.append(nan if t is None else t)
+
+        self.difficulty_labels = difficulty.labels
+        self.topic_labels = topic.labels
+        self._np = np = _numpy()
+        if np is not None:
+            self.is_correct = np.frombuffer(bytes(correct), dtype=np.uint8).astype(bool)
+            self.difficulty = np.frombuffer(difficulty.codes, dtype=np.uint32)
+            self.topic = np.frombuffer(topic.codes, dtype=np.uint32)
+            self.time_taken = np.frombuffer(times, dtype=np.float64)
+        else:
+            self.is_correct = correct
+            self.difficulty = difficulty.codes
+            self.topic = topic.codes
+            self.time_taken = times
+
+    def total_questions(self) -> int:
+        return len(self.is_correct)
+
+    @cached_property
+    def _correct(self) -> int:
+        np = self._np
+        if np is not None:
+            return int(np.count_nonzero(self.is_correct))
+        return sum(self.is_correct)
+
+    def correct_count(self) -> int:
+        return self._correct
+
+    def incorrect_count(self) -> int:
+        return self.total_questions() - self._correct
+
+    def percentage_score(self) -> float:
+        if self.total_questions() == 0:
+            return 0.0
+        return (self._correct / self.total_questions()) * 100
+
+    @cached_property
+    def _average_time(self) -> float:
+        np = self._np
+        if np is not None:
+            present = ~np.isnan(self.time_taken)
+            return float(self.time_taken[present].mean()) if present.any() else 0.0
+        times = [t for t in self.time_taken if t == t]  # drop NaN
+        return sum(times) / len(times) if times else 0.0
+
+    def average_time_per_question(self) -> float:
+        """Average seconds per question (over results that recorded time_taken)."""
+        return self._average_time
+
+    def _breakdown(self, codes, labels: List[Any]) -> Dict[Any, Dict[str, int]]:
+        np = self._np
+        if np is not None:
+            totals = np.bincount(codes, minlength=len(labels))
+            correct = np.bincount(codes, weights=self.is_correct, minlength=len(labels))
+            return {
+                label: {"correct": int(correct[i]), "total": int(totals[i])}
+                for i, label in enumerate(labels)
+            }
+        totals = [0] * len(labels)
+        correct = [0] * len(labels)
+        for code, ok in zip(codes, self.is_correct):
+            totals[code] += 1
+            correct[code] += ok
+        return {label: {"correct": correct[i], "total": totals[i]} for i, label in enumerate(labels)}
+
+    @cached_property
+    def _difficulty_breakdown(self) -> Dict[str, Dict[str, int]]:
+        return self._breakdown(self.difficulty, self.difficulty_labels)
+
+    @cached_property
+    def _topic_breakdown(self) -> Dict[str, Dict[str, int]]:
+        return self._breakdown(self.topic, self.topic_labels)
+
+    def difficulty_breakdown(self) -> Dict[str, Dict[str, int]]:
+        """Group results by difficulty."""
+        return {k: dict(v) for k, v in self._difficulty_breakdown.items()}
+
+    def topic_breakdown(self) -> Dict[str, Dict[str, int]]:
+        """Group results by topic ('Unknown' when missing)."""
+        return {k: dict(v) for k, v in self._topic_breakdown.items()}
+
     def summary(self) -> str:
         """Return formatted summary."""
-        pct = self.percentage_score()
-        return (
-            f"Score: {self.correct_count()}/{self.total_questions()} ({pct:.1f}%)\n"
-            f"Correct: {self.correct_count()}, Incorrect: {self.incorrect_count()}\n"
-            f"Avg time/question: {self.average_time_per_question():.1f}s"
-        )
+        return _format_summary(self)
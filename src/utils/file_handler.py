@@ -1,23 +1,33 @@
 """File I/O utilities for JSON data."""
 
 import json
+import os
 from pathlib import Path
 from typing import Any, List, Dict
 
+from .metrics import add_bytes, enabled, timed
 
+
+@timed("file.load_json")
 def load_json(path: Path) -> Any:
     """Load JSON from file."""
     if not path.exists():
         return {}
     with path.open(encoding="utf-8") as f:
-        return json.load(f)
+        data = json.load(f)
+        if enabled():
+            add_bytes("file.load_json", "read", os.fstat(f.fileno()).st_size)
+    return data
 
 
+@timed("file.save_json")
 def save_json(path: Path, data: Any, indent: int = 2) -> None:
     """Save data to JSON file."""
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
         json.dump(data, f, indent=indent, ensure_ascii=False)
+        if enabled():
+            add_bytes("file.save_json", "write", f.tell())
 
 
 def load_lines(path: Path) -> List[str]:
@@ -0,0 +1,289 @@
+"""Item analysis: per-question statistics from recorded answers.
+
+Answers are appended to a JSON Lines log (one record per answered question,
+grouped by attempt). `ItemStatistics` folds that log into per-question
+accumulators in a single streaming pass and can resume from where it
+stopped, so it never holds more than one attempt in memory. From the
+accumulators it derives:
+
+- p-value: proportion of responses that were correct,
+- discrimination: point-biserial correlation between answering the item
+  correctly and the rest of the attempt's score (corrected item-total),
+- average time taken.
+
+`apply_calibration` writes an empirical difficulty back into the question
+bank, through the configured storage backend, for items with enough responses.
+"""
+
+import argparse
+import json
+import math
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.config import ANSWERS_FILE, ITEM_MIN_RESPONSES, ITEM_STATS_FILE
+from src.storage.repository import QuestionRepository, open_storage
+from .file_handler import load_json, save_json
+
+
+def record_answers(
+    results: List[Dict[str, Any]],
+    username: str = "",
+    quiz_title: str = "",
+    path: Path = ANSWERS_FILE,
+) -> str:
+    """Append one attempt's answers to the answer log; returns the attempt id."""
+    attempt_id = uuid.uuid4().hex
+    answered = [r for r in results if r.get("question_id")]
+    lines = [
+        json.dumps({
+            "attempt_id": attempt_id,
+            "attempt_size": len(answered),
+            "username": username,
+            "quiz_title": quiz_title,
+            "question_id": r["question_id"],
+            "is_correct": bool(r.get("is_correct")),
+            "time_taken": r.get("time_taken"),
+        }, ensure_ascii=False) + "\n"
+        for r in answered
+    ]
+    if lines:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A single write per attempt keeps its records contiguous in the log.
+        with path.open("a", encoding="utf-8") as f:
+            f.write("".join(lines))
+    return attempt_id
+
+
+def iter_answer_records(path: Path, start: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (end_offset, record) for each complete line of the answer log."""
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # a write still in progress
+            offset += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield offset, record
+
+
+def calibrated_difficulty(p_value: float) -> str:
+    """Map a proportion-correct to a difficulty label."""
+    if p_value >= 0.75:
+        return "easy"
+    if p_value >= 0.45:
+        return "medium"
+    return "hard"
+
+
+class ItemAccumulator:
+    """Sufficient statistics for one question."""
+
+    __slots__ = ("n", "correct", "time_n", "time_sum", "pairs", "sx", "sy", "syy", "sxy")
+
+    def __init__(self):
+        self.n = 0
+        self.correct = 0
+        self.time_n = 0
+        self.time_sum = 0.0
+        # Point-biserial inputs (x = item correct, y = rest score) over responses
+        # from attempts with at least one other question
+        self.pairs = 0
+        self.sx = 0
+        self.sy = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+
+    def add(self, correct: bool, time_taken, rest_score) -> None:
+        self.n += 1
+        self.correct += correct
+        if time_taken is not None:
+            self.time_n += 1
+            self.time_sum += time_taken
+        if rest_score is not None:
+            self.pairs += 1
+            self.sx += correct
+            self.sy += rest_score
+            self.syy += rest_score * rest_score
+            self.sxy += rest_score if correct else 0.0
+
+    def p_value(self) -> float:
+        return self.correct / self.n if self.n else 0.0
+
+    def avg_time(self) -> float:
+        return self.time_sum / self.time_n if self.time_n else 0.0
+
+    def discrimination(self) -> float:
+        n = self.pairs
+        var_x = n * self.sx - self.sx * self.sx  # x is 0/1, so sum(x^2) == sum(x)
+        var_y = n * self.syy - self.sy * self.sy
+        if var_x <= 0 or var_y <= 1e-12:
+            return 0.0
+        return (n * self.sxy - self.sx * self.sy) / math.sqrt(var_x * var_y)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": self.n,
+            "p_value": self.p_value(),
+            "discrimination": self.discrimination(),
+            "avg_time": self.avg_time(),
+        }
+
+    def to_state(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+    @staticmethod
+    def from_state(state: list) -> "ItemAccumulator":
+        acc = ItemAccumulator()
+        for name, value in zip(ItemAccumulator.__slots__, state):
+            setattr(acc, name, value)
+        return acc
+
+
+class ItemStatistics:
+    """Per-question statistics, updated batch-wise or incrementally."""
+
+    def __init__(self):
+        self.items: Dict[str, ItemAccumulator] = {}
+        self.offset = 0  # bytes of the answer log already consumed
+
+    def add_attempt(self, records: List[Dict[str, Any]]) -> None:
+        """Fold in every answer from one attempt."""
+        total = sum(1 for r in records if r.get("is_correct"))
+        others = len(records) - 1
+        for r in records:
+            correct = bool(r.get("is_correct"))
+            rest = (total - correct) / others if others > 0 else None
+            acc = self.items.get(r["question_id"])
+            if acc is None:
+                acc = self.items[r["question_id"]] = ItemAccumulator()
+            acc.add(correct, r.get("time_taken"), rest)
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Consume a stream of records grouped by attempt; returns attempts added."""
+        attempts = 0
+        current, buffer = None, []
+        for r in records:
+            if r.get("attempt_id") != current and buffer:
+                self.add_attempt(buffer)
+                attempts += 1
+                buffer = []
+            current = r.get("attempt_id")
+            buffer.append(r)
+        if buffer:
+            self.add_attempt(buffer)
+            attempts += 1
+        return attempts
+
+    def update_from_log(self, path: Path = ANSWERS_FILE) -> int:
+        """
+        Consume answer-log records appended since the last update.
+
+        The offset only moves past complete attempts: an attempt whose
+        records are not all in the log yet (per `attempt_size`) is left for
+        the next update. Records without a size (older logs) end when the
+        next attempt starts or at the end of the log.
+        """
+        attempts = 0
+        buffer: List[Dict[str, Any]] = []
+        end = self.offset
+        for offset, record in iter_answer_records(path, self.offset):
+            if buffer and record.get("attempt_id") != buffer[0].get("attempt_id"):
+                self.add_attempt(buffer)
+                attempts += 1
+                self.offset, buffer = end, []
+            buffer.append(record)
+            end = offset
+            if len(buffer) == record.get("attempt_size"):
+                self.add_attempt(buffer)
+                attempts += 1
+                self.offset, buffer = end, []
+        if buffer and not buffer[-1].get("attempt_size"):
+            self.add_attempt(buffer)
+            attempts += 1
+            self.offset = end
+        return attempts
+
+    def stats(self, question_id: str) -> Dict[str, Any]:
+        acc = self.items.get(question_id)
+        return (acc or ItemAccumulator()).to_dict()
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"offset": self.offset, "items": {k: v.to_state() for k, v in self.items.items()}}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "ItemStatistics":
+        stats = ItemStatistics()
+        stats.offset = state.get("offset", 0)
+        stats.items = {k: ItemAccumulator.from_state(v) for k, v in state.get("items", {}).items()}
+        return stats
+
+    def save(self, path: Path = ITEM_STATS_FILE) -> None:
+        save_json(path, self.to_state(), indent=None)
+
+    @staticmethod
+    def load(path: Path = ITEM_STATS_FILE) -> "ItemStatistics":
+        data = load_json(path)
+        return ItemStatistics.from_state(data) if data else ItemStatistics()
+
+
+def apply_calibration(
+    stats: ItemStatistics,
+    repository: Optional[QuestionRepository] = None,
+    min_responses: int = ITEM_MIN_RESPONSES,
+) -> int:
+    """
+    Write empirical statistics and calibrated difficulty into the question bank.
+
+    `repository` defaults to the configured storage backend's questions.
+    Items with fewer than `min_responses` answers keep their authored
+    difficulty. The authored value is preserved as `authored_difficulty`.
+    Returns the number of questions whose difficulty changed.
+    """
+    updates = {
+        qid: {
+            "difficulty": calibrated_difficulty(acc.p_value()),
+            "p_value": round(acc.p_value(), 4),
+            "discrimination": round(acc.discrimination(), 4),
+            "avg_time": round(acc.avg_time(), 2),
+        }
+        for qid, acc in stats.items.items()
+        if acc.n >= min_responses
+    }
+    if repository is None:
+        repository = open_storage().questions
+    return repository.apply_item_stats(updates)
+
+
+def main(argv=None) -> None:
+    """Update item statistics from the answer log and optionally calibrate."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rebuild", action="store_true", help="recompute from the start of the log")
+    parser.add_argument("--apply", action="store_true", help="write calibrated difficulty into the question bank")
+    parser.add_argument("--min-responses", type=int, default=ITEM_MIN_RESPONSES)
+    args = parser.parse_args(argv)
+
+    stats = ItemStatistics() if args.rebuild else ItemStatistics.load()
+    attempts = stats.update_from_log()
+    stats.save()
+    print(f"Processed {attempts} new attempts; {len(stats.items)} questions have statistics.")
+    print(f"{'Question':<10} {'N':>6} {'p':>6} {'disc':>6} {'time':>7}")
+    for qid, acc in sorted(stats.items.items(), key=lambda kv: kv[1].p_value()):
+        print(f"{qid:<10} {acc.n:>6} {acc.p_value():>6.2f} {acc.discrimination():>6.2f} {acc.avg_time():>6.1f}s")
+    if args.apply:
+        changed = apply_calibration(stats, min_responses=args.min_responses)
+        print(f"Calibrated difficulty for {changed} questions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,28 @@
 """Leaderboard management."""
 
+import heapq
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
-from .file_handler import load_json, append_to_json_list, save_json
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from src.storage.repository import ScoreRepository
+from .score_store import HEADER_SIZE, open_store
+from .leaderboard_index import open_index
+from .metrics import timed
+from .score_aggregates import ScoreAggregates
 
 
-class LeaderboardHandler:
+class LeaderboardHandler(ScoreRepository):
     """Manage user scores and leaderboard."""
 
     def __init__(self, leaderboard_file: Path):
         self.leaderboard_file = leaderboard_file
+        self.store = open_store(leaderboard_file)
+        self.index = open_index(self.store)
 
-    def add_score(self, username: str, quiz_title: str, score: float, total: int) -> None:
+    @timed("leaderboard.add_score")
+    def add_score(
+        self, username: str, quiz_title: str, score: float, total: int, category: str = "", difficulty: str = ""
+    ) -> None:
         """Add a score entry to leaderboard."""
         from datetime import datetime, timezone
         entry = {
@@ -22,40 +32,62 @@ class LeaderboardHandler:
             "score": score,
             "total": total,
             "percentage": (score / total * 100) if total > 0 else 0,
+            "category": category,
+            "difficulty": difficulty,
         }
-        append_to_json_list(self.leaderboard_file, entry)
+        self.store.append(entry)
+        self.index.refresh()
 
+    @timed("leaderboard.get_leaderboard")
     def get_leaderboard(self, limit: int = 10) -> List[Dict]:
         """Get top scores."""
-        data = load_json(self.leaderboard_file)
-        if not isinstance(data, list):
-            return []
+        if limit <= self.index.top_k:
+            self.index.refresh()
+            return self.index.top(limit)
         # Sort by percentage descending
-        sorted_data = sorted(data, key=lambda x: x.get("percentage", 0), reverse=True)
-        return sorted_data[:limit]
-
-    def get_user_history(self, username: str) -> List[Dict]:
-        """Get all scores for a user."""
-        data = load_json(self.leaderboard_file)
-        if not isinstance(data, list):
-            return []
-        return [d for d in data if d.get("username") == username]
-
-    def display_leaderboard(self, limit: int = 10) -> str:
-        """Format leaderboard for display."""
-        scores = self.get_leaderboard(limit)
-        if not scores:
-            return "Leaderboard is empty."
-        
-        output = "=== TOP SCORES ===\n"
-        output += f"{'Rank':<5} {'User':<15} {'Quiz':<20} {'Score':<10} {'%':<6}\n"
-        output += "-" * 60 + "\n"
-        
-        for idx, entry in enumerate(scores, 1):
-            user = entry.get("username", "Unknown")[:15]
-            quiz = entry.get("quiz_title", "Unknown")[:20]
-            score = entry.get("score", 0)
-            pct = entry.get("percentage", 0)
-            output += f"{idx:<5} {user:<15} {quiz:<20} {score:<10} {pct:.1f}%\n"
-        
-        return output
+        return heapq.nlargest(limit, self.store.iter_entries(), key=lambda x: x.get("percentage", 0))
+
+    @timed("leaderboard.get_user_history")
+    def get_user_history(self, username: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Get a user's scores, oldest first; `offset`/`limit` page through them."""
+        return list(self.iter_user_history(username, offset, limit))
+
+    def iter_user_history(self, username: str, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Lazily read a user's scores from the store via the per-user index."""
+        self.index.refresh()
+        positions = self.index.user_positions(username, offset, limit)
+        if not positions:
+            return
+        with self.store.view() as view:
+            for position in positions:
+                entry = view.read_at(position)
+                if entry is not None:
+                    yield entry
+
+    @timed("leaderboard.get_user_stats")
+    def get_user_stats(self, username: str) -> Dict[str, Any]:
+        """Get precomputed aggregates (count, mean/best percentage, best score) for a user."""
+        self.index.refresh()
+        stats = self.index.user_stats(username)
+        if stats is None:
+            return {"count": 0, "total_percentage": 0.0, "mean_percentage": 0.0, "best_percentage": 0.0, "best_score": 0}
+        return stats
+
+    @timed("leaderboard.get_aggregates")
+    def get_aggregates(self) -> ScoreAggregates:
+        """A snapshot of the materialized aggregates kept up to date by the leaderboard index."""
+        self.index.refresh()
+        return self.index.aggregates_snapshot()
+
+    def iter_scores(self, cursor: Optional[List] = None) -> Iterator[Tuple[List, Dict]]:
+        """Stream entries from the store; cursors are [store id, entry position]."""
+        with self.store.view() as view:
+            if cursor is None:
+                after = HEADER_SIZE - 1
+            elif len(cursor) == 2 and cursor[0] == view.store_id:
+                after = cursor[1]
+            else:
+                raise ValueError("Score cursor is not from this leaderboard store")
+            for position, entry in view.iter_from(max(after, HEADER_SIZE)):
+                if position > after:
+                    yield [view.store_id, position], entry
@@ -0,0 +1,280 @@
+"""Incrementally maintained indexes over the score store."""
+
+import atexit
+import heapq
+from array import array
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .score_store import HEADER_SIZE, ScoreStore
+from .score_aggregates import ScoreAggregates
+
+INDEX_VERSION = 5
+POSITION_BYTES = array("q").itemsize
+
+
+class UserStats:
+    """Running aggregates for one user."""
+
+    __slots__ = ("count", "total_percentage", "best_percentage", "best_score")
+
+    def __init__(self):
+        self.count = 0
+        self.total_percentage = 0.0
+        self.best_percentage = 0.0
+        self.best_score = 0
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        pct = entry.get("percentage", 0)
+        if self.count == 0 or pct > self.best_percentage:
+            self.best_percentage = pct
+            self.best_score = entry.get("score", 0)
+        self.count += 1
+        self.total_percentage += pct
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_percentage": self.total_percentage,
+            "mean_percentage": self.total_percentage / self.count if self.count else 0.0,
+            "best_percentage": self.best_percentage,
+            "best_score": self.best_score,
+        }
+
+    def to_state(self) -> list:
+        return [self.count, self.total_percentage, self.best_percentage, self.best_score]
+
+    @staticmethod
+    def from_state(state: list) -> "UserStats":
+        stats = UserStats()
+        stats.count, stats.total_percentage, stats.best_percentage, stats.best_score = state
+        return stats
+
+
+class LeaderboardIndex:
+    """
+    Top-K scores kept in a bounded min-heap, a per-user secondary index
+    (entry positions and running aggregates keyed by username), and the
+    materialized dashboard aggregates (see ScoreAggregates).
+
+    The index remembers the store position it has consumed up to, so catching
+    up with scores written by other sessions or processes only reads the new
+    entries. The aggregates and that checkpoint are persisted next to the
+    score log so a cold start resumes from there instead of scanning the
+    whole history. Entry positions go to a binary sidecar log of
+    (user code, position) pairs that each save only appends to; it is read
+    the first time a user's history is paged through, without holding the
+    index lock, so adding scores is never blocked on it.
+    """
+
+    def __init__(self, store: ScoreStore, top_k: int = 100, save_every: int = 1000):
+        self.store = store
+        self.top_k = top_k
+        self.save_every = save_every
+        self.path = store.legacy_path.with_name(store.legacy_path.stem + ".index.json")
+        self.positions_path = store.legacy_path.with_name(store.legacy_path.stem + ".positions")
+        self._lock = threading.RLock()
+        self._positions_lock = threading.Lock()  # serializes reading the sidecar
+        self._reset()
+        self._load()
+        atexit.register(self.save)
+
+    def _reset(self) -> None:
+        self.store_id = ""
+        self.position = HEADER_SIZE
+        self.count = 0
+        self._top: List[tuple] = []  # (percentage, -seq, entry); smallest is evicted first
+        self._sorted = None
+        self._unsaved = 0
+        self.users: Dict[str, UserStats] = {}
+        self._user_names: List[str] = []  # user code -> name, in order of first score
+        self._codes: Dict[str, int] = {}
+        self._positions: Optional[Dict[str, array]] = {}  # None until read from the sidecar after a load
+        self._positions_saved = 0  # (code, position) pairs in the sidecar for this index; -1 if it was lost
+        self._new_positions = array("q")  # pairs ingested since the last save
+        self.aggregates = ScoreAggregates()
+
+    # -- persistence -----------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("top_k") != self.top_k:
+            return
+        with self.store.view() as view:
+            if data.get("store_id") != view.store_id or data.get("position", 0) > view.end:
+                return  # the store was recreated underneath us; rebuild
+        self.store_id = data["store_id"]
+        self.position = data["position"]
+        self.count = data["count"]
+        self._top = [(pct, -seq, entry) for pct, seq, entry in data["top"]]
+        heapq.heapify(self._top)
+        self.users = {name: UserStats.from_state(state) for name, state in data["users"].items()}
+        self._user_names = list(self.users)
+        self._codes = {name: code for code, name in enumerate(self._user_names)}
+        self._positions = None
+        self._positions_saved = data["positions"]
+        self.aggregates = ScoreAggregates.from_state(data["aggregates"])
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "top_k": self.top_k,
+            "store_id": self.store_id,
+            "position": self.position,
+            "count": self.count,
+            "top": [[pct, -neg_seq, entry] for pct, neg_seq, entry in self._top],
+            "users": {name: stats.to_state() for name, stats in self.users.items()},
+            "positions": self._positions_saved,
+            "aggregates": self.aggregates.to_state(),
+        }
+
+    def save(self) -> None:
+        """Append new positions to the sidecar, then persist the index atomically."""
+        with self._lock:
+            if self._positions_saved >= 0:
+                expected = self._positions_saved * 2 * POSITION_BYTES
+                with self.positions_path.open("ab") as f:
+                    if f.seek(0, os.SEEK_END) < expected:
+                        self._positions_saved = -1  # deleted underneath us; rebuilt on next use
+                    else:
+                        # Drop pairs from a save that died before its index was written
+                        f.truncate(expected)
+                        self._new_positions.tofile(f)
+                        self._positions_saved += len(self._new_positions) // 2
+            self._new_positions = array("q")
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(self._state(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._unsaved = 0
+
+    # -- maintenance -----------------------------------------------------------
+
+    def _ingest(self, position: int, entry: Dict[str, Any]) -> None:
+        username = entry.get("username")
+        stats = self.users.get(username)
+        if stats is None:
+            stats = self.users[username] = UserStats()
+            self._codes[username] = len(self._user_names)
+            self._user_names.append(username)
+        stats.add(entry)
+        self._new_positions.extend((self._codes[username], position))
+        if self._positions is not None:
+            self._positions.setdefault(username, array("q")).append(position)
+        self.aggregates.add(entry)
+
+        self.count += 1
+        item = (entry.get("percentage", 0), -self.count, entry)
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, item)
+            self._sorted = None
+        elif item[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, item)
+            self._sorted = None
+
+    def refresh(self) -> None:
+        """Consume entries appended since the last refresh."""
+        with self._lock, self.store.view() as view:
+            if view.store_id != self.store_id:
+                self._reset()
+                self.store_id = view.store_id
+            if view.end == self.position:
+                return
+            for position, entry in view.iter_from(self.position):
+                self._ingest(position, entry)
+                self._unsaved += 1
+            self.position = view.end
+            if self._unsaved >= self.save_every:
+                self.save()
+
+    # -- queries ---------------------------------------------------------------
+
+    def top(self, limit: int) -> List[Dict]:
+        """Return up to `limit` best entries (limit must not exceed top_k)."""
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = [entry for _, _, entry in sorted(self._top, key=lambda x: x[:2], reverse=True)]
+            return self._sorted[:limit]
+
+    def user_stats(self, username: str) -> Optional[Dict[str, Any]]:
+        """Aggregates for `username` (see UserStats.to_dict), or None if they have no scores."""
+        with self._lock:
+            stats = self.users.get(username)
+            return stats.to_dict() if stats is not None else None
+
+    def aggregates_snapshot(self) -> ScoreAggregates:
+        """A copy of the materialized aggregates, safe to read while scores are added."""
+        with self._lock:
+            return self.aggregates.copy()
+
+    def _read_positions(self, start: int, stop: int) -> array:
+        pairs = array("q")
+        with self.positions_path.open("rb") as f:
+            f.seek(start * 2 * POSITION_BYTES)
+            pairs.fromfile(f, (stop - start) * 2)
+        return pairs
+
+    def _load_positions(self) -> None:
+        """Read the sidecar into per-user arrays (the slow part runs outside the index lock)."""
+        with self._positions_lock:
+            with self._lock:
+                if self._positions is not None:
+                    return
+                saved = self._positions_saved
+            try:
+                pairs = self._read_positions(0, saved) if saved >= 0 else None
+            except (FileNotFoundError, EOFError):
+                pairs = None
+            with self._lock:
+                if self._positions is not None:
+                    return
+                if pairs is None:
+                    self._rebuild_positions()
+                    return
+                if self._positions_saved > saved:  # a save flushed more pairs meanwhile
+                    pairs.extend(self._read_positions(saved, self._positions_saved))
+                pairs.extend(self._new_positions)
+                names = self._user_names
+                positions: Dict[str, array] = {}
+                for i in range(0, len(pairs), 2):
+                    positions.setdefault(names[pairs[i]], array("q")).append(pairs[i + 1])
+                self._positions = positions
+
+    def _rebuild_positions(self) -> None:
+        # The sidecar is missing or short: rebuild the index from the store once
+        self.positions_path.unlink(missing_ok=True)
+        self._reset()
+        self.refresh()
+        self.save()
+
+    def user_positions(self, username: str, offset: int = 0, limit: Optional[int] = None) -> List[int]:
+        """Store positions of a user's entries, oldest first, sliced for paging."""
+        if self._positions is None:
+            self._load_positions()
+        with self._lock:
+            positions = self._positions.get(username)
+            if positions is None:
+                return []
+            stop = None if limit is None else offset + limit
+            return positions[offset:stop].tolist()
+
+
+_indexes: Dict[Path, LeaderboardIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def open_index(store: ScoreStore) -> LeaderboardIndex:
+    """Return the process-wide index for `store`."""
+    with _indexes_lock:
+        index = _indexes.get(store.legacy_path)
+        if index is None:
+            index = LeaderboardIndex(store)
+            _indexes[store.legacy_path] = index
+        return index
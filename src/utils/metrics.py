@@ -0,0 +1,245 @@
+"""
+Hot-path instrumentation: operation counts, latency histograms and bytes read/written.
+
+Functions are wrapped with `@timed("op")` and blocks with `with timer("op"):`;
+file I/O reports sizes with `add_bytes`. Collection is off unless
+QUIZ_METRICS=1 (or `enable()` is called): a disabled wrapper costs one flag
+check per call and a disabled timer is a shared no-op.
+
+Metrics are process-wide and exposed as Prometheus text by `render_prometheus`,
+served over HTTP on localhost by `start_server` (GET /metrics).
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config import METRICS_ENABLED, METRICS_PORT
+
+# Histogram bucket upper bounds in seconds (a final +Inf bucket is implied)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = METRICS_ENABLED
+_lock = threading.Lock()
+_server = None  # http.server.ThreadingHTTPServer, imported when first started
+
+
+class Histogram:
+    """Latency histogram over BUCKETS."""
+
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by interpolating within its bucket (the last finite bound for +Inf)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                if i == len(BUCKETS):
+                    return BUCKETS[-1]
+                low = BUCKETS[i - 1] if i else 0.0
+                return low + (BUCKETS[i] - low) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+_histograms: Dict[str, Histogram] = {}
+_bytes: Dict[Tuple[str, str], int] = {}  # (op, "read" | "write") -> bytes
+
+
+def enabled() -> bool:
+    """Whether collection is on."""
+    return _enabled
+
+
+def enable(on: bool = True) -> None:
+    """Turn collection on (or off); already collected values are kept."""
+    global _enabled
+    _enabled = on
+
+
+def reset() -> None:
+    """Drop every collected value."""
+    with _lock:
+        _histograms.clear()
+        _bytes.clear()
+
+
+def observe(op: str, seconds: float) -> None:
+    """Record one call of `op` that took `seconds`."""
+    with _lock:
+        histogram = _histograms.get(op)
+        if histogram is None:
+            histogram = _histograms[op] = Histogram()
+        histogram.observe(seconds)
+
+
+def add_bytes(op: str, direction: str, n: int) -> None:
+    """Count `n` bytes read or written (`direction` "read" or "write") by `op`."""
+    if not _enabled:
+        return
+    with _lock:
+        _bytes[(op, direction)] = _bytes.get((op, direction), 0) + n
+
+
+def timed(op: str) -> Callable:
+    """Decorator recording the latency of every call as `op`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(op, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+class _Timer:
+    __slots__ = ("op", "started")
+
+    def __init__(self, op: str):
+        self.op = op
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.op, time.perf_counter() - self.started)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(op: str):
+    """Context manager recording the latency of its block as `op`."""
+    return _Timer(op) if _enabled else _NULL_TIMER
+
+
+def snapshot() -> List[Dict[str, Any]]:
+    """One row per operation: count, mean/p50/p99 latency (ms) and bytes read/written."""
+    with _lock:
+        ops = sorted(set(_histograms) | {op for op, _ in _bytes})
+        rows = []
+        for op in ops:
+            h = _histograms.get(op) or Histogram()
+            rows.append({
+                "op": op,
+                "count": h.count,
+                "mean_ms": h.sum / h.count * 1000 if h.count else 0.0,
+                "p50_ms": h.quantile(0.5) * 1000,
+                "p99_ms": h.quantile(0.99) * 1000,
+                "bytes_read": _bytes.get((op, "read"), 0),
+                "bytes_written": _bytes.get((op, "write"), 0),
+            })
+        return rows
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP quiz_operation_duration_seconds Latency of instrumented quiz operations.",
+        "# TYPE quiz_operation_duration_seconds histogram",
+    ]
+    with _lock:
+        for op in sorted(_histograms):
+            h = _histograms[op]
+            label = _label(op)
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), h.buckets):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'quiz_operation_duration_seconds_bucket{{op="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'quiz_operation_duration_seconds_sum{{op="{label}"}} {h.sum!r}')
+            lines.append(f'quiz_operation_duration_seconds_count{{op="{label}"}} {h.count}')
+        lines.append("# HELP quiz_io_bytes_total Bytes read or written by quiz operations.")
+        lines.append("# TYPE quiz_io_bytes_total counter")
+        for (op, direction), n in sorted(_bytes.items()):
+            lines.append(f'quiz_io_bytes_total{{op="{_label(op)}",direction="{direction}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def _handler_class():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_server(port: int = METRICS_PORT, host: str = "127.0.0.1"):
+    """Serve /metrics on a daemon thread; later calls return the running server."""
+    from http.server import ThreadingHTTPServer
+
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _handler_class())
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+
+def server_url() -> str:
+    """URL of the /metrics endpoint, or "" when it is not running."""
+    server = _server
+    if server is None:
+        return ""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/metrics"
+
+
+def stop_server() -> None:
+    """Stop the /metrics server, if running."""
+    global _server
+    with _lock:
+        server, _server = _server, None
+    if server is not None:
+        server.shutdown()
+        server.server_close()
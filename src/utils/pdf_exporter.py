@@ -1,38 +1,131 @@
-"""PDF export utilities (placeholder)."""
+"""PDF export utilities."""
 
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .pdf_writer import DEFAULT_TEMPLATE, PageTemplate, PDFWriter
+
+logger = logging.getLogger(__name__)
+
+EXPORT_WORKERS = 2
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool that renders PDFs off the caller's thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(EXPORT_WORKERS, thread_name_prefix="pdf-export")
+        return _executor
+
+
+def _field(item: Any, name: str, default: Any = "") -> Any:
+    """Read a field from a question/result given as a dict or an object."""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
 
 
 class PDFExporter:
     """Export quiz and results to PDF."""
 
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, template: PageTemplate = DEFAULT_TEMPLATE):
         self.output_dir = output_dir
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.template = template
+
+    def quiz_path(self, quiz_title: str, filename: str = None) -> Path:
+        return self.output_dir / (filename or f"{quiz_title.replace(' ', '_')}.pdf")
+
+    def results_path(self, quiz_title: str, filename: str = None) -> Path:
+        return self.output_dir / (filename or f"{quiz_title.replace(' ', '_')}_report.pdf")
+
+    def _write(self, path: Path, title: str, render) -> str:
+        # Render to a temporary name so readers never see a half-written file
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with PDFWriter(tmp, title=title, template=self.template) as pdf:
+                render(pdf)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return str(path)
 
-    def export_quiz_as_pdf(self, quiz_title: str, questions: List[Dict], filename: str = None) -> str:
+    def export_quiz_as_pdf(
+        self, quiz_title: str, questions: List[Any], filename: str = None, answer_key: bool = True
+    ) -> str:
         """
-        Export quiz to PDF.
-        Note: Requires reportlab library. For now, returns placeholder message.
+        Export quiz to PDF: numbered questions with lettered options, then an
+        answer key on its own page. Questions may be dicts or Question objects.
         """
-        if filename is None:
-            filename = f"{quiz_title.replace(' ', '_')}.pdf"
-        path = self.output_dir / filename
-        
-        # Placeholder: in production, use reportlab or fpdf
-        print(f"[Placeholder] Would export {len(questions)} questions to {path}")
-        
-        # Create dummy file to show export works
-        path.touch()
-        return str(path)
+        def render(pdf: PDFWriter) -> None:
+            pdf.heading(quiz_title)
+            for idx, q in enumerate(questions, 1):
+                pdf.paragraph(f"{idx}. {_field(q, 'text')}", bold=True)
+                for opt_idx, opt in enumerate(_field(q, "options", ()) or ()):
+                    pdf.paragraph(f"{chr(ord('A') + opt_idx)}. {opt}", indent=18)
+                pdf.spacer()
+            if answer_key:
+                pdf.page_break()
+                pdf.heading("Answer Key")
+                for idx, q in enumerate(questions, 1):
+                    pdf.paragraph(f"{idx}: {_field(q, 'correct_letter') or _field(q, 'answer')}")
+
+        return self._write(self.quiz_path(quiz_title, filename), quiz_title, render)
 
     def export_results_as_pdf(self, quiz_title: str, results: List[Dict], filename: str = None) -> str:
         """Export quiz results/report to PDF."""
-        if filename is None:
-            filename = f"{quiz_title.replace(' ', '_')}_report.pdf"
-        path = self.output_dir / filename
-        
-        print(f"[Placeholder] Would export results report to {path}")
-        path.touch()
-        return str(path)
+        def render(pdf: PDFWriter) -> None:
+            correct = sum(1 for r in results if r.get("is_correct"))
+            total = len(results)
+            pdf.heading(f"{quiz_title} - Results")
+            pct = correct / total * 100 if total else 0.0
+            pdf.paragraph(f"Score: {correct}/{total} ({pct:.1f}%)", bold=True)
+            pdf.spacer()
+            for r in results:
+                status = "Correct" if r.get("is_correct") else "Incorrect"
+                pdf.paragraph(f"{r.get('index', '')}. {r.get('question', '')}", bold=True)
+                chosen = r.get("chosen_letter") or "-"
+                if r.get("chosen_text"):
+                    chosen += f" ({r['chosen_text']})"
+                pdf.paragraph(f"Your answer: {chosen}    Correct answer: {r.get('correct_letter', '')}", indent=18)
+                details = [status]
+                if r.get("topic"):
+                    details.append(f"Topic: {r['topic']}")
+                if r.get("time_taken") is not None:
+                    details.append(f"Time: {r['time_taken']:.1f}s")
+                pdf.paragraph("    ".join(details), indent=18)
+                pdf.spacer()
+
+        return self._write(self.results_path(quiz_title, filename), f"{quiz_title} - Results", render)
+
+    def _submit(self, fn, *args) -> "Future[str]":
+        future = _get_executor().submit(fn, *args)
+        future.add_done_callback(_log_failure)
+        return future
+
+    def submit_quiz_export(self, quiz_title: str, questions: List[Any], filename: str = None) -> "Future[str]":
+        """Render a quiz PDF on the export pool; the future resolves to its path."""
+        return self._submit(self.export_quiz_as_pdf, quiz_title, list(questions), filename)
+
+    def submit_results_export(self, quiz_title: str, results: List[Dict], filename: str = None) -> "Future[str]":
+        """Render a results PDF on the export pool; the future resolves to its path."""
+        return self._submit(self.export_results_as_pdf, quiz_title, list(results), filename)
+
+    def export_many(self, quizzes: Iterable[Tuple[str, List[Any]]]) -> List[str]:
+        """Export several (title, questions) quizzes concurrently; returns their paths in order."""
+        futures = [self.submit_quiz_export(title, questions) for title, questions in quizzes]
+        return [f.result() for f in futures]
+
+
+def _log_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("PDF export failed", exc_info=future.exception())
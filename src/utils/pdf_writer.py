@@ -0,0 +1,227 @@
+"""Minimal dependency-free PDF writer.
+
+Text-only documents using the standard Helvetica fonts (no embedding), with
+word wrapping and automatic page breaks. Pages are written to the file as
+soon as they are full, so memory use does not grow with document length;
+only the byte offsets of written objects are kept for the cross-reference
+table at the end.
+"""
+
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, List, Tuple
+
+# Glyph widths (1/1000 em) for WinAnsi characters 32-126, from the Adobe AFM files.
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+FONTS = {"F1": ("Helvetica", _HELVETICA), "F2": ("Helvetica-Bold", _HELVETICA_BOLD)}
+_DEFAULT_WIDTH = 556
+
+
+@dataclass(frozen=True)
+class PageTemplate:
+    """Page geometry and type sizes (points). Instances are hashable and cached."""
+
+    width: float = 612.0   # US Letter
+    height: float = 792.0
+    margin: float = 54.0
+    font_size: float = 11.0
+    heading_size: float = 16.0
+    leading: float = 1.35  # line height as a multiple of the font size
+
+
+DEFAULT_TEMPLATE = PageTemplate()
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """Width of `text` in points."""
+    widths = _HELVETICA_BOLD if bold else _HELVETICA
+    total = 0
+    for ch in text:
+        code = ord(ch) - 32
+        total += widths[code] if 0 <= code < len(widths) else _DEFAULT_WIDTH
+    return total * size / 1000.0
+
+
+@lru_cache(maxsize=4096)
+def wrap(text: str, max_width: float, size: float, bold: bool = False) -> Tuple[str, ...]:
+    """Split `text` into lines no wider than `max_width` (cached: options repeat a lot)."""
+    space = text_width(" ", size, bold)
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line, width = "", 0.0
+        for word in paragraph.split(" "):
+            word_width = text_width(word, size, bold)
+            if line and width + space + word_width <= max_width:
+                line, width = f"{line} {word}", width + space + word_width
+                continue
+            if line:
+                lines.append(line)
+            # Break words that are wider than a whole line
+            while word_width > max_width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and text_width(word[:cut], size, bold) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = text_width(word, size, bold)
+            line, width = word, word_width
+        lines.append(line)
+    return tuple(lines)
+
+
+def _escape(text: str) -> bytes:
+    data = text.encode("cp1252", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+@lru_cache(maxsize=None)
+def _font_objects() -> Tuple[bytes, ...]:
+    """Font dictionaries shared by every document."""
+    return tuple(
+        f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>".encode("ascii")
+        for base, _ in FONTS.values()
+    )
+
+
+class PDFWriter:
+    """
+    Stream a text document to a PDF file.
+
+    Usage:
+        with PDFWriter(path, title="Quiz") as pdf:
+            pdf.heading("Quiz")
+            pdf.paragraph("1. What is 2 + 2?")
+    """
+
+    # Fixed object numbers; pages and their content streams follow.
+    _CATALOG, _PAGES, _INFO = 1, 2, 3
+    _FIRST_FONT = 4
+
+    def __init__(self, path: Path, title: str = "", template: PageTemplate = DEFAULT_TEMPLATE):
+        self.path = Path(path)
+        self.title = title
+        self.template = template
+        self._file: BinaryIO = open(self.path, "wb")
+        self._offsets = {}
+        self._next_obj = self._FIRST_FONT + len(FONTS)
+        self._page_objs: List[int] = []
+        self._ops: List[bytes] = []
+        self._y = 0.0
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for i, font in enumerate(_font_objects()):
+            self._write_obj(self._FIRST_FONT + i, font)
+        self._new_page()
+
+    # -- layout --------------------------------------------------------------
+
+    @property
+    def _text_width(self) -> float:
+        return self.template.width - 2 * self.template.margin
+
+    def _line(self, text: str, size: float, bold: bool, indent: float) -> None:
+        height = size * self.template.leading
+        if self._y - height < self.template.margin:
+            self._finish_page()
+            self._new_page()
+        self._y -= height
+        font = "F2" if bold else "F1"
+        x = self.template.margin + indent
+        self._ops.append(b"BT /%s %.1f Tf %.2f %.2f Td (%s) Tj ET" % (
+            font.encode(), size, x, self._y, _escape(text)))
+
+    def paragraph(self, text: str, bold: bool = False, indent: float = 0.0, size: float = None) -> None:
+        """Add wrapped text, breaking pages as needed."""
+        size = size or self.template.font_size
+        for line in wrap(text, self._text_width - indent, size, bold):
+            self._line(line, size, bold, indent)
+
+    def heading(self, text: str) -> None:
+        self.paragraph(text, bold=True, size=self.template.heading_size)
+        self.spacer()
+
+    def spacer(self, lines: float = 0.5) -> None:
+        self._y -= self.template.font_size * self.template.leading * lines
+
+    def page_break(self) -> None:
+        if self._ops:
+            self._finish_page()
+            self._new_page()
+
+    # -- file structure ------------------------------------------------------
+
+    def _write_obj(self, num: int, body: bytes) -> None:
+        self._offsets[num] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+
+    def _alloc(self) -> int:
+        num = self._next_obj
+        self._next_obj += 1
+        return num
+
+    def _new_page(self) -> None:
+        self._ops = []
+        self._y = self.template.height - self.template.margin
+
+    def _finish_page(self) -> None:
+        number = len(self._page_objs) + 1
+        footer = b"BT /F1 9 Tf %.2f %.2f Td (%s) Tj ET" % (
+            self.template.width / 2 - 10, self.template.margin / 2, str(number).encode())
+        content = zlib.compress(b"\n".join(self._ops + [footer]))
+        content_obj, page_obj = self._alloc(), self._alloc()
+        self._write_obj(content_obj, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content)
+                        + content + b"\nendstream")
+        fonts = b" ".join(b"/%s %d 0 R" % (name.encode(), self._FIRST_FONT + i) for i, name in enumerate(FONTS))
+        self._write_obj(page_obj, b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] "
+                        b"/Resources << /Font << %s >> >> /Contents %d 0 R >>" % (
+                            self._PAGES, self.template.width, self.template.height, fonts, content_obj))
+        self._page_objs.append(page_obj)
+        self._ops = []
+
+    def close(self) -> None:
+        """Write the last page, page tree and cross-reference table."""
+        if self._file.closed:
+            return
+        if self._ops or not self._page_objs:
+            self._finish_page()
+        kids = b" ".join(b"%d 0 R" % n for n in self._page_objs)
+        self._write_obj(self._PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_objs)))
+        self._write_obj(self._CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES)
+        self._write_obj(self._INFO, b"<< /Title (%s) /Producer (quiz) >>" % _escape(self.title))
+
+        xref = self._file.tell()
+        size = self._next_obj
+        self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for num in range(1, size):
+            self._file.write(b"%010d 00000 n \n" % self._offsets[num])
+        self._file.write(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            size, self._CATALOG, self._INFO, xref))
+        self._file.close()
+
+    def abort(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "PDFWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,227 @@
+"""
+Opt-in sampling profiler for Streamlit reruns, writing collapsed stacks.
+
+With QUIZ_PROFILE=1, app.py calls `start_rerun` first thing in every rerun
+and `finish_rerun` when it ends. While a rerun is running, a shared
+background thread samples its stack every PROFILE_INTERVAL seconds, from the
+app.py module frame down. Each rerun is written to PROFILE_DIR as one
+collapsed-stack file ("frame;frame;frame count" per line, as read by
+flamegraph.pl, inferno and speedscope). Every stack starts with two tag
+frames: the page rendered and the widget that triggered the rerun.
+
+Merge any number of captures into one flame graph input:
+
+    python -m src.utils.profiler merge --out exports/profiles/merged.folded
+    python -m src.utils.profiler merge --page "Run Quiz" --group-by none --top 20
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Tuple
+
+from src.config import BASE_DIR, PROFILE_DIR, PROFILE_INTERVAL, PROFILE_RERUNS
+
+_STATE_KEY = "_rerun_profile"  # session-state slot of the running capture
+_WIDGETS_KEY = "_rerun_widgets"  # scalar session state as the previous rerun left it
+
+_lock = threading.Lock()
+_active: Dict[int, "RerunCapture"] = {}  # thread id -> capture
+_sampler: Optional[threading.Thread] = None
+_labels: Dict[Any, str] = {}
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        path = Path(code.co_filename)
+        try:
+            name = path.relative_to(BASE_DIR).as_posix()
+        except ValueError:
+            name = path.name
+        label = _labels[code] = f"{code.co_name} ({name}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+
+def _sample_loop() -> None:
+    while True:
+        time.sleep(PROFILE_INTERVAL)
+        with _lock:
+            captures = list(_active.items())
+        if not captures:
+            continue
+        frames = sys._current_frames()
+        for thread_id, capture in captures:
+            frame = frames.get(thread_id)
+            if frame is not None:
+                capture.sample(frame)
+
+
+class RerunCapture:
+    """Stack samples of one rerun, rooted at the app.py module frame."""
+
+    def __init__(self, root: FrameType, trigger: str):
+        self.root = root
+        self.trigger = trigger
+        self.thread_id = threading.get_ident()
+        self.started = time.perf_counter()
+        self.stacks: Counter = Counter()
+
+    def sample(self, frame: FrameType) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(_label(frame.f_code))
+            if frame is self.root:
+                self.stacks[tuple(reversed(stack))] += 1
+                return
+            frame = frame.f_back
+
+    def collapsed(self, page: str) -> List[str]:
+        """Collapsed-stack lines, each stack prefixed with the page and trigger tags."""
+        tags = (f"page:{page}", f"trigger:{self.trigger}")
+        return [";".join(tags + stack) + f" {count}" for stack, count in sorted(self.stacks.items())]
+
+
+def _scalars(state: MutableMapping) -> Dict[str, Any]:
+    return {
+        k: v for k, v in state.items()
+        if isinstance(v, (str, int, float, bool)) and not str(k).startswith("_")
+    }
+
+
+def _trigger(state: MutableMapping) -> str:
+    """
+    Name the widget behind this rerun from what changed since the last one ended.
+
+    Between reruns only the browser changes session state, so changed keys are
+    widgets (a pressed button reads True). "load" is a new session and
+    "rerun" a rerun with no widget change (st.rerun() or a refresh).
+    """
+    previous = state.get(_WIDGETS_KEY)
+    if previous is None:
+        return "load"
+    changed = [k for k, v in _scalars(state).items() if v is not False and (k not in previous or previous[k] != v)]
+    return "+".join(sorted(changed)) or "rerun"
+
+
+def start_rerun(state: MutableMapping) -> Optional[RerunCapture]:
+    """Begin profiling the calling script's rerun; returns None unless QUIZ_PROFILE=1."""
+    if not PROFILE_RERUNS:
+        return None
+    stale = state.pop(_STATE_KEY, None)
+    if stale is not None:  # the last rerun stopped before reaching finish_rerun
+        finish_rerun(stale, state)
+    capture = RerunCapture(sys._getframe(1), _trigger(state))
+    state[_STATE_KEY] = capture
+    global _sampler
+    with _lock:
+        _active[capture.thread_id] = capture
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_loop, name="rerun-profiler", daemon=True)
+            _sampler.start()
+    return capture
+
+
+def finish_rerun(capture: Optional[RerunCapture], state: MutableMapping) -> Optional[Path]:
+    """Stop `capture` and write it to PROFILE_DIR; returns the file, if any samples were taken."""
+    if capture is None:
+        return None
+    with _lock:
+        if _active.get(capture.thread_id) is capture:
+            del _active[capture.thread_id]
+    state.pop(_STATE_KEY, None)
+    state[_WIDGETS_KEY] = _scalars(state)
+    if not capture.stacks:
+        return None
+    page = str(state.get("current_page", "")).split(" ", 1)[-1] or "unknown"
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    seconds = time.perf_counter() - capture.started
+    path = PROFILE_DIR / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{capture.thread_id}-{seconds * 1000:.0f}ms.folded"
+    path.write_text("\n".join(capture.collapsed(page)) + "\n", encoding="utf-8")
+    return path
+
+
+# -- aggregation ---------------------------------------------------------------
+
+
+def _parse_line(line: str) -> Optional[Tuple[List[str], int]]:
+    stack, _, count = line.rstrip("\n").rpartition(" ")
+    if not stack or not count.isdigit():
+        return None
+    return stack.split(";"), int(count)
+
+
+def merge(
+    files: Iterable[Path],
+    page: Optional[str] = None,
+    trigger: Optional[str] = None,
+    group_by: str = "both",
+) -> Counter:
+    """
+    Sum the stacks of many capture files.
+
+    `page`/`trigger` keep only matching captures; `group_by` ("both", "page",
+    "trigger" or "none") decides which tag frames stay at the root.
+    """
+    keep = {"both": (0, 1), "page": (0,), "trigger": (1,), "none": ()}[group_by]
+    merged: Counter = Counter()
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parsed = _parse_line(line)
+                if parsed is None:
+                    continue
+                frames, count = parsed
+                tags, stack = frames[:2], frames[2:]
+                if page is not None and tags[0] != f"page:{page}":
+                    continue
+                if trigger is not None and tags[1:] != [f"trigger:{trigger}"]:
+                    continue
+                merged[";".join([tags[i] for i in keep if i < len(tags)] + stack)] += count
+    return merged
+
+
+def self_time(merged: Counter) -> List[Tuple[str, int]]:
+    """Samples per leaf frame, highest first."""
+    leaves: Counter = Counter()
+    for stack, count in merged.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    return leaves.most_common()
+
+
+def main(argv=None) -> int:
+    """Merge per-rerun profiles into one collapsed-stack file."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    m = sub.add_parser("merge", help="merge capture files")
+    m.add_argument("files", nargs="*", type=Path, help=f"capture files (default: {PROFILE_DIR}/*.folded)")
+    m.add_argument("--page", help="only reruns of this page (e.g. 'Run Quiz')")
+    m.add_argument("--trigger", help="only reruns triggered by this widget key")
+    m.add_argument("--group-by", choices=["both", "page", "trigger", "none"], default="both")
+    m.add_argument("--out", type=Path, help="write the merged stacks here (default: stdout)")
+    m.add_argument("--top", type=int, default=0, help="print the N frames with the most self samples")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(PROFILE_DIR.glob("*.folded"))
+    merged = merge(files, args.page, args.trigger, args.group_by)
+    lines = [f"{stack} {count}" for stack, count in sorted(merged.items())]
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"Merged {len(files)} captures ({sum(merged.values())} samples) into {args.out}", file=sys.stderr)
+    elif not args.top:
+        print("\n".join(lines))
+    if args.top:
+        total = sum(merged.values()) or 1
+        for frame, count in self_time(merged)[:args.top]:
+            print(f"{count:>8} {count / total:>6.1%}  {frame}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Process-wide cache for the question bank file."""
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Sequence, Tuple, Union
+
+from src.config import LAZY_BANK_BYTES
+from src.models.question_model import Question
+from src.models.question_bank import QuestionBank
+from src.models.lazy_question_bank import LazyQuestionBank
+from .file_handler import load_json
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how the question cache is being used."""
+
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "reloads": self.reloads}
+
+
+_lock = threading.Lock()
+_entries: Dict[Path, Tuple[Tuple[int, int], Union[QuestionBank, LazyQuestionBank]]] = {}
+_stats = CacheStats()
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    """Return (mtime_ns, size) for a file, or (0, 0) if it is missing."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _parse(path: Path, size: int) -> Union[QuestionBank, LazyQuestionBank]:
+    if size >= LAZY_BANK_BYTES:
+        return LazyQuestionBank(path)
+    data = load_json(path)
+    if not isinstance(data, list):
+        return QuestionBank(())
+    # Questions without an id are numbered by position, as the legacy loader did
+    return QuestionBank(Question.from_dict(q, str(i + 1)) for i, q in enumerate(data))
+
+
+def get_bank(path: Path) -> Union[QuestionBank, LazyQuestionBank]:
+    """
+    Return the indexed question bank for `path`, shared by every caller in the process.
+
+    The file is only re-parsed (and re-indexed) when its mtime or size changes.
+    Files of LAZY_BANK_BYTES or more get a LazyQuestionBank, which keeps a
+    compact index and parses questions as they are used. The returned bank
+    must be treated as read-only.
+    """
+    path = Path(path).resolve()
+    sig = _signature(path)
+    with _lock:
+        cached = _entries.get(path)
+        if cached is not None and cached[0] == sig:
+            _stats.hits += 1
+            return cached[1]
+        if cached is None:
+            _stats.misses += 1
+        else:
+            _stats.reloads += 1
+        bank = _parse(path, sig[1])
+        _entries[path] = (sig, bank)
+        return bank
+
+
+def get_questions(path: Path) -> Sequence[Question]:
+    """Return the questions stored in `path` (see `get_bank`)."""
+    return get_bank(path).questions
+
+
+def cache_stats() -> CacheStats:
+    """Return a snapshot of the cache counters."""
+    with _lock:
+        return CacheStats(_stats.hits, _stats.misses, _stats.reloads)
+
+
+def clear_cache() -> None:
+    """Drop all cached banks and reset the counters."""
+    with _lock:
+        _entries.clear()
+        _stats.hits = _stats.misses = _stats.reloads = 0
@@ -0,0 +1,308 @@
+"""Batch per-user and per-quiz reports from results.csv and the leaderboard.
+
+The leaderboard is the record of attempts (scores, pass rates, recent
+attempts); results.csv only adds per-question counts, since every saved
+attempt is written to both and would otherwise be counted twice.
+
+Both sources are append-only, so the pipeline keeps a small state file next
+to the reports recording how far each source has been read (byte offsets
+into the results.csv segments, a cursor into the configured score repository)
+with the running summaries. An incremental run reads only what was appended since,
+and re-renders only the users whose summaries changed; per-user files are
+rendered in parallel across processes.
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config import PASS_PERCENTAGE, REPORTS_DIR, RESULTS_FILE
+from src.storage.repository import ScoreRepository, open_storage
+from .file_handler import load_json, save_json
+from .results_sink import segments
+
+STATE_VERSION = 4
+CHUNK_SIZE = 1 << 20
+FINGERPRINT_BYTES = 4096  # leading bytes hashed to tell a segment from a later file on a reused inode
+RECENT_ATTEMPTS = 10
+
+
+def iter_csv_chunks(path: Path, offset: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, List[Dict]]]:
+    """
+    Stream a CSV file in chunks of whole records, starting at byte `offset`.
+
+    Yields (end_offset, rows); rows are dicts keyed by the header line.
+    A trailing partial record (a write in progress) is left for the next call.
+    """
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        header = f.readline()
+        if not header:
+            return
+        fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+        offset = max(offset, len(header))
+        f.seek(offset)
+        pending = b""
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                return
+            data = pending + data
+            # Cut after the last newline that is outside a quoted field
+            cut = data.rfind(b"\n")
+            while cut >= 0 and data.count(b'"', 0, cut) % 2:
+                cut = data.rfind(b"\n", 0, cut)
+            if cut < 0:
+                pending = data
+                continue
+            complete, pending = data[:cut + 1], data[cut + 1:]
+            offset += len(complete)
+            rows = list(csv.DictReader(io.StringIO(complete.decode("utf-8")), fieldnames=fieldnames))
+            yield offset, rows
+
+
+def _prefix_digest(path: Path, length: int) -> str:
+    """SHA-1 of the first `length` bytes of `path`."""
+    with path.open("rb") as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def _bucket() -> List:
+    return [0, 0.0, 0.0, 0, ""]  # attempts, total %, best %, passed, last timestamp
+
+
+def _add(bucket: List, pct: float, timestamp: str) -> None:
+    bucket[0] += 1
+    bucket[1] += pct
+    bucket[2] = max(bucket[2], pct)
+    bucket[3] += pct >= PASS_PERCENTAGE
+    bucket[4] = max(bucket[4], timestamp)
+
+
+class ReportBuilder:
+    """Running per-user and per-quiz summaries (JSON-serializable state)."""
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        state = state if state and state.get("version") == STATE_VERSION else {}
+        # Per segment inode: [offset read to, prefix length, prefix digest]
+        self.results_segments: Dict[str, List] = state.get("results_segments", {})
+        self.scores_cursor: Optional[List] = state.get("scores_cursor")
+        self.users: Dict[str, Dict[str, Any]] = state.get("users", {})
+        self.quizzes: Dict[str, List] = state.get("quizzes", {})
+        self.dirty: set = set()
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "results_segments": self.results_segments,
+            "scores_cursor": self.scores_cursor,
+            "users": self.users,
+            "quizzes": self.quizzes,
+        }
+
+    def _user(self, username: str) -> Dict[str, Any]:
+        user = self.users.get(username)
+        if user is None:
+            user = self.users[username] = {"quizzes": {}, "answered": 0, "correct": 0, "recent": []}
+        self.dirty.add(username)
+        return user
+
+    def add_score(self, username: str, quiz: str, score: float, total: int, pct: float, timestamp: str) -> None:
+        """Fold in one completed attempt."""
+        user = self._user(username)
+        _add(user["quizzes"].setdefault(quiz, _bucket()), pct, timestamp)
+        user["recent"] = (user["recent"] + [[timestamp, quiz, score, total, pct]])[-RECENT_ATTEMPTS:]
+        _add(self.quizzes.setdefault(quiz, _bucket()), pct, timestamp)
+
+    def add_leaderboard_entry(self, entry: Dict[str, Any]) -> None:
+        self.add_score(
+            entry.get("username") or "Unknown",
+            entry.get("quiz_title") or "Unknown",
+            entry.get("score", 0),
+            entry.get("total", 0),
+            entry.get("percentage", 0) or 0,
+            entry.get("timestamp", ""),
+        )
+
+    def add_result_attempt(self, rows: List[Dict[str, str]]) -> None:
+        """Fold in one attempt's question rows from results.csv (answer counts only)."""
+        user = self._user(rows[0].get("username") or "Anonymous")
+        user["answered"] += len(rows)
+        user["correct"] += sum(1 for r in rows if r.get("is_correct") == "True")
+
+    def update_results(self, path: Path) -> int:
+        """
+        Consume results rows appended since the last update; returns rows read.
+
+        Rotated segments are tracked by inode, so a file renamed aside by
+        rotation is picked up where the previous run left off. A hash of the
+        bytes already read guards against the inode of a deleted segment
+        being reused by a new file, which is then read from the start.
+        """
+        count = 0
+        tracked: Dict[str, List] = {}
+        for segment in segments(path):
+            st = segment.stat()
+            ino = str(st.st_ino)
+            offset, length, digest = self.results_segments.get(ino, (0, 0, ""))
+            if offset and _prefix_digest(segment, length) != digest:
+                offset = 0
+            elif st.st_size < offset:
+                raise ValueError(f"{segment} shrank since the last run; rebuild the reports with --full")
+            key, attempt = None, []
+            for offset, rows in iter_csv_chunks(segment, offset):
+                for row in rows:
+                    row_key = (row.get("timestamp"), row.get("username"), row.get("quiz_title"))
+                    if row_key != key and attempt:
+                        self.add_result_attempt(attempt)
+                        attempt = []
+                    key = row_key
+                    attempt.append(row)
+                    count += 1
+            if attempt:
+                self.add_result_attempt(attempt)
+            length = min(offset, FINGERPRINT_BYTES)
+            tracked[ino] = [offset, length, _prefix_digest(segment, length)]
+        self.results_segments = tracked
+        return count
+
+    def update_leaderboard(self, scores: ScoreRepository) -> int:
+        """Consume scores added since the last update; returns entries read."""
+        count = 0
+        try:
+            for cursor, entry in scores.iter_scores(self.scores_cursor):
+                self.add_leaderboard_entry(entry)
+                self.scores_cursor = cursor
+                count += 1
+        except ValueError as e:
+            raise ValueError(f"{e}; rebuild the reports with --full") from e
+        return count
+
+
+def _mean(bucket: List) -> float:
+    return bucket[1] / bucket[0] if bucket[0] else 0.0
+
+
+def render_user_report(username: str, summary: Dict[str, Any]) -> str:
+    """Markdown report for one user."""
+    buckets = summary["quizzes"].values()
+    attempts = sum(b[0] for b in buckets)
+    mean = sum(b[1] for b in buckets) / attempts if attempts else 0.0
+    best = max((b[2] for b in buckets), default=0.0)
+    lines = [
+        f"# Report: {username}",
+        "",
+        f"- Attempts: {attempts}",
+        f"- Mean score: {mean:.1f}%",
+        f"- Best score: {best:.1f}%",
+    ]
+    if summary["answered"]:
+        lines.append(f"- Questions answered: {summary['answered']} ({summary['correct']} correct)")
+    lines += ["", "## By quiz", "", "| Quiz | Attempts | Mean % | Best % | Passed | Last |", "|---|---|---|---|---|---|"]
+    for quiz, b in sorted(summary["quizzes"].items()):
+        lines.append(f"| {quiz} | {b[0]} | {_mean(b):.1f} | {b[2]:.1f} | {b[3]} | {b[4][:19]} |")
+    lines += ["", "## Recent attempts", "", "| When | Quiz | Score | % |", "|---|---|---|---|"]
+    for timestamp, quiz, score, total, pct in reversed(summary["recent"]):
+        lines.append(f"| {timestamp[:19]} | {quiz} | {score}/{total} | {pct:.1f} |")
+    return "\n".join(lines) + "\n"
+
+
+def render_quiz_summary(quizzes: Dict[str, List]) -> str:
+    """Markdown table of every quiz."""
+    lines = ["# Quiz summary", "", "| Quiz | Attempts | Mean % | Best % | Pass rate % |", "|---|---|---|---|---|"]
+    for quiz, b in sorted(quizzes.items(), key=lambda kv: -kv[1][0]):
+        lines.append(f"| {quiz} | {b[0]} | {_mean(b):.1f} | {b[2]:.1f} | {b[3] / b[0] * 100 if b[0] else 0:.1f} |")
+    return "\n".join(lines) + "\n"
+
+
+def user_report_path(out_dir: Path, username: str) -> Path:
+    """File for a user's report (sanitized name plus a hash so names cannot collide)."""
+    safe = re.sub(r"[^\w.-]+", "_", username)[:40] or "user"
+    digest = hashlib.sha1(username.encode("utf-8")).hexdigest()[:8]
+    return out_dir / "users" / f"{safe}-{digest}.md"
+
+
+def _write_user_report(job: Tuple[str, str, Dict[str, Any]]) -> str:
+    path, username, summary = job
+    Path(path).write_text(render_user_report(username, summary), encoding="utf-8")
+    return path
+
+
+@dataclass
+class ReportRun:
+    """What one report run did."""
+
+    results_rows: int
+    leaderboard_entries: int
+    users_rendered: int
+    elapsed: float
+
+
+def build_reports(
+    out_dir: Path = REPORTS_DIR,
+    results_file: Path = RESULTS_FILE,
+    scores: Optional[ScoreRepository] = None,
+    incremental: bool = True,
+    workers: Optional[int] = None,
+) -> ReportRun:
+    """
+    Update summaries from both sources and render reports into `out_dir`.
+
+    Scores come from `scores`, by default the configured storage backend's.
+    In incremental mode only users with new results are re-rendered; a full
+    run rebuilds every summary and report from the start of both sources.
+    """
+    started = time.perf_counter()
+    state_file = out_dir / ".report_state.json"
+    builder = ReportBuilder(load_json(state_file) if incremental else None)
+
+    rows = builder.update_results(results_file)
+    entries = builder.update_leaderboard(scores or open_storage().scores)
+
+    (out_dir / "users").mkdir(parents=True, exist_ok=True)
+    jobs = [(str(user_report_path(out_dir, u)), u, builder.users[u]) for u in sorted(builder.dirty)]
+    if workers != 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(_write_user_report, jobs, chunksize=max(1, len(jobs) // 32)))
+    else:
+        for job in jobs:
+            _write_user_report(job)
+
+    (out_dir / "quizzes.md").write_text(render_quiz_summary(builder.quizzes), encoding="utf-8")
+    save_json(state_file, builder.to_state(), indent=None)
+    return ReportRun(rows, entries, len(jobs), time.perf_counter() - started)
+
+
+def main(argv=None) -> None:
+    """Build per-user and per-quiz reports from results.csv and the leaderboard."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--full", action="store_true", help="rebuild everything instead of only new results")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", type=Path, default=REPORTS_DIR)
+    parser.add_argument("--results", type=Path, default=RESULTS_FILE)
+    parser.add_argument("--backend", choices=["json", "sqlite"], help="storage backend to read scores from")
+    args = parser.parse_args(argv)
+
+    try:
+        scores = open_storage(args.backend).scores
+        run = build_reports(args.out, args.results, scores, incremental=not args.full, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    print(
+        f"Read {run.results_rows} result rows and {run.leaderboard_entries} leaderboard entries; "
+        f"rendered {run.users_rendered} user reports in {run.elapsed:.2f}s -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
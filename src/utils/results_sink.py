@@ -0,0 +1,374 @@
+"""Buffered, rotating writer for per-question results (quizzes/results.csv).
+
+Each process keeps one sink per file (see `get_sink`). Attempts are buffered
+in memory and appended in batches, when enough rows are pending or the oldest
+pending row is `flush_interval` seconds old, as a single locked write, so
+concurrent processes never interleave rows.
+
+The header row doubles as the schema version (see SCHEMAS). The file is
+rotated aside to ``results.<UTC timestamp>.csv`` when it would grow past
+`max_bytes`, when the day changes (if `rotate_daily`), or when its header
+belongs to an older schema. Readers should use `segments()` to see every
+file in order.
+
+With `columnar=True` the same rows are also written in column batches under
+``results.columns/``: Arrow IPC files when pyarrow is installed, a compact
+dictionary-encoded binary format otherwise. `read_columns` loads either.
+"""
+
+import atexit
+import csv
+import io
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from src.config import RESULTS_COLUMNAR, RESULTS_FILE, RESULTS_MAX_BYTES, RESULTS_ROTATE_DAILY
+
+SCHEMAS = {
+    1: ("timestamp", "index", "question", "chosen_letter", "chosen_text", "correct_letter", "correct_text",
+        "is_correct"),
+    2: ("timestamp", "index", "question", "chosen_letter", "chosen_text", "correct_letter", "correct_text",
+        "is_correct", "username", "quiz_title", "question_id", "time_taken"),
+}
+SCHEMA_VERSION = 2
+FIELDNAMES = SCHEMAS[SCHEMA_VERSION]
+COLUMN_TYPES = {"index": "int", "is_correct": "bool", "time_taken": "float"}  # everything else is "str"
+
+_SEGMENT = re.compile(r"\.\d{8}T\d{12}")
+_MAGIC = b"QRC1"
+
+
+@lru_cache(maxsize=None)
+def _arrow():
+    """pyarrow, with pyarrow.feather loaded, imported on first use; None when not installed."""
+    try:
+        import pyarrow
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def schema_version(header: Sequence[str]) -> int:
+    """Schema version for a header row (0 if unknown)."""
+    header = tuple(header)
+    for version, fields in SCHEMAS.items():
+        if fields == header:
+            return version
+    return 0
+
+
+def segments(path: Path = RESULTS_FILE) -> List[Path]:
+    """Rotated segments of `path`, oldest first, followed by `path` itself if it exists."""
+    path = Path(path)
+    rotated = sorted(
+        p for p in path.parent.glob(f"{path.stem}.*{path.suffix}")
+        if _SEGMENT.fullmatch(p.name[len(path.stem):len(p.name) - len(path.suffix)])
+    )
+    return rotated + ([path] if path.exists() else [])
+
+
+def _row(result: Dict[str, Any], timestamp: str, username: str, quiz_title: str) -> List[Any]:
+    """One result dict as a typed row in FIELDNAMES order."""
+    time_taken = result.get("time_taken")
+    return [
+        timestamp,
+        int(result.get("index") or 0),
+        result.get("question", ""),
+        result.get("chosen_letter", "") or "",
+        result.get("chosen_text", "") or "",
+        result.get("correct_letter", "") or "",
+        result.get("correct_text", "") or "",
+        bool(result.get("is_correct")),
+        username,
+        quiz_title,
+        result.get("question_id", "") or "",
+        None if time_taken is None else round(float(time_taken), 3),
+    ]
+
+
+def _encode_csv(rows: Iterable[Sequence[Any]], header: bool = False) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(FIELDNAMES)
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+class ResultsSink:
+    """Per-process buffered appender for results.csv."""
+
+    def __init__(
+        self,
+        path: Path = RESULTS_FILE,
+        batch_rows: int = 256,
+        flush_interval: float = 2.0,
+        max_bytes: int = RESULTS_MAX_BYTES,
+        rotate_daily: bool = RESULTS_ROTATE_DAILY,
+        columnar: bool = RESULTS_COLUMNAR,
+        columnar_rows: int = 65536,
+    ):
+        self.path = Path(path)
+        self.columnar_dir = self.path.with_suffix(".columns")
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.columnar = columnar
+        self.columnar_rows = columnar_rows
+
+        self._mutex = threading.RLock()
+        self._pending: List[List[Any]] = []
+        self._columnar_pending: List[List[Any]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._fd: Optional[int] = None
+        self._checked_ino: Optional[int] = None
+        self._parts = 0
+        atexit.register(self.close)
+
+    # -- writing ---------------------------------------------------------------
+
+    def write_attempt(
+        self, results: Iterable[Dict[str, Any]], username: str = "", quiz_title: str = "", timestamp: str = None
+    ) -> None:
+        """Buffer one attempt's results; they reach the file with the next batch."""
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+        rows = [_row(r, timestamp, username, quiz_title) for r in results]
+        if not rows:
+            return
+        with self._mutex:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_rows:
+                self.flush()
+            elif self._timer is None:
+                # Bound how long a quiet process holds rows in memory
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Append all pending rows to the file."""
+        with self._mutex:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            self._append(_encode_csv(rows))
+            if self.columnar:
+                self._columnar_pending.extend(rows)
+                if len(self._columnar_pending) >= self.columnar_rows:
+                    self._write_columnar()
+
+    def close(self) -> None:
+        """Flush everything and release the file."""
+        with self._mutex:
+            self.flush()
+            if self._columnar_pending:
+                self._write_columnar()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    # -- file handling ---------------------------------------------------------
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _reopen(self) -> None:
+        os.close(self._fd)
+        self._fd = None
+
+    def _append(self, data: bytes) -> None:
+        while True:
+            fd = self._open()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                st = os.fstat(fd)
+                try:
+                    current = os.stat(self.path).st_ino
+                except FileNotFoundError:
+                    current = None
+                if current != st.st_ino:
+                    self._reopen()  # another process rotated the file
+                    continue
+                if st.st_size and self._should_rotate(fd, st, len(data)):
+                    self._rotate()
+                    continue
+                if not st.st_size:
+                    data = _encode_csv((), header=True) + data
+                while data:
+                    data = data[os.write(fd, data):]
+                return
+            finally:
+                if self._fd is not None and fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _should_rotate(self, fd: int, st: os.stat_result, incoming: int) -> bool:
+        if self._checked_ino != st.st_ino:
+            with open(self.path, "rb") as f:
+                first = f.readline().decode("utf-8-sig", errors="replace")
+            if schema_version(next(csv.reader([first]), [])) != SCHEMA_VERSION:
+                return True
+            self._checked_ino = st.st_ino
+        if st.st_size + incoming > self.max_bytes:
+            return True
+        if self.rotate_daily:
+            today = datetime.now(timezone.utc).date()
+            return datetime.fromtimestamp(st.st_mtime, timezone.utc).date() != today
+        return False
+
+    def _rotate(self) -> None:
+        """Rename the active file aside (caller holds its lock) and start a new one."""
+        while True:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            target = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+            if not target.exists():
+                break
+            time.sleep(0.001)
+        os.rename(self.path, target)
+        self._reopen()  # closing the descriptor releases its lock
+
+    # -- columnar output -------------------------------------------------------
+
+    def _write_columnar(self) -> None:
+        rows, self._columnar_pending = self._columnar_pending, []
+        columns = {name: [row[i] for row in rows] for i, name in enumerate(FIELDNAMES)}
+        self.columnar_dir.mkdir(parents=True, exist_ok=True)
+        self._parts += 1
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        name = f"part-{stamp}-{os.getpid()}-{self._parts:04d}"
+        arrow = _arrow()
+        if arrow is not None:
+            target = self.columnar_dir / f"{name}.arrow"
+            tmp = target.with_suffix(".tmp")
+            arrow.feather.write_feather(arrow.table(columns), str(tmp))
+        else:
+            target = self.columnar_dir / f"{name}.qcol"
+            tmp = target.with_suffix(".tmp")
+            tmp.write_bytes(encode_columns(columns, len(rows)))
+        os.replace(tmp, target)
+
+
+# -- compact binary column format ----------------------------------------------
+#
+# MAGIC, u32 header length, JSON header {"rows", "byteorder", "columns": [[name, type, nbytes], ...]},
+# then each column's bytes: "str" = u32 length + JSON list of distinct values + u32 codes,
+# "int" = int64, "float" = float64 (NaN for missing), "bool" = one byte per row.
+
+
+def _encode_column(kind: str, values: List[Any]) -> bytes:
+    if kind == "int":
+        return array("q", values).tobytes()
+    if kind == "float":
+        return array("d", (float("nan") if v is None else v for v in values)).tobytes()
+    if kind == "bool":
+        return bytes(bytearray(1 if v else 0 for v in values))
+    codes: Dict[str, int] = {}
+    encoded = array("I", (codes.setdefault(v, len(codes)) for v in values))
+    labels = json.dumps(list(codes), ensure_ascii=False).encode("utf-8")
+    return struct.pack("<I", len(labels)) + labels + encoded.tobytes()
+
+
+def encode_columns(columns: Dict[str, List[Any]], rows: int) -> bytes:
+    """Serialize columns (named as in FIELDNAMES) to the compact binary format."""
+    blobs = [(name, COLUMN_TYPES.get(name, "str"), _encode_column(COLUMN_TYPES.get(name, "str"), values))
+             for name, values in columns.items()]
+    header = json.dumps({
+        "rows": rows,
+        "byteorder": sys.byteorder,
+        "columns": [[name, kind, len(blob)] for name, kind, blob in blobs],
+    }).encode("utf-8")
+    return _MAGIC + struct.pack("<I", len(header)) + header + b"".join(blob for _, _, blob in blobs)
+
+
+def decode_columns(data: bytes) -> Dict[str, Any]:
+    """Inverse of `encode_columns`: str columns as lists, numeric ones as arrays."""
+    if data[:4] != _MAGIC:
+        raise ValueError("Not a results column file")
+    (size,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + size])
+    swap = header["byteorder"] != sys.byteorder
+    pos = 8 + size
+    columns: Dict[str, Any] = {}
+    for name, kind, nbytes in header["columns"]:
+        blob = data[pos:pos + nbytes]
+        pos += nbytes
+        if kind == "bool":
+            columns[name] = bytearray(blob)
+            continue
+        if kind == "str":
+            (label_size,) = struct.unpack_from("<I", blob)
+            labels = json.loads(blob[4:4 + label_size])
+            values = array("I")
+            values.frombytes(blob[4 + label_size:])
+        else:
+            values = array("q" if kind == "int" else "d")
+            values.frombytes(blob)
+        if swap:
+            values.byteswap()
+        columns[name] = [labels[c] for c in values] if kind == "str" else values
+    return columns
+
+
+def read_columns(path: Path = RESULTS_FILE) -> Dict[str, Any]:
+    """Load every columnar batch written for `path`, concatenated in write order."""
+    out: Dict[str, Any] = {}
+    directory = Path(path).with_suffix(".columns")
+    parts = sorted(p for p in directory.glob("part-*") if p.suffix in (".arrow", ".qcol")) if directory.exists() else []
+    for part in parts:
+        if part.suffix == ".arrow":
+            arrow = _arrow()
+            if arrow is None:
+                raise RuntimeError(f"{part} needs pyarrow to read")
+            table = arrow.feather.read_table(str(part))
+            columns = {name: table.column(name).to_pylist() for name in table.column_names}
+        else:
+            columns = decode_columns(part.read_bytes())
+        for name, values in columns.items():
+            kind = COLUMN_TYPES.get(name, "str")
+            if name not in out:
+                out[name] = {"int": array("q"), "float": array("d"), "bool": bytearray()}.get(kind, [])
+            if kind == "float":
+                out[name].extend(float("nan") if v is None else v for v in values)
+            elif kind == "bool":
+                out[name].extend(1 if v else 0 for v in values)
+            else:
+                out[name].extend(values)
+    return out
+
+
+_sinks: Dict[Path, ResultsSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(path: Path = RESULTS_FILE, **kwargs) -> ResultsSink:
+    """Return the process-wide ResultsSink for `path`."""
+    key = Path(path).resolve()
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = ResultsSink(key, **kwargs)
+            _sinks[key] = sink
+        return sink
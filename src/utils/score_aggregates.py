@@ -0,0 +1,109 @@
+"""Materialized score aggregates, maintained as scores are added."""
+
+from typing import Any, Dict, List, Optional
+
+from src.config import PASS_PERCENTAGE
+
+HISTOGRAM_BUCKETS = 10  # 0-10%, 10-20%, ..., 90-100%
+DIMENSIONS = ("user", "quiz", "topic", "difficulty", "day")
+
+
+class AggregateBucket:
+    """Count, sum, pass count, best and score histogram for one group."""
+
+    __slots__ = ("count", "total_percentage", "passed", "best_percentage", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total_percentage = 0.0
+        self.passed = 0
+        self.best_percentage = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, pct: float) -> None:
+        self.count += 1
+        self.total_percentage += pct
+        if pct >= PASS_PERCENTAGE:
+            self.passed += 1
+        if pct > self.best_percentage:
+            self.best_percentage = pct
+        self.histogram[min(max(int(pct // 10), 0), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_percentage": self.total_percentage / self.count if self.count else 0.0,
+            "pass_rate": self.passed / self.count * 100 if self.count else 0.0,
+            "best_percentage": self.best_percentage,
+            "histogram": list(self.histogram),
+        }
+
+    def to_state(self) -> list:
+        return [self.count, self.total_percentage, self.passed, self.best_percentage, self.histogram]
+
+    @staticmethod
+    def from_state(state: list) -> "AggregateBucket":
+        bucket = AggregateBucket()
+        bucket.count, bucket.total_percentage, bucket.passed, bucket.best_percentage, histogram = state
+        bucket.histogram = list(histogram)
+        return bucket
+
+
+def group_keys(entry: Dict[str, Any]) -> Dict[str, str]:
+    """The group each leaderboard entry falls into, per dimension."""
+    return {
+        "user": entry.get("username") or "Unknown",
+        "quiz": entry.get("quiz_title") or "Unknown",
+        "topic": entry.get("category") or "Unknown",
+        "difficulty": entry.get("difficulty") or "mixed",
+        "day": (entry.get("timestamp") or "")[:10] or "Unknown",
+    }
+
+
+class ScoreAggregates:
+    """
+    Per-user, per-quiz, per-topic, per-difficulty and per-day aggregates.
+
+    Each added score updates one bucket per dimension, so reading the
+    dashboard costs O(number of groups), independent of history size.
+    """
+
+    def __init__(self):
+        self.overall = AggregateBucket()
+        self.groups: Dict[str, Dict[str, AggregateBucket]] = {d: {} for d in DIMENSIONS}
+
+    def add(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Fold one leaderboard entry in; returns the groups it touched."""
+        pct = entry.get("percentage", 0) or 0
+        self.overall.add(pct)
+        keys = group_keys(entry)
+        for dimension, key in keys.items():
+            bucket = self.groups[dimension].get(key)
+            if bucket is None:
+                bucket = self.groups[dimension][key] = AggregateBucket()
+            bucket.add(pct)
+        return keys
+
+    def table(self, dimension: str, sort_by: str = "key", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows of {"key", "count", "mean_percentage", ...} for one dimension."""
+        rows = [dict(key=key, **bucket.to_dict()) for key, bucket in self.groups[dimension].items()]
+        rows.sort(key=lambda r: r[sort_by], reverse=sort_by != "key")
+        return rows[:limit] if limit is not None else rows
+
+    def copy(self) -> "ScoreAggregates":
+        """An independent snapshot."""
+        return ScoreAggregates.from_state(self.to_state())
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "overall": self.overall.to_state(),
+            "groups": {d: {k: b.to_state() for k, b in g.items()} for d, g in self.groups.items()},
+        }
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "ScoreAggregates":
+        aggregates = ScoreAggregates()
+        aggregates.overall = AggregateBucket.from_state(state["overall"])
+        for dimension, groups in state["groups"].items():
+            aggregates.groups[dimension] = {k: AggregateBucket.from_state(s) for k, s in groups.items()}
+        return aggregates
@@ -0,0 +1,385 @@
+"""Append-only, line-delimited score log with periodic compaction.
+
+Layout, derived from the legacy ``leaderboard.json`` path:
+
+- ``leaderboard.snapshot.jsonl``: compacted entries, one JSON object per line,
+  after a fixed-width header recording how many bytes are committed and which
+  log was folded in last.
+- ``leaderboard.jsonl``: entries appended since the last compaction. Its
+  header carries the log's id and ``base``, the snapshot offset its entries
+  will occupy once folded.
+- ``leaderboard.json.lock``: lock file used to coordinate processes.
+
+Every entry is addressed by a *position*: its byte offset in the snapshot,
+whether it already lives there or is still in the log (``base`` plus its
+offset in the log body). Compaction appends the log body to the snapshot
+verbatim, so positions never change and indexes built on them stay valid.
+
+Writers take an exclusive lock and append a single line, so concurrent
+sessions and processes never lose each other's scores. An existing
+``leaderboard.json`` is migrated into the snapshot the first time the store
+is opened; the legacy file itself is left untouched. ``read_entries`` reads
+a store (or a not yet migrated legacy file) without creating anything.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from .file_handler import load_json
+from .metrics import add_bytes
+
+HEADER_SIZE = 256
+
+
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _snapshot_header(store_id: str, body_end: int, folded_log: str) -> bytes:
+    raw = json.dumps({"_header": "snapshot", "store_id": store_id, "body_end": body_end, "folded_log": folded_log})
+    return raw.ljust(HEADER_SIZE - 1).encode("utf-8") + b"\n"
+
+
+def _store_paths(legacy_path: Path) -> Tuple[Path, Path, Path]:
+    """The (log, snapshot, lock) paths of the store for `legacy_path`."""
+    return (
+        legacy_path.with_suffix(".jsonl"),
+        legacy_path.with_name(legacy_path.stem + ".snapshot.jsonl"),
+        legacy_path.with_name(legacy_path.name + ".lock"),
+    )
+
+
+def _read_header(f) -> Dict[str, Any]:
+    """Return the header object on the first line of an open file ({} if absent)."""
+    f.seek(0)
+    line = f.readline()
+    if not line.endswith(b"\n"):
+        return {}
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return {}
+    return header if isinstance(header, dict) and "_header" in header else {}
+
+
+def _iter_lines(f, start: int, end: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (byte_offset, entry) for each complete entry line of `f` in [start, end)."""
+    f.seek(start)
+    offset = start
+    for line in f:
+        if offset >= end or not line.endswith(b"\n"):
+            break  # past the view, or a torn write still in progress
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = None
+        if isinstance(entry, dict):
+            yield offset, entry
+        offset += len(line)
+
+
+def _complete_end(f, start: int, size: int) -> int:
+    """Offset just past the last newline in [start, size), ignoring a torn tail."""
+    end = size
+    while end > start:
+        chunk_start = max(start, end - 4096)
+        f.seek(chunk_start)
+        chunk = f.read(end - chunk_start)
+        idx = chunk.rfind(b"\n")
+        if idx >= 0:
+            return chunk_start + idx + 1
+        end = chunk_start
+    return start
+
+
+class _View:
+    """Consistent, lock-free read view over the snapshot and log."""
+
+    def __init__(self, snapshot_path: Path, log_path: Path):
+        self.snap = snapshot_path.open("rb")
+        self.log = log_path.open("rb")
+        header = _read_header(self.snap)
+        self.store_id = header.get("store_id", "")
+        self.body_end = header.get("body_end", HEADER_SIZE)
+        log_header = _read_header(self.log)
+        self.log_start = self.log.tell()
+        if log_header.get("id") == header.get("folded_log"):
+            # Already folded; a compaction crashed before starting a new log.
+            self.base, self.log_end = self.body_end, self.log_start
+        else:
+            self.base = log_header.get("base", self.body_end)
+            self.log_end = _complete_end(self.log, self.log_start, os.fstat(self.log.fileno()).st_size)
+
+    @property
+    def end(self) -> int:
+        """Position just past the last entry visible in this view."""
+        return self.base + (self.log_end - self.log_start)
+
+    def iter_from(self, position: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (position, entry) for every entry at or after `position`."""
+        if position < self.body_end:
+            yield from _iter_lines(self.snap, max(position, HEADER_SIZE), self.body_end)
+        start = self.log_start + max(0, position - self.base)
+        for offset, entry in _iter_lines(self.log, start, self.log_end):
+            yield self.base + (offset - self.log_start), entry
+
+    def read_at(self, position: int) -> Optional[Dict[str, Any]]:
+        """Return the entry stored at `position`."""
+        if position < self.body_end:
+            f, offset = self.snap, position
+        else:
+            f, offset = self.log, self.log_start + position - self.base
+        f.seek(offset)
+        try:
+            return json.loads(f.readline())
+        except ValueError:
+            return None
+
+    def close(self) -> None:
+        self.snap.close()
+        self.log.close()
+
+    def __enter__(self) -> "_View":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ScoreStore:
+    """Durable append-only store of leaderboard entries."""
+
+    def __init__(
+        self,
+        legacy_path: Path,
+        compact_bytes: int = 1 << 20,
+        fsync_every: int = 16,
+        fsync_interval: float = 1.0,
+    ):
+        self.legacy_path = Path(legacy_path)
+        self.log_path, self.snapshot_path, self.lock_path = _store_paths(self.legacy_path)
+        self.compact_bytes = compact_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+        self._mutex = threading.RLock()
+        self._handle = None
+        self._handle_ino = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        self.legacy_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked(exclusive=True):
+            self._migrate()
+        atexit.register(self.close)
+
+    # -- locking -----------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        with self._mutex:
+            if fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    # -- setup ---------------------------------------------------------------
+
+    def _migrate(self) -> None:
+        """Create the snapshot/log pair, importing a legacy JSON leaderboard once."""
+        if not self.snapshot_path.exists():
+            data = load_json(self.legacy_path) if self.legacy_path.exists() else []
+            entries = [d for d in data if isinstance(d, dict)] if isinstance(data, list) else []
+            body = b"".join(_dumps(e) for e in entries)
+            tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with tmp.open("wb") as f:
+                f.write(_snapshot_header(uuid.uuid4().hex, HEADER_SIZE + len(body), ""))
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+        self._ensure_log()
+
+    def _ensure_log(self) -> None:
+        """Start a fresh log if there is none or the current one was already folded."""
+        with self.snapshot_path.open("rb") as f:
+            header = _read_header(f)
+        try:
+            with self.log_path.open("rb") as f:
+                log_header = _read_header(f)
+        except FileNotFoundError:
+            log_header = {}
+        if not log_header or log_header.get("id") == header.get("folded_log"):
+            self._new_log(header.get("body_end", HEADER_SIZE))
+
+    def _new_log(self, base: int) -> None:
+        tmp = self.log_path.with_name(self.log_path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(_dumps({"_header": "log", "id": uuid.uuid4().hex, "base": base}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.log_path)
+
+    # -- reading ---------------------------------------------------------------
+
+    def view(self) -> _View:
+        """Open a consistent read view; close it (or use `with`) when done."""
+        with self._locked(exclusive=False):
+            return _View(self.snapshot_path, self.log_path)
+
+    def end(self) -> int:
+        """Position just past the last stored entry."""
+        with self.view() as v:
+            return v.end
+
+    def iter_records(self, position: int = HEADER_SIZE) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Stream (position, entry) pairs in insertion order, starting at `position`."""
+        with self.view() as v:
+            yield from v.iter_from(position)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Stream every entry in insertion order."""
+        for _, entry in self.iter_records():
+            yield entry
+
+    # -- writing ---------------------------------------------------------------
+
+    def _log_handle(self):
+        """Open (or re-open after another process compacted) the log for appending."""
+        self._ensure_log()
+        ino = os.stat(self.log_path).st_ino
+        if self._handle is None or self._handle_ino != ino:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = self.log_path.open("a+b")
+            self._handle_ino = os.fstat(self._handle.fileno()).st_ino
+        return self._handle
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append one entry; fsyncs are batched by count and time."""
+        with self._locked(exclusive=True):
+            handle = self._log_handle()
+            fd = handle.fileno()
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                # Drop a torn line left behind by a writer that crashed mid-append.
+                with self.log_path.open("rb") as f:
+                    handle.truncate(_complete_end(f, 0, size))
+            line = _dumps(entry)
+            handle.write(line)
+            handle.flush()
+            add_bytes("score_store.append", "write", len(line))
+            self._unsynced += 1
+            now = time.monotonic()
+            if self._unsynced >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                os.fsync(handle.fileno())
+                self._unsynced = 0
+                self._last_sync = now
+            if handle.tell() >= self.compact_bytes:
+                self._compact_unlocked()
+
+    def sync(self) -> None:
+        """Force buffered appends to disk."""
+        with self._mutex:
+            if self._handle is not None and self._unsynced:
+                os.fsync(self._handle.fileno())
+                self._unsynced = 0
+                self._last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """Fold the log into the snapshot."""
+        with self._locked(exclusive=True):
+            self._compact_unlocked()
+
+    def _compact_unlocked(self) -> None:
+        with _View(self.snapshot_path, self.log_path) as v, self.snapshot_path.open("r+b") as snap:
+            log_id = _read_header(v.log).get("id", "")
+            v.log.seek(v.log_start)
+            body = v.log.read(v.log_end - v.log_start)
+            snap.truncate(v.body_end)
+            snap.seek(v.body_end)
+            snap.write(body)
+            snap.flush()
+            os.fsync(snap.fileno())
+            snap.seek(0)
+            snap.write(_snapshot_header(v.store_id, v.body_end + len(body), log_id))
+            snap.flush()
+            os.fsync(snap.fileno())
+        # A crash here is safe: readers ignore a log whose id is marked as folded.
+        self._new_log(v.body_end + len(body))
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Flush and release the log handle."""
+        with self._mutex:
+            self.sync()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+_stores: Dict[Path, ScoreStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(legacy_path: Path, **kwargs) -> ScoreStore:
+    """Return the process-wide ScoreStore for `legacy_path`."""
+    key = Path(legacy_path).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ScoreStore(key, **kwargs)
+            _stores[key] = store
+        return store
+
+
+def read_entries(legacy_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every stored entry for `legacy_path` in insertion order, read-only.
+
+    Unlike open_store this never creates the snapshot, log or lock file: a
+    store that was never opened is read straight from the legacy JSON file,
+    and nothing is yielded when neither exists.
+    """
+    legacy_path = Path(legacy_path)
+    log_path, snapshot_path, lock_path = _store_paths(legacy_path)
+    if not (snapshot_path.exists() and log_path.exists()):
+        # Not migrated (or migration stopped before the first log, when the
+        # snapshot still holds exactly the legacy entries).
+        data = load_json(legacy_path) if legacy_path.exists() else []
+        if isinstance(data, list):
+            yield from (d for d in data if isinstance(d, dict))
+        return
+    try:
+        lock_fd = os.open(lock_path, os.O_RDONLY)
+    except FileNotFoundError:
+        lock_fd = None
+    try:
+        if lock_fd is not None and fcntl is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_SH)
+        view = _View(snapshot_path, log_path)
+    finally:
+        if lock_fd is not None:
+            os.close(lock_fd)  # also releases the shared lock
+    with view:
+        for _, entry in view.iter_from(HEADER_SIZE):
+            yield entry
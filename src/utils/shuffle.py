@@ -1,37 +1,76 @@
 """Option shuffler for quiz questions."""
 
 import random
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 
 
-def shuffle_options(options: List[str], correct_answer: str) -> Tuple[List[str], str]:
+def correct_index(options: Sequence[str], correct_answer: str) -> int:
+    """Index of the correct option for an answer given as a letter or as option text (-1 if unknown)."""
+    if isinstance(correct_answer, str) and len(correct_answer) == 1 and correct_answer.isalpha():
+        idx = ord(correct_answer.upper()) - ord("A")
+        return idx if 0 <= idx < len(options) else -1
+    try:
+        return list(options).index(correct_answer)
+    except ValueError:
+        return -1
+
+
+def shuffle_order(
+    options: Sequence[str], correct_answer: str, rng: random.Random = random
+) -> Tuple[Tuple[int, ...], int]:
+    """
+    Draw a random option order without copying the options.
+
+    `rng` defaults to the global random module; pass a seeded
+    random.Random for reproducible orders.
+
+    Returns:
+        (order, new_answer_index) where order[i] is the original index of
+        the option shown at position i. An answer that matches no option
+        maps to index 0.
+    """
+    order = list(range(len(options)))
+    rng.shuffle(order)
+    idx = correct_index(options, correct_answer)
+    return tuple(order), order.index(idx) if idx >= 0 else 0
+
+
+def shuffle_options(
+    options: List[str], correct_answer: str, rng: random.Random = random
+) -> Tuple[List[str], str]:
     """
     Shuffle options and return new answer letter.
 
     Args:
         options: List of option texts.
         correct_answer: Original answer (letter or text).
+        rng: Random source (the global random module by default).
 
     Returns:
         (shuffled_options, new_answer_letter)
     """
-    # Determine which option is correct (by index or text)
-    correct_text = None
-    if isinstance(correct_answer, str) and len(correct_answer) == 1 and correct_answer.isalpha():
-        idx = ord(correct_answer.upper()) - ord("A")
-        if 0 <= idx < len(options):
-            correct_text = options[idx]
-    else:
-        correct_text = correct_answer
+    order, new_idx = shuffle_order(options, correct_answer, rng)
+    shuffled = [options[i] for i in order]
+    new_answer_letter = chr(ord("A") + new_idx)
+    return shuffled, new_answer_letter
 
-    shuffled = list(options)
-    random.shuffle(shuffled)
 
-    # Find new position of correct answer
-    try:
-        new_idx = shuffled.index(correct_text)
-    except ValueError:
-        new_idx = 0
+def permutation_rank(order: Sequence[int]) -> int:
+    """Encode a permutation of range(n) as its lexicographic rank (Lehmer code)."""
+    rank = 0
+    remaining = sorted(order)
+    for value in order:
+        idx = remaining.index(value)
+        rank = rank * len(remaining) + idx
+        remaining.pop(idx)
+    return rank
 
-    new_answer_letter = chr(ord("A") + new_idx)
-    return shuffled, new_answer_letter
+
+def permutation_from_rank(rank: int, n: int) -> Tuple[int, ...]:
+    """Inverse of permutation_rank for a permutation of range(n)."""
+    digits = []
+    for base in range(1, n + 1):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+    remaining = list(range(n))
+    return tuple(remaining.pop(d) for d in reversed(digits))
@@ -1,39 +1,121 @@
 """Countdown timer for quiz questions."""
 
-import time
+import heapq
+import itertools
+import logging
+import math
 import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TimerService:
+    """
+    Shared scheduler for countdown expiry callbacks.
+
+    One daemon thread sleeps until the earliest deadline in a heap, so any
+    number of concurrent countdowns costs O(log n) per start/expiry and no
+    per-timer threads. Timers without a callback never touch the service:
+    their remaining time is computed from a monotonic deadline on demand.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, "CountdownTimer"]] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, timer: "CountdownTimer") -> None:
+        """Fire `timer.on_expire` once its current deadline passes."""
+        with self._cond:
+            entry = (timer.deadline, next(self._seq), timer.generation, timer)
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="timer-service", daemon=True)
+                self._thread.start()
+            if self._heap[0] is entry:
+                self._cond.notify()
+
+    def pending(self) -> int:
+        """Number of scheduled entries (including lazily cancelled ones)."""
+        with self._cond:
+            return len(self._heap)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                deadline = self._heap[0][0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                _, _, generation, timer = heapq.heappop(self._heap)
+            # Stopped or restarted timers are skipped (lazy cancellation).
+            if timer.running and timer.generation == generation:
+                timer.running = False
+                timer._frozen = 0.0
+                try:
+                    timer.on_expire()
+                except Exception:
+                    logger.exception("Timer callback failed")
+
+
+_service: Optional[TimerService] = None
+_service_lock = threading.Lock()
+
+
+def get_timer_service() -> TimerService:
+    """Return the process-wide timer service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TimerService()
+        return _service
 
 
 class CountdownTimer:
     """Simple countdown timer for per-question time limits."""
 
-    def __init__(self, seconds: int):
+    def __init__(self, seconds: int, on_expire: Optional[Callable[[], None]] = None):
         self.total = seconds
-        self.remaining = seconds
+        self.on_expire = on_expire
         self.running = False
-        self.thread = None
+        self.deadline = 0.0
+        self.generation = 0
+        self._frozen = float(seconds)
 
     def start(self):
         """Start the countdown timer."""
-        self.remaining = self.total
+        self.deadline = time.monotonic() + self.total
+        self.generation += 1
         self.running = True
-        self.thread = threading.Thread(target=self._countdown, daemon=True)
-        self.thread.start()
-
-    def _countdown(self):
-        """Countdown in background."""
-        while self.remaining > 0 and self.running:
-            time.sleep(1)
-            self.remaining -= 1
+        if self.on_expire is not None:
+            get_timer_service().schedule(self)
 
     def stop(self):
         """Stop the timer."""
+        if self.running:
+            self._frozen = self.remaining_seconds()
         self.running = False
 
+    def remaining_seconds(self) -> float:
+        """Remaining time with sub-second precision."""
+        if not self.running:
+            return self._frozen
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def remaining(self) -> int:
+        return self.get_remaining()
+
     def is_expired(self) -> bool:
         """Check if time is up."""
-        return self.remaining <= 0
+        return self.remaining_seconds() <= 0
 
     def get_remaining(self) -> int:
-        """Get remaining seconds."""
-        return max(0, self.remaining)
+        """Get remaining seconds (rounded up)."""
+        return math.ceil(self.remaining_seconds())
@@ -0,0 +1,58 @@
+"""Test for the IRT adaptive engine."""
+
+import gc
+import weakref
+import pytest
+from src.models.question_bank import QuestionBank
+from src.models.question_model import Question
+from src.runners.adaptive_engine import IRTAdaptiveEngine, ItemTable, item_table
+
+
+def _bank():
+    levels = ["easy", "medium", "hard"] * 20
+    return [
+        Question(id=str(i), text=f"Q{i}", options=["a", "b"], answer="A", difficulty=d)
+        for i, d in enumerate(levels)
+    ]
+
+
+def test_selection_follows_ability():
+    engine = IRTAdaptiveEngine(ItemTable(_bank()), max_questions=8)
+    served = []
+    while True:
+        q = engine.next_question()
+        if q is None:
+            break
+        served.append(q)
+        engine.log_result({"is_correct": True, "difficulty": q.difficulty})
+
+    assert len(served) == 8
+    assert len({q.id for q in served}) == 8
+    assert served[0].difficulty == "medium"
+    assert served[-1].difficulty == "hard"
+    assert engine.theta > 1.0
+    assert engine.standard_error() < 1.0
+
+
+def test_wrong_answers_lower_ability():
+    engine = IRTAdaptiveEngine(ItemTable(_bank()), max_questions=5, prior_sd=2.0)
+    assert engine.standard_error() == pytest.approx(2.0)  # no answers yet: the prior's
+    for _ in range(5):
+        engine.next_question()
+        engine.log_result({"is_correct": False})
+    assert engine.theta < -1.0
+    assert engine.next_question() is None
+
+
+def test_item_tables_are_dropped_with_their_bank():
+    bank = QuestionBank(_bank())
+    table = item_table(bank, "")
+    assert item_table(bank, "") is table
+    ref = weakref.ref(bank)
+    del bank, table
+    gc.collect()
+    assert ref() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""Test for quiz analytics."""
+
+import pytest
+from src.utils import analytics
+from src.utils.analytics import QuizAnalytics, ColumnarAnalytics
+
+RESULTS = [
+    {"is_correct": True, "difficulty": "easy", "topic": "Math", "time_taken": 2.0},
+    {"is_correct": False, "difficulty": "hard", "topic": "Math", "time_taken": 4.0},
+    {"is_correct": True, "difficulty": "easy", "topic": "Geography"},
+    {"is_correct": False},
+]
+
+
+def test_columnar_matches_row_analytics():
+    rows = QuizAnalytics(RESULTS)
+    cols = ColumnarAnalytics(iter(RESULTS))
+    assert cols.correct_count() == rows.correct_count() == 2
+    assert cols.percentage_score() == rows.percentage_score() == 50.0
+    assert cols.average_time_per_question() == rows.average_time_per_question() == 3.0
+    assert cols.difficulty_breakdown() == rows.difficulty_breakdown()
+    assert cols.summary() == rows.summary()
+    assert cols.topic_breakdown()["Math"] == {"correct": 1, "total": 2}
+    assert cols.topic_breakdown()["Unknown"] == {"correct": 0, "total": 1}
+
+
+def test_empty_results():
+    cols = ColumnarAnalytics([])
+    assert cols.percentage_score() == 0.0
+    assert cols.average_time_per_question() == 0.0
+    assert cols.difficulty_breakdown() == {}
+
+
+def test_correct_count_sees_in_place_edits():
+    results = [dict(r) for r in RESULTS]
+    stats = QuizAnalytics(results)
+    assert stats.correct_count() == 2
+    results[1]["is_correct"] = True
+    assert stats.correct_count() == 3
+    assert stats.summary().startswith("Score: 3/4 (75.0%)")
+
+
+def _metrics(cols):
+    return (
+        cols.correct_count(), cols.incorrect_count(), cols.percentage_score(), cols.average_time_per_question(),
+        cols.difficulty_breakdown(), cols.topic_breakdown(), cols.summary(),
+    )
+
+
+@pytest.mark.parametrize("results", [RESULTS, [], [{"is_correct": True, "time_taken": None}]])
+def test_numpy_and_pure_python_columns_agree(results, monkeypatch):
+    pytest.importorskip("numpy")
+    vectorized = ColumnarAnalytics(results)
+    assert vectorized._np is not None
+    monkeypatch.setattr(analytics, "_numpy", lambda: None)
+    fallback = ColumnarAnalytics(results)
+    assert fallback._np is None
+    assert _metrics(vectorized) == _metrics(fallback)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,44 @@
+"""Test for the benchmark harness."""
+
+import json
+import pytest
+from benchmarks.data import write_leaderboard, write_question_bank
+from benchmarks.models import memory_per_question
+from benchmarks.run import compare, results_document, run_suite
+from src.utils.leaderboard_handler import LeaderboardHandler
+from src.utils.question_cache import get_bank
+
+
+def test_synthetic_data(tmp_path):
+    bank = get_bank(write_question_bank(tmp_path / "questions.json", 50))
+    assert len(bank) == 50 and bank.categories()
+    handler = LeaderboardHandler(write_leaderboard(tmp_path / "lb" / "leaderboard.json", 40, users=4))
+    assert len(handler.get_leaderboard(100)) == 40
+    assert sum(handler.get_user_stats(f"user{i:06d}")["count"] for i in range(4)) == 40
+
+
+def test_suite_and_compare(tmp_path):
+    scale = {"questions": [100], "leaderboard": [100], "results": [100]}
+    measurements = run_suite(scale, tmp_path, repeat=1, only=["quiz.", "leaderboard.get"], max_number=2)
+    assert {m.name for m in measurements} == {
+        "quiz.create_by_topic", "quiz.shuffle_options", "leaderboard.get_leaderboard", "leaderboard.get_user_history"}
+    doc = json.loads(json.dumps(results_document(measurements, "test", 1)))
+
+    slower = json.loads(json.dumps(doc))
+    for r in slower["results"]:
+        r["median"] *= 2
+    assert {row["status"] for row in compare(slower, doc)} == {"regression"}
+    assert {row["status"] for row in compare(doc, slower)} == {"improvement"}
+    assert {row["status"] for row in compare(doc, doc)} == {"ok"}
+
+
+def test_model_benchmarks(tmp_path):
+    path = write_question_bank(tmp_path / "questions-100.json", 100)
+    assert 100 < memory_per_question(path) < 10_000
+    measurements = run_suite({"questions": [100]}, tmp_path, repeat=1, only=["models."], max_number=2)
+    assert {m.name for m in measurements} == {
+        "models.question_from_dict", "models.question_to_dict", "models.quiz_to_dict"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+"""Test for item analysis."""
+
+import json
+import pytest
+from src.storage.json_backend import JsonQuestionRepository
+from src.storage.sqlite_backend import open_sqlite_storage
+from src.utils.item_stats import ItemStatistics, apply_calibration, record_answers
+
+
+def _attempt(path, answers):
+    record_answers([{"question_id": q, "is_correct": ok, "time_taken": 2.0} for q, ok in answers], path=path)
+
+
+def test_streaming_item_statistics(tmp_path):
+    log = tmp_path / "answers.jsonl"
+    # Strong students get q2 right, weak students get it wrong; everybody gets q1 right.
+    for _ in range(3):
+        _attempt(log, [("q1", True), ("q2", True), ("q3", True)])
+        _attempt(log, [("q1", True), ("q2", False), ("q3", False)])
+
+    stats = ItemStatistics()
+    assert stats.update_from_log(log) == 6
+    assert stats.stats("q1")["p_value"] == 1.0
+    assert stats.stats("q2")["p_value"] == 0.5
+    assert stats.stats("q2")["discrimination"] == pytest.approx(1.0)
+    assert stats.stats("q1")["discrimination"] == 0.0
+    assert stats.stats("q3")["avg_time"] == 2.0
+
+    # Incremental: only new attempts are consumed
+    _attempt(log, [("q1", False), ("q2", False), ("q3", False)])
+    restored = ItemStatistics.from_state(json.loads(json.dumps(stats.to_state())))
+    assert restored.update_from_log(log) == 1
+    assert restored.stats("q1")["responses"] == 7
+
+
+def test_partial_attempt_is_left_for_the_next_update(tmp_path):
+    log = tmp_path / "answers.jsonl"
+    _attempt(log, [("q1", True), ("q2", False)])
+    _attempt(log, [("q1", False), ("q2", True), ("q3", True)])
+    complete = log.read_bytes()
+    cut = complete.rindex(b"\n", 0, len(complete) - 1) + 1
+    log.write_bytes(complete[:cut])  # the last record of the second attempt is not written yet
+
+    stats = ItemStatistics()
+    assert stats.update_from_log(log) == 1
+    assert stats.stats("q1")["responses"] == 1
+    log.write_bytes(complete)
+    assert stats.update_from_log(log) == 1
+    assert stats.stats("q1")["responses"] == 2
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_apply_calibration(tmp_path, backend):
+    questions = tmp_path / "questions.json"
+    questions.write_text(json.dumps([
+        {"id": "q1", "text": "Q1", "options": ["a"], "answer": "A", "difficulty": "hard"},
+        {"id": "q2", "text": "Q2", "options": ["a"], "answer": "A", "difficulty": "hard"},
+    ]), encoding="utf-8")
+    if backend == "json":
+        repository = JsonQuestionRepository(questions)
+    else:
+        repository = open_sqlite_storage(tmp_path / "quiz.db", questions, tmp_path / "leaderboard.json").questions
+    stats = ItemStatistics()
+    stats.update([{"attempt_id": str(i), "question_id": "q1", "is_correct": True} for i in range(5)])
+
+    assert apply_calibration(stats, repository, min_responses=5) == 1
+    bank = repository.load_bank()
+    assert bank.get("q1").difficulty == "easy"
+    assert bank.get("q2").difficulty == "hard"
+    if backend == "json":
+        data = json.loads(questions.read_text(encoding="utf-8"))
+        assert data[0]["authored_difficulty"] == "hard" and data[0]["p_value"] == 1.0
+    else:
+        row = repository.conn.execute("SELECT authored_difficulty, p_value FROM questions WHERE id = 'q1'").fetchone()
+        assert tuple(row) == ("hard", 1.0)
+    assert apply_calibration(stats, repository, min_responses=5) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
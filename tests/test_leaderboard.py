@@ -0,0 +1,119 @@
+"""Test for leaderboard handling."""
+
+import json
+import pytest
+from src.utils.leaderboard_handler import LeaderboardHandler
+from src.utils.score_store import ScoreStore
+
+
+def test_migrates_legacy_json(tmp_path):
+    legacy = tmp_path / "leaderboard.json"
+    legacy.write_text(json.dumps([
+        {"username": "Alice", "quiz_title": "Q", "score": 1, "total": 2, "percentage": 50.0},
+    ]), encoding="utf-8")
+    lb = LeaderboardHandler(legacy)
+    lb.add_score("Bob", "Q", 2, 2)
+    assert [e["username"] for e in lb.get_leaderboard(10)] == ["Bob", "Alice"]
+    assert len(lb.get_user_history("Alice")) == 1
+
+
+def test_compaction_keeps_entries(tmp_path):
+    store = ScoreStore(tmp_path / "leaderboard.json", compact_bytes=256)
+    for i in range(20):
+        store.append({"username": f"u{i}", "percentage": float(i)})
+    assert [e["username"] for e in store.iter_entries()] == [f"u{i}" for i in range(20)]
+    assert store.log_path.stat().st_size < 256
+
+    other = ScoreStore(tmp_path / "leaderboard.json")
+    other.append({"username": "late", "percentage": 0.0})
+    store.append({"username": "later", "percentage": 0.0})
+    assert [e["username"] for e in store.iter_entries()][-2:] == ["late", "later"]
+
+
+def test_top_k_index_survives_restart(tmp_path):
+    from src.utils.leaderboard_index import LeaderboardIndex
+
+    store = ScoreStore(tmp_path / "leaderboard.json", compact_bytes=512)
+    index = LeaderboardIndex(store, top_k=3)
+    for i, pct in enumerate([50, 90, 70, 90, 10, 80]):
+        store.append({"username": f"u{i}", "percentage": pct})
+    index.refresh()
+    assert [e["username"] for e in index.top(3)] == ["u1", "u3", "u5"]
+    index.save()
+
+    store.append({"username": "u6", "percentage": 95})
+    reopened = LeaderboardIndex(store, top_k=3)
+    assert reopened.count == 6
+    reopened.refresh()
+    assert [e["username"] for e in reopened.top(2)] == ["u6", "u1"]
+
+
+def test_user_history_index(tmp_path):
+    lb = LeaderboardHandler(tmp_path / "leaderboard.json")
+    for score in [1, 4, 2]:
+        lb.add_score("Alice", "Quiz", score, 4)
+        lb.add_score("Bob", "Quiz", 0, 4)
+    lb.store.compact()
+    lb.add_score("Alice", "Final", 3, 4)
+
+    assert [h["score"] for h in lb.get_user_history("Alice")] == [1, 4, 2, 3]
+    assert [h["score"] for h in lb.get_user_history("Alice", offset=1, limit=2)] == [4, 2]
+    stats = lb.get_user_stats("Alice")
+    assert stats["count"] == 4
+    assert stats["mean_percentage"] == pytest.approx(62.5)
+    assert stats["best_score"] == 4
+    assert lb.get_user_stats("Nobody")["count"] == 0
+
+
+def test_positions_sidecar_survives_restart(tmp_path):
+    import json
+    from src.utils.leaderboard_index import LeaderboardIndex
+
+    lb = LeaderboardHandler(tmp_path / "leaderboard.json")
+    for score in [1, 4, 2]:
+        lb.add_score("Alice", "Quiz", score, 4)
+        lb.add_score("Bob", "Quiz", 0, 4)
+    lb.index.save()
+    saved = json.loads(lb.index.path.read_text(encoding="utf-8"))
+    assert saved["users"]["Alice"] == [3, 175.0, 100.0, 4] and saved["positions"] == 6
+    assert lb.index.positions_path.stat().st_size == 6 * 16
+
+    def history(index, user):
+        with lb.store.view() as view:
+            return [view.read_at(p)["score"] for p in index.user_positions(user)]
+
+    lb.store.append({"username": "Alice", "quiz_title": "Final", "score": 3, "total": 4, "percentage": 75.0})
+    reopened = LeaderboardIndex(lb.store)
+    reopened.refresh()
+    assert reopened.user_stats("Alice")["count"] == 4
+    assert history(reopened, "Alice") == [1, 4, 2, 3]
+    assert len(reopened.user_positions("Bob", offset=1)) == 2
+
+    # Saves only append the new pairs
+    reopened.save()
+    assert reopened.positions_path.stat().st_size == 7 * 16
+
+    # A lost sidecar is rebuilt from the store
+    reopened.positions_path.unlink()
+    again = LeaderboardIndex(lb.store)
+    assert history(again, "Alice") == [1, 4, 2, 3]
+    assert again.user_stats("Bob")["count"] == 3
+
+
+def test_aggregates_are_maintained(tmp_path):
+    lb = LeaderboardHandler(tmp_path / "leaderboard.json")
+    lb.add_score("Alice", "Math Quiz", 4, 5, category="Math")
+    lb.add_score("Bob", "Math Quiz", 1, 5, category="Math")
+    lb.add_score("Bob", "Hard Quiz", 5, 5, difficulty="hard")
+
+    aggregates = lb.get_aggregates()
+    assert aggregates.overall.count == 3
+    math = aggregates.groups["topic"]["Math"].to_dict()
+    assert math["count"] == 2
+    assert math["pass_rate"] == 50.0
+    assert aggregates.groups["user"]["Bob"].to_dict()["mean_percentage"] == 60.0
+    assert [r["key"] for r in aggregates.table("quiz", sort_by="count")] == ["Math Quiz", "Hard Quiz"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""Test for the headless Streamlit load test."""
+
+import json
+import subprocess
+import sys
+import pytest
+from benchmarks import load_test
+from benchmarks.load_test import FlowError, Session
+
+SCRIPT = '''
+import streamlit as st
+if "page" not in st.session_state:
+    st.session_state.page = "home"
+name = st.text_input("Name:", key="name")
+if st.session_state.page == "home":
+    if name and st.button("Go", key="go"):
+        st.session_state.page = "quiz"
+        st.rerun()
+else:
+    st.session_state.answer = st.radio("Answer:", ["A", "B"], key="q0")
+'''
+
+
+@pytest.fixture
+def fake_streamlit(monkeypatch):
+    monkeypatch.setitem(sys.modules, "streamlit", load_test._FakeStreamlit())
+
+
+def test_session_replays_widgets_and_reruns(fake_streamlit):
+    session = Session(1, compile(SCRIPT, "script.py", "exec"))
+    session.interact("open")
+    with pytest.raises(FlowError):
+        session.interact("go", click="go")  # not rendered without a name
+
+    session.interact("go", click="go", name="Ada")
+    session.interact("answer", q0="B")
+    assert session.state.page == "quiz"
+    assert session.state.answer == "B"
+    assert [(r.step, r.reruns) for r in session.records] == [("open", 0), ("go", 1), ("answer", 0)]
+
+
+def test_load_test_report(tmp_path):
+    pytest.importorskip("pandas")
+    pytest.importorskip("plotly")
+    out = tmp_path / "load.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.load_test", "--sessions", "3", "--memory-sessions", "1",
+         "--out", str(out)],
+        cwd=load_test.ROOT, check=True, capture_output=True,
+    )
+    report = json.loads(out.read_text())
+    steps = {row["step"]: row for row in report["steps"]}
+    assert steps["answer"]["count"] == 15
+    assert steps["answer"]["writes"] > 0  # answer log and results on the last question
+    assert report["memory"]["retained_bytes"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,73 @@
+"""Test for the hot-path instrumentation."""
+
+import urllib.request
+import pytest
+from src.utils import metrics
+from src.utils.file_handler import load_json, save_json
+
+
+@pytest.fixture
+def collecting():
+    was = metrics.enabled()
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.enable(was)
+    metrics.reset()
+
+
+def test_disabled_records_nothing():
+    was = metrics.enabled()
+    metrics.enable(False)
+    try:
+        metrics.reset()
+        with metrics.timer("block"):
+            pass
+        metrics.timed("fn")(lambda: None)()
+        metrics.add_bytes("fn", "read", 10)
+        assert metrics.snapshot() == []
+    finally:
+        metrics.enable(was)
+
+
+def test_timers_bytes_and_prometheus(collecting, tmp_path):
+    path = tmp_path / "data.json"
+    save_json(path, {"a": [1, 2, 3]})
+    assert load_json(path) == {"a": [1, 2, 3]}
+    with metrics.timer("block"):
+        pass
+
+    rows = {r["op"]: r for r in metrics.snapshot()}
+    size = path.stat().st_size
+    assert rows["file.save_json"]["count"] == 1 and rows["file.save_json"]["bytes_written"] == size
+    assert rows["file.load_json"]["bytes_read"] == size
+    assert rows["block"]["count"] == 1
+
+    text = metrics.render_prometheus()
+    assert 'quiz_operation_duration_seconds_bucket{op="block",le="+Inf"} 1' in text
+    assert 'quiz_operation_duration_seconds_count{op="file.load_json"} 1' in text
+    assert f'quiz_io_bytes_total{{op="file.save_json",direction="write"}} {size}' in text
+
+
+def test_histogram_quantiles():
+    h = metrics.Histogram()
+    for seconds in [0.0001] * 90 + [0.2] * 10:
+        h.observe(seconds)
+    assert h.quantile(0.5) <= 0.0005
+    assert 0.1 < h.quantile(0.99) <= 0.25
+
+
+def test_metrics_endpoint(collecting):
+    metrics.observe("op", 0.01)
+    metrics.start_server(port=0)
+    try:
+        with urllib.request.urlopen(metrics.server_url(), timeout=5) as response:
+            body = response.read().decode()
+        assert 'quiz_operation_duration_seconds_count{op="op"} 1' in body
+    finally:
+        metrics.stop_server()
+    assert metrics.server_url() == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -20,5 +20,43 @@ def test_export_quiz_as_pdf():
         assert Path(path).exists()
 
 
+def test_output_dir_created_on_first_export(tmp_path):
+    exporter = PDFExporter(tmp_path / "pdfs")
+    assert not exporter.output_dir.exists()
+    path = exporter.export_quiz_as_pdf("Test Quiz", [{"text": "Q1", "answer": "A"}])
+    assert Path(path).parent == tmp_path / "pdfs"
+
+
+def _check_pdf(path):
+    data = Path(path).read_bytes()
+    assert data.startswith(b"%PDF-1.4")
+    assert data.rstrip().endswith(b"%%EOF")
+    # startxref points at the cross-reference table
+    xref = int(data.rsplit(b"startxref", 1)[1].split()[0])
+    assert data[xref:xref + 4] == b"xref"
+    return data
+
+
+def test_long_quiz_spans_pages(tmp_path):
+    exporter = PDFExporter(tmp_path)
+    questions = [
+        {"text": f"Question {i} (with parentheses) " * 4, "options": ["a", "b", "c", "d"], "answer": "A"}
+        for i in range(200)
+    ]
+    data = _check_pdf(exporter.export_quiz_as_pdf("Long Quiz", questions))
+    assert data.count(b"/Type /Page ") > 20
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_background_results_export(tmp_path):
+    exporter = PDFExporter(tmp_path)
+    results = [{"index": 1, "question": "2+2?", "chosen_letter": "B", "chosen_text": "4",
+                "correct_letter": "B", "is_correct": True, "time_taken": 1.5}]
+    future = exporter.submit_results_export("My Quiz", results)
+    assert future.result(timeout=10) == str(tmp_path / "My_Quiz_report.pdf")
+    _check_pdf(future.result())
+    assert len(exporter.export_many([("A", []), ("B", [])])) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
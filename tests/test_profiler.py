@@ -0,0 +1,57 @@
+"""Test for the per-rerun profiler."""
+
+import time
+import pytest
+from src.utils import profiler
+
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler, "PROFILE_RERUNS", True)
+    monkeypatch.setattr(profiler, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(profiler, "PROFILE_INTERVAL", 0.0005)
+    return tmp_path
+
+
+def _busy_render(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _rerun(state, seconds=0.05):
+    """Stands in for one run of app.py."""
+    capture = profiler.start_rerun(state)
+    _busy_render(seconds)
+    return profiler.finish_rerun(capture, state)
+
+
+def test_disabled_by_default(tmp_path):
+    state = {}
+    assert profiler.start_rerun(state) is None
+    assert state == {}
+
+
+def test_captures_are_tagged_and_merged(profiling):
+    state = {"current_page": "🏠 Home", "home_username": ""}
+    first = _rerun(state)
+    state["home_username"] = "Ada"  # typed in the browser
+    second = _rerun(state)
+    state["next_btn"], state["current_page"] = True, "🎮 Run Quiz"
+    _rerun(state)
+
+    lines = first.read_text().splitlines()
+    assert lines and all(line.startswith("page:Home;trigger:load;_rerun (tests/test_profiler.py") for line in lines)
+    assert any("_busy_render" in line for line in lines)
+    assert second.read_text().startswith("page:Home;trigger:home_username;")
+
+    files = sorted(profiling.glob("*.folded"))
+    assert len(files) == 3
+    merged = profiler.merge(files, page="Run Quiz", group_by="none")
+    assert merged and all(stack.startswith("_rerun") for stack in merged)
+    assert sum(profiler.merge(files, group_by="page").values()) == sum(profiler.merge(files).values())
+    assert "_busy_render" in profiler.self_time(merged)[0][0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,91 @@
+"""Test for the indexed question bank."""
+
+import json
+import random
+import threading
+import pytest
+from src.models.question_model import Question
+from src.models.question_bank import QuestionBank
+from src.models.lazy_question_bank import LazyQuestionBank, scan_json_array
+
+
+def _bank():
+    return QuestionBank([
+        Question(id="1", text="Q1", options=["a", "b"], answer="A", topic="Math", difficulty="easy"),
+        Question(id="2", text="Q2", options=["a", "b"], answer="A", topic="math", difficulty="hard"),
+        Question(id="3", text="Q3", options=["a", "b"], answer="A", topic="Science", difficulty="easy"),
+        Question(id="4", text="Q4", options=["a", "b"], answer="A", topic="", difficulty="easy"),
+    ])
+
+
+def test_lookups():
+    bank = _bank()
+    assert [q.id for q in bank.by_topic("MATH")] == ["1", "2"]
+    assert [q.id for q in bank.by_difficulty("Easy")] == ["1", "3", "4"]
+    assert [q.id for q in bank.select("math", "hard")] == ["2"]
+    assert bank.by_topic("History") == ()
+
+
+def test_facets():
+    bank = _bank()
+    assert bank.categories() == ["Math", "Science", "math"]
+    assert bank.difficulties() == ["easy", "hard"]
+    assert bank.topic_counts()[""] == 1
+    assert bank.difficulty_counts() == {"easy": 3, "hard": 1}
+
+
+def test_lazy_bank_matches_eager(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps([q.to_dict() for q in _bank().questions] + [
+        {"id": "5", "text": "Café ✓", "options": ["é", "b"], "answer": "A", "topic": "Math"},
+    ], indent=2, ensure_ascii=False), encoding="utf-8")
+
+    # Tiny chunks force objects and multi-byte characters across reads
+    assert [obj["id"] for _, _, obj in scan_json_array(path, chunk_size=7)] == ["1", "2", "3", "4", "5"]
+
+    bank = LazyQuestionBank(path)
+    assert len(bank) == 5
+    assert [q.id for q in bank.by_topic("MATH")] == ["1", "2", "5"]
+    assert [q.id for q in bank.select("math", "hard")] == ["2"]
+    assert len(bank.by_topic("History")) == 0
+    assert bank.categories() == ["Math", "Science", "math"]
+    assert bank.difficulty_counts() == {"easy": 3, "hard": 1, "medium": 1}
+    assert bank.questions[4].text == "Café ✓"
+    assert len(random.sample(bank.by_difficulty("easy"), 2)) == 2
+
+
+def test_lazy_bank_rejects_non_objects(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps([_bank().questions[0].to_dict(), "not a question"]), encoding="utf-8")
+    with pytest.raises(ValueError, match="element 2"):
+        LazyQuestionBank(path)
+
+
+def test_lazy_bank_cache_is_thread_safe(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps([
+        {"id": str(i), "text": f"Q{i}", "options": ["a", "b"], "answer": "A"} for i in range(200)
+    ]), encoding="utf-8")
+    bank = LazyQuestionBank(path, cache_size=16)
+    errors = []
+
+    def read(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(500):
+                row = rng.randrange(len(bank))
+                assert bank.question(row).id == str(row)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(bank._cache) <= 16
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,49 @@
+"""Test for the shared question cache."""
+
+import json
+import os
+import pytest
+from src.models.lazy_question_bank import LazyQuestionBank
+from src.utils import question_cache
+from src.utils.question_cache import get_bank, get_questions, cache_stats, clear_cache
+
+
+def _write(path, questions):
+    path.write_text(json.dumps(questions), encoding="utf-8")
+
+
+def test_cache_hit_and_reload(tmp_path):
+    clear_cache()
+    path = tmp_path / "questions.json"
+    _write(path, [{"id": "1", "text": "Q1", "options": ["a", "b"], "answer": "A"}])
+
+    first = get_questions(path)
+    second = get_questions(path)
+    assert first is second
+    assert cache_stats().misses == 1
+    assert cache_stats().hits == 1
+
+    _write(path, [
+        {"id": "1", "text": "Q1", "options": ["a", "b"], "answer": "A"},
+        {"id": "2", "text": "Q2", "options": ["a", "b"], "answer": "B"},
+    ])
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    third = get_questions(path)
+    assert len(third) == 2
+    assert cache_stats().reloads == 1
+
+
+def test_large_files_load_lazily(tmp_path, monkeypatch):
+    clear_cache()
+    monkeypatch.setattr(question_cache, "LAZY_BANK_BYTES", 0)
+    path = tmp_path / "questions.json"
+    _write(path, [{"id": "1", "text": "Q1", "options": ["a", "b"], "answer": "A", "topic": "Math"}])
+
+    bank = get_bank(path)
+    assert isinstance(bank, LazyQuestionBank)
+    assert bank.by_topic("math")[0].text == "Q1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,66 @@
+"""Test for the question and quiz models."""
+
+import dataclasses
+import random
+import pytest
+from src.models.question_model import Question
+from src.models.quiz_model import Quiz
+from src.models.quiz_question import QuizQuestion
+
+
+def _item(**overrides):
+    item = {"id": "7", "text": "2+2?", "options": ["3", "4"], "answer": "B", "topic": "Math",
+            "difficulty": "easy", "explanation": "Two and two."}
+    item.update(overrides)
+    return item
+
+
+def test_options_are_stored_as_tuple():
+    q = Question(id="1", text="2+2?", options=["3", "4"], answer="B")
+    assert q.options == ("3", "4")
+    assert Question.from_dict(_item()).options == ("3", "4")
+    assert q.correct_text == "4"
+
+
+def test_question_is_frozen():
+    q = Question.from_dict(_item())
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        q.text = "changed"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        q.options = ("a", "b")
+
+
+def test_dict_round_trip():
+    q = Question.from_dict(_item())
+    assert q.to_dict() == _item()
+    assert Question.from_dict(q.to_dict()) == q
+
+    quiz = Quiz(id="q1", title="Math", questions=[q], category="Math", difficulty="easy", seed="s")
+    loaded = Quiz.from_dict(quiz.to_dict())
+    assert loaded == quiz
+    assert loaded.to_dict() == quiz.to_dict()
+
+
+def test_labels_are_interned():
+    # Labels built at run time (as json.loads does) are separate objects until interned
+    a = Question.from_dict(_item(topic="".join(["Ma", "th"]), difficulty="".join(["ea", "sy"])))
+    b = Question.from_dict(_item(topic="".join(["Ma", "th"]), difficulty="".join(["ea", "sy"])))
+    assert a.topic is b.topic and a.difficulty is b.difficulty
+
+    quiz = Quiz.from_dict({"title": "Math", "questions": [_item(topic="".join(["Ma", "th"])) for _ in range(2)]})
+    assert quiz.questions[0].topic is quiz.questions[1].topic
+
+
+def test_unresolvable_answer_grades_the_same_in_views():
+    q = Question(id="1", text="Q?", options=["a", "b", "c"], answer="nope")
+    views = [QuizQuestion.shuffled(q, random.Random(1)), QuizQuestion.from_rank(q, 3)]
+    for view in views:
+        assert view.answer_index == -1 and view.correct_letter == ""
+        for response in ["A", "b", "nope", ""]:
+            assert view.grade(response)[0] == q.grade(response)[0]
+        assert view.grade("nope")[0] is True
+        assert view.to_dict()["answer"] == "nope"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,8 +1,12 @@
 """Test for quiz creator."""
 
+import random
 import pytest
 from pathlib import Path
+from src.config import QUESTIONS_FILE
 from src.creators.quiz_creator import QuizCreator
+from src.quiz_generator import generate_quiz
+from src.quiz_loader import load_questions
 
 
 def test_load_questions():
@@ -31,5 +35,33 @@ def test_create_quiz_by_topic_not_found():
         creator.create_quiz_by_topic("Test", "NonexistentTopic", count=1)
 
 
+def test_shuffled_questions_share_bank_question():
+    creator = QuizCreator()
+    quiz = creator.create_quiz_by_topic("Test Quiz", "Math", count=1)
+    view = quiz.questions[0]
+    original = next(q for q in creator.questions if q.id == view.id)
+    assert view.question is original
+    assert sorted(view.options) == sorted(original.options)
+    correct = original.options[ord(original.answer) - ord("A")]
+    assert view.options[ord(view.answer) - ord("A")] == correct
+    assert view.to_dict()["answer"] == view.answer
+
+
+def test_seeded_quizzes_are_reproducible():
+    creator = QuizCreator()
+    first = creator.create_quiz_by_difficulty("A", "easy", count=5, seed="exam-1")
+    second = creator.create_quiz_by_difficulty("B", "easy", count=5, seed="exam-1")
+    assert [(q.id, q.order) for q in first.questions] == [(q.id, q.order) for q in second.questions]
+    assert first.seed == "exam-1"
+    assert creator.create_quiz_by_topic("C", "Math", count=1).seed  # defaults to the quiz id
+
+
+def test_legacy_generator_shares_the_core():
+    creator = QuizCreator()
+    legacy = generate_quiz(load_questions(QUESTIONS_FILE), count=3, topic="math", rng=random.Random("s"))
+    quiz = creator.create_quiz_by_topic("Test", "Math", count=3, seed="s")
+    assert [(q.question, q.order) for q in legacy] == [(q.question, q.order) for q in quiz.questions]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
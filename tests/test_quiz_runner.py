@@ -2,6 +2,7 @@
 
 import pytest
 from src.creators.quiz_creator import QuizCreator
+from src.models.question_model import Question
 from src.runners.quiz_runner import QuizRunner
 
 
@@ -29,5 +30,18 @@ def test_validate_answer():
     assert is_correct is False
 
 
+def test_validate_text_answers():
+    runner = QuizRunner(QuizCreator().create_quiz_by_topic("Test", "Math", count=1))
+    by_text = Question("1", "Capital of France?", ["Rome", "Paris"], "Paris")
+    assert runner._validate_answer("B", by_text) == (True, "Paris")
+    assert runner._validate_answer("paris", by_text) == (False, "")
+    assert runner._validate_answer("Paris", by_text) == (True, "Paris")
+    assert by_text.correct_letter == "B"
+
+    free_text = Question("2", "Spell 4", [], "four")
+    assert free_text.grade("four") == (True, -1)
+    assert free_text.correct_letter == "" and free_text.correct_text == "four"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
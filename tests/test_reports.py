@@ -0,0 +1,95 @@
+"""Test for batch report generation."""
+
+import pytest
+from src.storage.sqlite_backend import open_sqlite_storage
+from src.utils.leaderboard_handler import LeaderboardHandler
+from src.utils.reports import ReportBuilder, build_reports, iter_csv_chunks, user_report_path
+from src.utils.results_sink import ResultsSink
+
+HEADER = "timestamp,index,question,chosen_letter,chosen_text,correct_letter,correct_text,is_correct\n"
+
+
+def test_csv_chunks_keep_quoted_newlines(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text(HEADER + '2025-01-01,1,"Line one\nline two",A,x,A,x,True\n2025-01-01,2,Q2,B,y,A,x,False\n')
+    rows = [r for _, chunk in iter_csv_chunks(path, chunk_size=8) for r in chunk]
+    assert [r["question"] for r in rows] == ["Line one\nline two", "Q2"]
+
+
+def test_incremental_reports(tmp_path):
+    results = tmp_path / "results.csv"
+    results.write_text(HEADER + "2025-01-01T10:00,1,Q1,A,x,A,x,True\n2025-01-01T10:00,2,Q2,B,y,A,x,False\n")
+    leaderboard = LeaderboardHandler(tmp_path / "leaderboard.json")
+    leaderboard.add_score("Alice", "Math", 2, 2)
+    leaderboard.add_score("Bob", "Math", 1, 2)
+    leaderboard.store.sync()
+    out = tmp_path / "reports"
+
+    run = build_reports(out, results, leaderboard, workers=2)
+    assert (run.results_rows, run.leaderboard_entries, run.users_rendered) == (2, 2, 3)
+    alice = user_report_path(out, "Alice").read_text(encoding="utf-8")
+    assert "| Math | 1 | 100.0 | 100.0 | 1 |" in alice
+    assert "Questions answered: 2 (1 correct)" in user_report_path(out, "Anonymous").read_text(encoding="utf-8")
+    assert "| Math | 2 | 75.0 |" in (out / "quizzes.md").read_text(encoding="utf-8")
+
+    # Only Bob has new results
+    leaderboard.add_score("Bob", "Math", 2, 2)
+    leaderboard.store.sync()
+    run = build_reports(out, results, leaderboard, workers=1)
+    assert (run.results_rows, run.leaderboard_entries, run.users_rendered) == (0, 1, 1)
+    assert "| Math | 2 | 75.0 | 100.0 |" in user_report_path(out, "Bob").read_text(encoding="utf-8")
+
+    full = build_reports(out, results, leaderboard, incremental=False, workers=1)
+    assert (full.leaderboard_entries, full.users_rendered) == (3, 3)
+
+
+def test_attempt_saved_to_both_sources_counts_once(tmp_path):
+    # A finished quiz is written to results.csv and saved to the leaderboard
+    sink = ResultsSink(tmp_path / "results.csv", columnar=False)
+    sink.write_attempt([{"index": 1, "is_correct": True}, {"index": 2, "is_correct": False}], "Alice", "Math")
+    sink.close()
+    leaderboard = LeaderboardHandler(tmp_path / "leaderboard.json")
+    leaderboard.add_score("Alice", "Math", 1, 2)
+    leaderboard.store.sync()
+
+    out = tmp_path / "reports"
+    build_reports(out, tmp_path / "results.csv", leaderboard, workers=1)
+    alice = user_report_path(out, "Alice").read_text(encoding="utf-8")
+    assert "- Attempts: 1" in alice
+    assert "Questions answered: 2 (1 correct)" in alice
+    assert "| Math | 1 | 50.0 |" in (out / "quizzes.md").read_text(encoding="utf-8")
+
+
+def test_reused_inode_is_read_as_a_new_segment(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text(HEADER + "2025-01-01T10:00,1,Q1,A,x,A,x,True\n2025-01-01T10:00,2,Q2,B,y,A,x,False\n")
+    builder = ReportBuilder()
+    assert builder.update_results(path) == 2
+
+    # A new file that happens to get the old segment's inode
+    (state,) = builder.results_segments.values()
+    path.unlink()
+    path.write_text(HEADER + "2025-01-02T10:00,1,Q3,A,x,A,x,True\n")
+    builder.results_segments = {str(path.stat().st_ino): state}
+    assert builder.update_results(path) == 1
+    assert builder.users["Anonymous"]["answered"] == 3
+    assert builder.update_results(path) == 0
+
+
+def test_reports_read_scores_from_sqlite(tmp_path):
+    storage = open_sqlite_storage(tmp_path / "quiz.db", tmp_path / "questions.json", tmp_path / "leaderboard.json")
+    storage.scores.add_score("Alice", "Math", 2, 2)
+    out = tmp_path / "reports"
+    assert build_reports(out, tmp_path / "results.csv", storage.scores, workers=1).leaderboard_entries == 1
+
+    storage.scores.add_score("Alice", "Math", 1, 2)
+    assert build_reports(out, tmp_path / "results.csv", storage.scores, workers=1).leaderboard_entries == 1
+    assert "| Math | 2 | 75.0 | 100.0 | 1 |" in user_report_path(out, "Alice").read_text(encoding="utf-8")
+
+    # State from another backend is rejected rather than silently misread
+    with pytest.raises(ValueError, match="--full"):
+        build_reports(out, tmp_path / "results.csv", LeaderboardHandler(tmp_path / "leaderboard.json"), workers=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
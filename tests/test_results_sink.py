@@ -0,0 +1,74 @@
+"""Test for the buffered results.csv sink."""
+
+import csv
+import pytest
+from src.utils.leaderboard_handler import LeaderboardHandler
+from src.utils.reports import build_reports, user_report_path
+from src.utils.results_sink import FIELDNAMES, ResultsSink, read_columns, segments
+
+V1_HEADER = "timestamp,index,question,chosen_letter,chosen_text,correct_letter,correct_text,is_correct\n"
+
+
+def _results(n, correct=True):
+    return [
+        {"index": i, "question": f"Q{i}", "chosen_letter": "A", "chosen_text": "x",
+         "correct_letter": "A", "is_correct": correct, "question_id": f"q{i}", "time_taken": 1.25}
+        for i in range(1, n + 1)
+    ]
+
+
+def test_batches_and_schema_rotation(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text(V1_HEADER + "2025-01-01T10:00,1,Old,A,x,A,x,True\n")
+    sink = ResultsSink(path, batch_rows=4, flush_interval=60)
+
+    sink.write_attempt(_results(2), "Alice", "Math")
+    assert path.read_text() == V1_HEADER + "2025-01-01T10:00,1,Old,A,x,A,x,True\n"  # still buffered
+
+    sink.write_attempt(_results(2), "Bob", "Math")  # reaches the batch size
+    old, active = segments(path)
+    assert old.read_text().startswith(V1_HEADER)
+    with active.open(newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0]) == FIELDNAMES
+    assert [(r["username"], r["question_id"], r["time_taken"]) for r in rows[::2]] == [
+        ("Alice", "q1", "1.25"), ("Bob", "q1", "1.25")]
+    sink.close()
+
+
+def test_size_rotation_is_read_by_reports(tmp_path):
+    path = tmp_path / "results.csv"
+    sink = ResultsSink(path, batch_rows=1, max_bytes=600)
+    for attempt in range(6):
+        sink.write_attempt(_results(2, correct=attempt % 2 == 0), "Alice", "Math", timestamp=f"2025-01-0{attempt + 1}")
+    sink.close()
+    assert len(segments(path)) > 1
+
+    out = tmp_path / "reports"
+    run = build_reports(out, path, LeaderboardHandler(tmp_path / "leaderboard.json"), workers=1)
+    assert run.results_rows == 12
+    assert "Questions answered: 12 (6 correct)" in user_report_path(out, "Alice").read_text(encoding="utf-8")
+
+    # Rotation between runs does not re-read old rows
+    sink = ResultsSink(path, batch_rows=1, max_bytes=600)
+    sink.write_attempt(_results(2), "Alice", "Math", timestamp="2025-01-07")
+    sink.close()
+    assert build_reports(out, path, LeaderboardHandler(tmp_path / "leaderboard.json"), workers=1).results_rows == 2
+
+
+def test_columnar_output(tmp_path):
+    path = tmp_path / "results.csv"
+    sink = ResultsSink(path, columnar=True, columnar_rows=3)
+    sink.write_attempt(_results(2), "Alice", "Math")
+    sink.write_attempt(_results(2, correct=False), "Bob", "History")
+    sink.close()
+
+    columns = read_columns(path)
+    assert columns["username"] == ["Alice", "Alice", "Bob", "Bob"]
+    assert list(columns["index"]) == [1, 2, 1, 2]
+    assert list(columns["is_correct"]) == [1, 1, 0, 0]
+    assert list(columns["time_taken"]) == [1.25] * 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
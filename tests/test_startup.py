@@ -0,0 +1,25 @@
+"""Test for cold-start time of the entry points."""
+
+import os
+import subprocess
+import sys
+import pytest
+from benchmarks import startup
+
+
+@pytest.mark.parametrize("entry", ["cli", "app"])
+def test_cold_start_within_budget(entry):
+    result = startup.measure(entry)
+    assert result.heavy_modules == []
+    assert result.within_budget, f"{entry} started in {result.seconds:.3f} s (budget {startup.BUDGETS[entry]} s)"
+
+
+def test_config_import_creates_no_directories(tmp_path):
+    data_dir = tmp_path / "data"
+    env = {**os.environ, "QUIZ_DATA_DIR": str(data_dir)}
+    subprocess.run([sys.executable, "-c", "import src.config"], cwd=startup.ROOT, env=env, check=True)
+    assert not data_dir.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
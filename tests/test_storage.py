@@ -0,0 +1,134 @@
+"""Test for the storage backends."""
+
+import json
+import sqlite3
+import pytest
+from src.creators.quiz_creator import QuizCreator
+from src.storage.json_backend import open_json_storage
+from src.storage.sqlite_backend import SQLiteQuestionRepository, SQLiteScoreRepository, open_sqlite_storage
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    questions_file = tmp_path / "questions.json"
+    questions_file.write_text(json.dumps([
+        {"id": "1", "text": "2+2?", "options": ["3", "4"], "answer": "B", "topic": "Math", "difficulty": "easy"},
+        {"id": "2", "text": "Capital of France?", "options": ["Paris", "Rome"], "answer": "A",
+         "topic": "Geography", "difficulty": "easy"},
+    ]), encoding="utf-8")
+    leaderboard_file = tmp_path / "leaderboard.json"
+    if request.param == "json":
+        return open_json_storage(questions_file, tmp_path / "quizzes", leaderboard_file)
+    return open_sqlite_storage(tmp_path / "quiz.db", questions_file, leaderboard_file)
+
+
+def test_round_trip(storage):
+    creator = QuizCreator(question_repository=storage.questions, quiz_repository=storage.quizzes)
+    assert creator.get_available_categories() == ["Geography", "Math"]
+
+    quiz = creator.create_quiz_by_topic("Math Quiz", "math", count=1)
+    creator.save_quiz(quiz)
+    assert storage.quizzes.load_quiz("Math_Quiz.json").title == "Math Quiz"
+
+    storage.scores.add_score("Alice", "Math Quiz", 1, 2)
+    storage.scores.add_score("Bob", "Math Quiz", 2, 2)
+    storage.scores.add_score("Alice", "Math Quiz", 2, 2)
+    assert [e["username"] for e in storage.scores.get_leaderboard(2)] == ["Bob", "Alice"]
+    assert [e["score"] for e in storage.scores.get_user_history("Alice", offset=1)] == [2]
+    stats = storage.scores.get_user_stats("Alice")
+    assert stats["count"] == 2
+    assert stats["mean_percentage"] == pytest.approx(75.0)
+    assert storage.scores.get_aggregates().groups["user"]["Alice"].count == 2
+
+
+def test_quizzes_are_stored_compactly(storage):
+    creator = QuizCreator(question_repository=storage.questions, quiz_repository=storage.quizzes)
+    quiz = creator.create_quiz_by_difficulty("Easy Quiz", "easy", count=2, seed="fixed")
+    creator.save_quiz(quiz)
+
+    loaded = storage.quizzes.load_quiz("Easy_Quiz.json")
+    assert loaded.seed == "fixed"
+    assert [q.to_dict() for q in loaded.questions] == [q.to_dict() for q in quiz.questions]
+    assert "items" in quiz.to_dict(compact=True)
+
+
+def test_sqlite_aggregates_reload_only_after_other_writers(tmp_path):
+    db = tmp_path / "quiz.db"
+    scores = SQLiteScoreRepository(db)
+    scores.add_score("Alice", "Math Quiz", 1, 2)
+    cached = scores._aggregates
+    scores.add_score("Bob", "Math Quiz", 2, 2)
+    assert scores._aggregates is cached  # our own commits update the cache in place
+    assert scores.get_aggregates().overall.count == 2
+
+    other = sqlite3.connect(str(db))
+    with other:
+        other.execute("UPDATE score_aggregates SET state = ? WHERE dimension = 'overall'",
+                      (json.dumps([5, 250.0, 3, 100.0, [0] * 10]),))
+    other.close()
+    assert scores.get_aggregates().overall.count == 5
+
+
+def test_sqlite_aggregates_backfilled_for_existing_scores(tmp_path):
+    db = tmp_path / "old.db"
+    legacy = sqlite3.connect(str(db))
+    with legacy:
+        legacy.execute(
+            "CREATE TABLE scores (seq INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,"
+            " username TEXT NOT NULL, quiz_title TEXT NOT NULL, score REAL NOT NULL, total INTEGER NOT NULL,"
+            " percentage REAL NOT NULL)"
+        )
+        legacy.executemany(
+            "INSERT INTO scores (timestamp, username, quiz_title, score, total, percentage) VALUES (?, ?, ?, ?, ?, ?)",
+            [("2025-01-01T10:00", "Alice", "Math Quiz", 1, 2, 50.0), ("2025-01-02T10:00", "Bob", "Math Quiz", 2, 2, 100.0)],
+        )
+    legacy.close()
+
+    aggregates = SQLiteScoreRepository(db).get_aggregates()
+    assert aggregates.overall.count == 2
+    assert aggregates.groups["quiz"]["Math Quiz"].to_dict()["mean_percentage"] == 75.0
+
+
+def test_sqlite_question_bank_reloads_only_after_question_writes(tmp_path):
+    db = tmp_path / "quiz.db"
+    questions = SQLiteQuestionRepository(db)
+    questions.import_questions([{"text": "2+2?", "options": ["3", "4"], "answer": "B", "topic": "Math"}])
+    bank = questions.load_bank()
+    SQLiteScoreRepository(db).add_score("Alice", "Math Quiz", 1, 2)
+    assert questions.load_bank() is bank  # score writes leave the bank alone
+
+    SQLiteQuestionRepository(db).import_questions([{"text": "3+3?", "options": ["6", "7"], "answer": "A"}] * 2)
+    assert len(questions.load_bank()) == 2
+
+    other = sqlite3.connect(str(db))
+    with other:
+        other.execute("DELETE FROM questions WHERE id = '2'")
+    other.close()
+    assert len(questions.load_bank()) == 1
+
+
+def test_aggregates_are_snapshots(storage):
+    storage.scores.add_score("Alice", "Math Quiz", 1, 2)
+    snapshot = storage.scores.get_aggregates()
+    storage.scores.add_score("Alice", "Math Quiz", 2, 2)
+    assert snapshot.overall.count == 1
+    assert storage.scores.get_aggregates().overall.count == 2
+
+
+def test_sqlite_seeding_leaves_json_leaderboard_untouched(tmp_path, monkeypatch):
+    open_sqlite_storage(tmp_path / "fresh.db", tmp_path / "questions.json", tmp_path / "leaderboard.json")
+    assert [p.name for p in tmp_path.iterdir() if not p.name.startswith("fresh.db")] == []
+
+    (tmp_path / "leaderboard.json").write_text(json.dumps([
+        {"username": "Alice", "quiz_title": "Math Quiz", "score": 1, "total": 2, "percentage": 50.0},
+        {"username": "Bob", "quiz_title": "Math Quiz", "score": 2, "total": 2, "percentage": 100.0},
+    ]), encoding="utf-8")
+    monkeypatch.setattr(SQLiteScoreRepository, "IMPORT_CHUNK", 1)
+    storage = open_sqlite_storage(tmp_path / "seeded.db", tmp_path / "questions.json", tmp_path / "leaderboard.json")
+    assert [e["username"] for e in storage.scores.get_leaderboard()] == ["Bob", "Alice"]
+    assert storage.scores.get_aggregates().overall.count == 2
+    assert not any(p.name.startswith("leaderboard.") and p.name != "leaderboard.json" for p in tmp_path.iterdir())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
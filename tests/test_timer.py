@@ -0,0 +1,43 @@
+"""Test for countdown timers."""
+
+import threading
+import time
+import pytest
+from src.utils.timer import CountdownTimer
+
+
+def test_remaining_from_deadline():
+    timer = CountdownTimer(5)
+    assert timer.get_remaining() == 5
+    timer.start()
+    assert not timer.is_expired()
+    assert 4.9 < timer.remaining_seconds() <= 5
+    timer.stop()
+    frozen = timer.get_remaining()
+    time.sleep(0.01)
+    assert timer.get_remaining() == frozen
+
+
+def test_many_callbacks_share_one_thread():
+    fired = []
+    lock = threading.Lock()
+
+    def on_expire():
+        with lock:
+            fired.append(1)
+
+    timers = [CountdownTimer(0.05, on_expire=on_expire) for _ in range(500)]
+    threads_before = threading.active_count()
+    for t in timers:
+        t.start()
+    timers[0].stop()
+    assert threading.active_count() <= threads_before + 1
+    deadline = time.monotonic() + 2
+    while len(fired) < 499 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(fired) == 499
+    assert all(t.is_expired() for t in timers[1:])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""Test for bulk exam variant generation."""
+
+import json
+import pytest
+from src.creators import variant_generator
+from src.creators.variant_generator import generate_variants, parse_blueprint
+
+
+@pytest.fixture
+def questions_file(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps([
+        {"id": str(i), "text": f"Q{i}", "options": ["a", "b", "c", "d"], "answer": "A",
+         "topic": "Math" if i % 2 else "Science", "difficulty": "easy" if i < 6 else "hard"}
+        for i in range(12)
+    ]), encoding="utf-8")
+    return path
+
+
+def test_parse_blueprint():
+    sections = parse_blueprint("Math:easy:3, Science::2,:hard:1")
+    assert [(s.topic, s.difficulty, s.count) for s in sections] == [
+        ("Math", "easy", 3), ("Science", "", 2), ("", "hard", 1)
+    ]
+
+
+def test_bulk_variants_are_distinct_and_reproducible(tmp_path, questions_file, monkeypatch):
+    monkeypatch.setattr(variant_generator, "SHARD_SIZE", 10)
+    blueprint = parse_blueprint("Math::2,:hard:2")
+
+    first = generate_variants(40, blueprint, seed="s", out_dir=tmp_path / "a",
+                              questions_file=questions_file, workers=2)
+    second = generate_variants(40, blueprint, seed="s", out_dir=tmp_path / "b",
+                               questions_file=questions_file, workers=1)
+    assert first.variants == 40 and first.variants_per_sec > 0
+
+    records = (tmp_path / "a" / "variants.jsonl").read_text(encoding="utf-8").splitlines()
+    assert records == (tmp_path / "b" / "variants.jsonl").read_text(encoding="utf-8").splitlines()
+    orderings = {json.dumps(json.loads(r)["questions"]) for r in records}
+    assert len(orderings) == 40
+    for r in records:
+        ids = [q["id"] for q in json.loads(r)["questions"]]
+        assert len(ids) == len(set(ids)) == 4
+    assert (tmp_path / "a" / "variant_00040.txt").exists()
+    assert len((tmp_path / "a" / "answer_key.csv").read_text().splitlines()) == 1 + 40 * 4
+
+
+def test_blueprint_too_large(tmp_path, questions_file):
+    with pytest.raises(ValueError):
+        generate_variants(1, parse_blueprint("Math:easy:10"), out_dir=tmp_path, questions_file=questions_file)
+
+
+def test_overlapping_sections_too_large(tmp_path, questions_file):
+    # 6 Math questions in all, 3 of them easy: the second section cannot take 3 more
+    with pytest.raises(ValueError, match="Math:easy:3"):
+        generate_variants(1, parse_blueprint("Math::5,Math:easy:3"), out_dir=tmp_path,
+                          questions_file=questions_file, workers=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])